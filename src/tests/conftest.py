@@ -19,6 +19,8 @@ import pytest
 import website
 from tests import factories
 from website import db
+from website.data.accounts import models as account_models
+from website.domain.blogs import queries as blog_queries
 
 
 @pytest.fixture(scope="session")
@@ -49,6 +51,9 @@ def database():
     db.create_all()
     yield db
     db.drop_all()
+    # Cached feeds and accounts would otherwise outlive their rows
+    blog_queries.clear_rss_cache()
+    account_models.clear_account_cache()
 
 
 @pytest.fixture()
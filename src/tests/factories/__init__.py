@@ -1 +1,3 @@
 from tests.factories.accounts import *  # noqa
+from tests.factories.blogs import *  # noqa
+from tests.factories.categories import *  # noqa
@@ -18,7 +18,9 @@ from http import client as http_client
 from unittest import mock
 
 from tests import utils
+from website import ratelimit
 from website.data.accounts import models
+from website.data.outbox import models as outbox_models
 from website.domain.accounts import utils as account_utils
 
 
@@ -197,3 +199,61 @@ def test_account_confirm_email(
     assert response.status_code == http_client.OK
     assert b"Token is either invalid or expired." in response.data
     assert b"Forgot your password?" in response.data
+
+
+def test_account_login_when_hashing_is_busy(
+    app, client, database, factory, monkeypatch
+):
+    factory.Account(confirmed=True)
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_QUEUE", 0)
+
+    # We should be turned away straight away, and told when to retry
+    response = client.post(
+        "account/login",
+        data=dict(email="gough.whitlam@alp.org.au", password="It's time"),
+    )
+    assert response.status_code == http_client.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "5"
+    assert b"The server is busy right now." in response.data
+
+
+def test_account_reset_password_is_rate_limited(
+    app, client, database, factory, monkeypatch
+):
+    factory.Account(confirmed=True)
+    factory.Account(
+        username="jeremy",
+        display="jeremy",
+        email="jeremy.corbyn@labour.org.uk",
+        confirmed=True,
+    )
+    monkeypatch.setitem(app.config, "RATELIMIT_ENABLED", True)
+    monkeypatch.setitem(app.config, "RATELIMIT_EMAIL_CLIENT", "3/3600")
+    monkeypatch.setitem(app.config, "RATELIMIT_EMAIL_RECIPIENT", "1/3600")
+    monkeypatch.setitem(
+        app.extensions, "ratelimit", ratelimit.MemoryBackend(config=app.config)
+    )
+
+    def request_reset(email):
+        return client.post(
+            "/account/request-reset-password", data=dict(email=email)
+        )
+
+    # Each address is only sent one email
+    assert request_reset("gough.whitlam@alp.org.au").status_code == (
+        http_client.FOUND
+    )
+    response = request_reset("gough.whitlam@alp.org.au")
+    assert response.status_code == http_client.TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) == 3600
+    assert b"You have made too many requests." in response.data
+    assert outbox_models.OutboxEmail.query.count() == 1
+
+    # And each client can only ask for so many
+    assert request_reset("jeremy.corbyn@labour.org.uk").status_code == (
+        http_client.FOUND
+    )
+    response = request_reset("jeremy.corbyn@labour.org.uk")
+    assert response.status_code == http_client.TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) == 1200
+    assert outbox_models.OutboxEmail.query.count() == 2
@@ -0,0 +1,410 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+from http import client as http_client
+
+import pytest
+import pytz
+
+from tests import utils
+from website import ratelimit
+from website.data.outbox import models as outbox_models
+from website.domain.blogs import operations
+from website.domain.comments import operations as comment_operations
+
+# Listing pages should run a fixed number of queries, however many blogs,
+# authors and categories they show.
+MAX_LISTING_QUERIES = 4
+
+
+def _create_blogs(factory, number_of_blogs: int):
+    author = factory.Account(confirmed=True)
+    categories = [factory.Category(), factory.Category()]
+    for _ in range(number_of_blogs):
+        factory.Blog(author=author, categories=categories)
+    return author, categories
+
+
+@pytest.mark.parametrize(argnames="number_of_blogs", argvalues=[1, 10])
+def test_landing_query_count(client, database, factory, number_of_blogs):
+    _create_blogs(factory=factory, number_of_blogs=number_of_blogs)
+
+    # Authors and categories should be eagerly loaded, rather than queried
+    # for each blog
+    with utils.count_queries(engine=database.engine) as statements:
+        response = client.get(path="/")
+    assert response.status_code == http_client.OK
+    assert b"Gough Whitlam" in response.data
+    assert len(statements) <= MAX_LISTING_QUERIES
+
+
+@pytest.mark.parametrize(argnames="number_of_blogs", argvalues=[1, 10])
+def test_category_display_query_count(
+    client, database, factory, number_of_blogs
+):
+    _, categories = _create_blogs(
+        factory=factory, number_of_blogs=number_of_blogs
+    )
+
+    with utils.count_queries(engine=database.engine) as statements:
+        response = client.get(path=f"/categories/{categories[0].slug}")
+    assert response.status_code == http_client.OK
+    assert len(statements) <= MAX_LISTING_QUERIES
+
+
+@pytest.mark.parametrize(argnames="number_of_blogs", argvalues=[1, 10])
+def test_account_display_query_count(
+    client, database, factory, number_of_blogs
+):
+    author, _ = _create_blogs(factory=factory, number_of_blogs=number_of_blogs)
+
+    with utils.count_queries(engine=database.engine) as statements:
+        response = client.get(path=f"/account/{author.username}")
+    assert response.status_code == http_client.OK
+    assert len(statements) <= MAX_LISTING_QUERIES
+
+
+def test_archive(client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = operations.create_blog(
+        title="Medibank",
+        body="<p>It's time</p>",
+        author=author,
+        published=True,
+    )
+    operations.create_blog(
+        title="Dismissed", body="<p>Kerr's cur</p>", author=author
+    )
+
+    # We should see published blogs under the year and month they were
+    # created in
+    response = client.get(path="/archive")
+    assert response.status_code == http_client.OK
+    assert b"Medibank" in response.data
+    assert str(blog.created_at.year).encode() in response.data
+    assert b"Dismissed" not in response.data
+
+
+def test_rss_conditional_get(client, database, factory):
+    author = factory.Account(confirmed=True)
+    operations.create_blog(
+        title="Medibank",
+        body="<p>It's time</p>",
+        author=author,
+        published=True,
+    )
+
+    response = client.get(path="/rss")
+    assert response.status_code == http_client.OK
+    assert response.headers["Content-Type"] == "application/rss+xml"
+    assert b"Medibank" in response.data
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    # An unchanged feed shouldn't be sent again
+    response = client.get(path="/rss", headers={"If-None-Match": etag})
+    assert response.status_code == http_client.NOT_MODIFIED
+    assert response.data == b""
+
+    # A new blog should invalidate the client's copy
+    operations.create_blog(
+        title="Dismissed",
+        body="<p>Kerr's cur</p>",
+        author=author,
+        published=True,
+    )
+    response = client.get(path="/rss", headers={"If-None-Match": etag})
+    assert response.status_code == http_client.OK
+    assert response.headers["ETag"] != etag
+    assert b"Dismissed" in response.data
+
+
+@pytest.mark.parametrize(argnames="path", argvalues=["/rss", "/atom"])
+def test_feed_if_modified_since(client, database, factory, path):
+    author = factory.Account(confirmed=True)
+    factory.Blog(title="Medibank", author=author)
+
+    response = client.get(path=path)
+    assert response.status_code == http_client.OK
+    last_modified = response.headers["Last-Modified"]
+
+    # A client with the latest copy shouldn't be sent it again
+    response = client.get(
+        path=path, headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == http_client.NOT_MODIFIED
+
+    # But a client with an older copy should
+    response = client.get(
+        path=path,
+        headers={"If-Modified-Since": "Mon, 11 Nov 1975 12:00:00 GMT"},
+    )
+    assert response.status_code == http_client.OK
+
+
+@pytest.mark.parametrize(argnames="path", argvalues=["/rss", "/atom"])
+def test_feed_is_modified_by_removing_blogs(client, database, factory, path):
+    author = factory.Account(confirmed=True)
+    first = operations.create_blog(
+        title="Medibank",
+        body="<p>It's time</p>",
+        author=author,
+        published=True,
+    )
+    blog = operations.create_blog(
+        title="Dismissed",
+        body="<p>Kerr's cur</p>",
+        author=author,
+        published=True,
+    )
+    response = client.get(path=path)
+    last_modified = response.headers["Last-Modified"]
+
+    # Removing the newest blog from the feed must not leave its
+    # Last-Modified where it was, or move it backwards
+    operations.update_blog(blog=blog, published=False)
+    response = client.get(
+        path=path, headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == http_client.OK
+    assert b"Dismissed" not in response.data
+    last_modified = response.headers["Last-Modified"]
+
+    operations.delete_blog(blog=first)
+    response = client.get(
+        path=path, headers={"If-Modified-Since": last_modified}
+    )
+    assert response.status_code == http_client.OK
+    assert b"Medibank" not in response.data
+
+
+def test_rss_is_bounded(client, database, factory, app, monkeypatch):
+    author = factory.Account(confirmed=True)
+    now = datetime.datetime.now(tz=pytz.utc)
+    for days, title in enumerate(["Kirribilli", "Dismissed", "Medibank"]):
+        factory.Blog(
+            title=title,
+            author=author,
+            created_at=now - datetime.timedelta(days=days),
+        )
+    monkeypatch.setitem(app.config, "FEED_MAX_ITEMS", 2)
+
+    # Only the newest blogs should be included
+    response = client.get(path="/rss")
+    assert response.status_code == http_client.OK
+    assert response.data.count(b"<item>") == 2
+    assert b"Kirribilli" in response.data
+    assert b"Medibank" not in response.data
+    assert b"content:encoded" in response.data
+
+    # Clients can narrow the feed, but not widen it
+    response = client.get(path="/rss?max_items=1&full_content=false")
+    assert response.data.count(b"<item>") == 1
+    assert b"content:encoded" not in response.data
+    response = client.get(path="/rss?max_items=50")
+    assert response.data.count(b"<item>") == 2
+
+
+def test_filtered_rss(client, database, factory):
+    author = factory.Account(confirmed=True)
+    category = factory.Category()
+    factory.Blog(title="Medibank", author=author, categories=[category])
+    factory.Blog(
+        title="Dismissed",
+        author=factory.Account(
+            username="malcolm", email="malcolm.fraser@liberal.org.au"
+        ),
+    )
+
+    response = client.get(path=f"/categories/{category.slug}/rss")
+    assert response.status_code == http_client.OK
+    assert b"Medibank" in response.data
+    assert b"Dismissed" not in response.data
+    category_etag = response.headers["ETag"]
+
+    response = client.get(path=f"/account/{author.username}/rss")
+    assert response.status_code == http_client.OK
+    assert b"Medibank" in response.data
+    assert b"Dismissed" not in response.data
+
+    # Each feed is validated separately from the full feed
+    response = client.get(path="/rss")
+    assert b"Dismissed" in response.data
+    assert response.headers["ETag"] != category_etag
+    response = client.get(
+        path=f"/categories/{category.slug}/rss",
+        headers={"If-None-Match": category_etag},
+    )
+    assert response.status_code == http_client.NOT_MODIFIED
+
+    response = client.get(path="/categories/missing/rss")
+    assert response.status_code == http_client.NOT_FOUND
+
+
+def test_streamed_feeds(client, database, factory, app, monkeypatch):
+    factory.Blog(title="Medibank", author=factory.Account(confirmed=True))
+    monkeypatch.setitem(app.config, "FEED_STREAMING", True)
+
+    response = client.get(path="/rss")
+    assert response.status_code == http_client.OK
+    assert response.is_streamed
+    assert response.headers["Content-Type"] == "application/rss+xml"
+    assert b"Medibank" in response.data
+
+    response = client.get(path="/atom")
+    assert response.status_code == http_client.OK
+    assert response.headers["Content-Type"] == "application/atom+xml"
+    assert b"Medibank" in response.data
+    etag = response.headers["ETag"]
+    response = client.get(path="/atom", headers={"If-None-Match": etag})
+    assert response.status_code == http_client.NOT_MODIFIED
+
+
+def test_search(client, database, factory, app, monkeypatch):
+    author = factory.Account(confirmed=True)
+    for title in ("Medibank", "Medicare", "Dismissed"):
+        operations.create_blog(
+            title=title, body="<p>It's time</p>", author=author, published=True
+        )
+
+    response = client.get(path="/search?q=medibank")
+    assert response.status_code == http_client.OK
+    assert b"Medibank" in response.data
+    assert b"Dismissed" not in response.data
+
+    response = client.get(path="/search?q=time&cursor=invalid")
+    assert response.status_code == http_client.NOT_FOUND
+
+    # The query should be kept when paging through results
+    monkeypatch.setitem(app.config, "BLOGS_PER_PAGE", 2)
+    response = client.get(path="/api/v1/blogs/search?q=time")
+    assert response.status_code == http_client.OK
+    assert len(response.json) == 2
+    assert "q=time" in response.headers["Link"]
+    response = client.get(path="/search?q=time")
+    assert b"q=time" in response.data
+
+
+def test_comment_tree(client, database, factory, app, monkeypatch):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(author=author, comment=True)
+    comment = comment_operations.create_comment(
+        body="Well may we say", author=author, blog=blog
+    )
+    reply = comment_operations.create_comment(
+        body="God save the Queen", author=author, parent=comment
+    )
+    comment_operations.create_comment(
+        body="Because nothing will save", author=author, parent=reply
+    )
+    monkeypatch.setitem(app.config, "COMMENTS_MAX_DEPTH", 1)
+
+    # Threads are shown down to the maximum depth
+    response = client.get(path=f"/blogs/{blog.slug}")
+    assert response.status_code == http_client.OK
+    assert b"Well may we say" in response.data
+    assert b"God save the Queen" in response.data
+    assert b"Because nothing will save" not in response.data
+    assert b"Continue this thread" in response.data
+
+    # And can be continued from where they were cut off
+    response = client.get(path=f"/blogs/{blog.slug}?parent={reply.id}")
+    assert response.status_code == http_client.OK
+    assert b"Because nothing will save" in response.data
+    assert b"Well may we say" not in response.data
+
+    response = client.get(path=f"/blogs/{blog.slug}?cursor=invalid")
+    assert response.status_code == http_client.NOT_FOUND
+
+
+def test_comment_threads(client, database, factory, app, monkeypatch):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(author=author, comment=True)
+    for body in ("Well may we say", "God save the Queen"):
+        comment = comment_operations.create_comment(
+            body=body, author=author, blog=blog
+        )
+        comment_operations.create_comment(
+            body="Reply", author=author, parent=comment
+        )
+    monkeypatch.setitem(app.config, "COMMENTS_PER_PAGE", 1)
+
+    response = client.get(path=f"/api/v1/comments/blog/{blog.id}")
+    assert response.status_code == http_client.OK
+    assert len(response.json) == 1
+    assert response.json[0]["replies"][0]["body"] == "Reply"
+    assert 'rel="next"' in response.headers["Link"]
+
+    response = client.get(path=f"/api/v1/comments/blog/{blog.id}?max_depth=0")
+    assert response.json[0]["replies"] == []
+    assert response.json[0]["replies_cursor"]
+
+
+def test_contact_is_rate_limited_per_client(
+    client, database, app, monkeypatch
+):
+    monkeypatch.setitem(app.config, "RATELIMIT_ENABLED", True)
+    monkeypatch.setitem(app.config, "RATELIMIT_PROXIES", 1)
+    monkeypatch.setitem(app.config, "RATELIMIT_EMAIL_CLIENT", "1/60")
+    monkeypatch.setitem(
+        app.extensions, "ratelimit", ratelimit.MemoryBackend(config=app.config)
+    )
+
+    def contact(testing_client, address):
+        return testing_client.post(
+            "/contact",
+            data=dict(
+                email="jeremy.corbyn@labour.org.uk",
+                enquiry="For the many",
+                body="Not the few, not the few, not the few",
+            ),
+            headers={"X-Forwarded-For": address},
+            follow_redirects=True,
+        )
+
+    # Clients are told when to retry once they have used their limit
+    response = contact(testing_client=client, address="10.0.0.1")
+    assert b"Your enquiry has been sent." in response.data
+    response = contact(testing_client=client, address="10.0.0.1")
+    assert response.status_code == http_client.TOO_MANY_REQUESTS
+    assert response.headers["Retry-After"] == "60"
+    assert outbox_models.OutboxEmail.query.count() == 1
+
+    # Other clients are still served. Their own client is needed, as the
+    # session is tied to the address it was created from.
+    response = contact(testing_client=app.test_client(), address="10.0.0.2")
+    assert b"Your enquiry has been sent." in response.data
+    assert outbox_models.OutboxEmail.query.count() == 2
+
+
+def test_contact_without_contact_address(client, database, app, monkeypatch):
+    monkeypatch.setitem(app.config, "RATELIMIT_ENABLED", True)
+    monkeypatch.setitem(app.config, "CONTACT_ADDRESS", None)
+    monkeypatch.setitem(
+        app.extensions, "ratelimit", ratelimit.MemoryBackend(config=app.config)
+    )
+
+    response = client.post(
+        "/contact",
+        data=dict(
+            email="jeremy.corbyn@labour.org.uk",
+            enquiry="For the many",
+            body="Not the few, not the few, not the few",
+        ),
+    )
+
+    assert response.status_code == http_client.FOUND
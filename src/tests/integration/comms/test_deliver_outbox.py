@@ -0,0 +1,144 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+import smtplib
+from unittest import mock
+
+import pytz
+
+from website import mail
+from website.comms import delivery, dispatch
+from website.data.outbox import models
+from website.interfaces.management.systemjobs.commands import deliver_outbox
+
+LEASE = datetime.timedelta(minutes=5)
+
+
+def _queue_emails(count):
+    for number in range(count):
+        dispatch.send_contact_email(
+            email="jeremy.corbyn@labour.org.uk",
+            enquiry=f"Enquiry {number}",
+            body="For the many, not the few",
+        )
+
+
+def test_claims_do_not_overlap(app, client, database):
+    _queue_emails(count=3)
+
+    first = models.OutboxEmail.claim(limit=2, lease=LEASE)
+    second = models.OutboxEmail.claim(limit=2, lease=LEASE)
+
+    assert len(first) == 2
+    assert len(second) == 1
+    assert {email.id for email in first}.isdisjoint(
+        email.id for email in second
+    )
+    assert models.OutboxEmail.claim(limit=2, lease=LEASE) == []
+
+
+def test_expired_lease_can_be_claimed_again(app, client, database):
+    _queue_emails(count=1)
+    (email,) = models.OutboxEmail.claim(limit=1, lease=LEASE)
+
+    later = datetime.datetime.now(tz=pytz.utc) + LEASE
+    (reclaimed,) = models.OutboxEmail.claim(limit=1, lease=LEASE, now=later)
+
+    assert reclaimed.id == email.id
+    assert reclaimed.attempts == 2
+    # The original worker lost its claim
+    assert not email.complete()
+    assert reclaimed.complete()
+
+
+def test_unsent_emails_are_retried_then_failed(
+    app, client, database, monkeypatch
+):
+    monkeypatch.setitem(app.config, "MAIL_MAX_ATTEMPTS", 2)
+    _queue_emails(count=1)
+    refused = smtplib.SMTPServerDisconnected("Gone")
+
+    with mock.patch.object(target=mail, attribute="connect") as mock_connect:
+        mock_connect.return_value.__enter__.side_effect = refused
+        first = delivery.deliver_outbox()
+        email = models.OutboxEmail.query.one()
+        retried = email.failed_at is None
+        email.available_at = datetime.datetime.now(tz=pytz.utc)
+        database.session.commit()
+        second = delivery.deliver_outbox()
+
+    email = models.OutboxEmail.query.one()
+    assert first == delivery.Delivery(failed=1)
+    assert second == delivery.Delivery(failed=1)
+    assert retried
+    assert email.failed_at is not None
+    assert email.last_error == "Gone"
+    assert delivery.deliver_outbox() == delivery.Delivery()
+
+
+def test_deliver_outbox_sends_in_batches(app, client, database):
+    _queue_emails(count=3)
+
+    with mail.record_messages() as outbox, mock.patch.object(
+        target=mail, attribute="connect", wraps=mail.connect
+    ) as mock_connect:
+        result = app.test_cli_runner().invoke(
+            deliver_outbox.command, ["--batch-size", "2", "--once"]
+        )
+
+    assert result.exit_code == 0
+    assert "Sent 3 emails, 0 failed." in result.output
+    assert mock_connect.call_count == 2
+    assert sorted(message.subject for message in outbox) == [
+        "Enquiry: Enquiry 0",
+        "Enquiry: Enquiry 1",
+        "Enquiry: Enquiry 2",
+    ]
+    assert models.OutboxEmail.query.count() == 0
+
+
+def test_emails_are_rendered_by_worker(app, client, database, factory):
+    account = factory.Account(username="jeremy")
+    with app.test_request_context():
+        dispatch.send_confirm_account_email(account=account)
+
+    with mail.record_messages() as outbox:
+        delivery.deliver_outbox()
+
+    (message,) = outbox
+    assert "Dear jeremy," in message.body
+    assert "http://localhost/account/confirm-email/" in message.html
+
+
+def test_unrenderable_emails_are_released(app, client, database):
+    models.OutboxEmail.new(
+        subject="Missing",
+        sender="gough.whitlam@alp.org.au",
+        recipients=["jeremy.corbyn@labour.org.uk"],
+        template="missing",
+        context={},
+    )
+
+    with mock.patch.object(target=mail, attribute="connect") as mock_connect:
+        result = delivery.deliver_outbox()
+
+    assert result == delivery.Delivery(failed=1)
+    mock_connect.assert_not_called()
+    assert models.OutboxEmail.query.one().last_error.startswith(
+        "Unable to render email"
+    )
@@ -0,0 +1,57 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from website.domain.accounts import queries
+from website.interfaces.management.systemjobs.commands import (
+    calibrate_password_hashing,
+)
+
+
+def test_check_login_rehashes_outdated_password(
+    app, client, database, factory, monkeypatch
+):
+    account = factory.Account(confirmed=True)
+    account.update(about="Hello")
+    updated_at, old_hash = account.updated_at, account.password
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_ITERATIONS", 2000)
+    assert account.needs_rehash()
+
+    queries.check_login(email=account.email, password="It's time")
+
+    assert account.password != old_hash
+    assert account.password.startswith("pbkdf2:sha256:2000$")
+    assert account.updated_at == updated_at
+    assert not account.needs_rehash()
+    assert queries.check_login(email=account.email, password="It's time")
+
+
+def test_check_login_keeps_current_password(client, database, factory):
+    account = factory.Account(confirmed=True)
+    old_hash = account.password
+
+    queries.check_login(email=account.email, password="It's time")
+
+    assert account.password == old_hash
+
+
+def test_calibrate_password_hashing(app):
+    result = app.test_cli_runner().invoke(
+        calibrate_password_hashing.command, ["--rounds", "1"]
+    )
+
+    assert result.exit_code == 0
+    assert "Suggested: PASSWORD_HASH_ITERATIONS=" in result.output
@@ -0,0 +1,61 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from website.data.blogs import models as blog_models
+from website.domain.accounts import operations
+from website.domain.blogs import operations as blog_operations
+from website.domain.blogs import queries as blog_queries
+from website.domain.blogs import search
+
+
+def _create_blog(author):
+    return blog_operations.create_blog(
+        title="Medibank",
+        body="<p>Universal health insurance</p>",
+        author=author,
+        published=True,
+    )
+
+
+def test_delete_account_and_blogs(client, database, factory):
+    account = factory.Account(confirmed=True)
+    _create_blog(author=account)
+    # Cache the feed, which should be cleared with the blogs
+    with client.application.test_request_context():
+        assert b"Medibank" in blog_queries.get_rss_blogs(published=True)
+
+    operations.delete_account(account=account, delete_blogs=True)
+
+    assert blog_models.Blog.query.count() == 0
+    assert blog_models.ArchiveEntry.query.count() == 0
+    assert not database.session.execute(
+        f"SELECT count(*) FROM {blog_models.SEARCH_TABLE}"
+    ).scalar()
+    with client.application.test_request_context():
+        assert b"Medibank" not in blog_queries.get_rss_blogs(published=True)
+
+
+def test_delete_account_keeps_blogs(client, database, factory):
+    account = factory.Account(confirmed=True)
+    blog_id = _create_blog(author=account).id
+
+    operations.delete_account(account=account)
+
+    blog = blog_models.Blog.query.get(blog_id)
+    assert blog.author is None
+    assert blog_models.ArchiveEntry.query.count() == 1
+    assert search.search_blogs(query="health").items == [blog]
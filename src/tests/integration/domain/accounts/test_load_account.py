@@ -0,0 +1,72 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from tests import utils
+from website.data.accounts import models
+
+
+def test_load_account_is_cached(client, database, factory):
+    account = factory.Account(confirmed=True)
+    account_id, username = account.id, account.username
+    models.Account.load_account(str(account_id))
+    database.session.remove()
+
+    with utils.count_queries(engine=database.engine) as statements:
+        cached = models.Account.load_account(str(account_id))
+
+        assert cached.id == account_id
+        assert cached.username == username
+        assert statements == []
+
+
+def test_load_account_cache_is_invalidated(client, database, factory):
+    account = factory.Account(confirmed=True)
+    account_id = account.id
+    models.Account.load_account(str(account_id))
+
+    account.update(display="Malcolm")
+    database.session.remove()
+
+    assert models.Account.load_account(str(account_id)).display == "Malcolm"
+
+
+def test_load_account_cache_can_be_disabled(
+    app, client, database, factory, monkeypatch
+):
+    monkeypatch.setitem(app.config, "ACCOUNT_CACHE_TTL", 0)
+    account = factory.Account(confirmed=True)
+    account_id = account.id
+    models.Account.load_account(str(account_id))
+    database.session.remove()
+
+    with utils.count_queries(engine=database.engine) as statements:
+        models.Account.load_account(str(account_id))
+
+        assert len(statements) == 1
+
+
+def test_load_account_does_not_cache_admins(client, database, factory):
+    account = factory.Account(confirmed=True, admin=True)
+    account_id = account.id
+    models.Account.load_account(str(account_id))
+    database.session.remove()
+
+    # Other processes wouldn't see admin rights being revoked
+    with utils.count_queries(engine=database.engine) as statements:
+        assert models.Account.load_account(str(account_id)).admin
+
+        assert len(statements) == 1
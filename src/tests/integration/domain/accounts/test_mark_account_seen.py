@@ -0,0 +1,52 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+
+import pytz
+
+from tests import utils
+from website.domain.accounts import operations
+
+
+def test_mark_account_seen_only_writes_once_per_interval(
+    client, database, factory
+):
+    account = factory.Account(confirmed=True)
+    account.update(about="Hello", seen_at=None)
+    updated_at = account.updated_at
+
+    assert operations.mark_account_seen(account=account)
+    seen_at = account.seen_at
+    with utils.count_queries(engine=database.engine) as statements:
+        assert not operations.mark_account_seen(account=account)
+        assert statements == []
+
+    assert account.seen_at == seen_at
+    assert account.updated_at == updated_at
+
+
+def test_mark_account_seen_writes_when_stale(client, database, factory):
+    account = factory.Account(confirmed=True)
+    account.update(
+        seen_at=datetime.datetime.now(tz=pytz.utc)
+        - datetime.timedelta(hours=1)
+    )
+    seen_at = account.seen_at
+
+    assert operations.mark_account_seen(account=account)
+    assert account.seen_at > seen_at
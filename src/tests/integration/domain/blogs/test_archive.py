@@ -0,0 +1,81 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import mock
+
+import pytest
+
+from website.data.blogs import models
+from website.domain import exceptions
+from website.domain.blogs import operations, queries, search
+
+
+def test_archive_follows_blog_operations(client, database, factory):
+    author = factory.Account(confirmed=True)
+
+    # Unpublished blogs should not be archived
+    blog = operations.create_blog(
+        title="Medibank", body="<p>It's time</p>", author=author
+    )
+    assert queries.get_archive_index() == []
+
+    # Publishing a blog should archive it
+    operations.update_blog(blog=blog, published=True)
+    entries = queries.get_archive_index()
+    assert [entry.title for entry in entries] == ["Medibank"]
+    assert entries[0].year == blog.created_at.year
+    assert entries[0].month == blog.created_at.month
+
+    # Renaming a blog should rename its archive entry
+    operations.update_blog(blog=blog, title="Medicare")
+    assert [entry.title for entry in queries.get_archive_index()] == [
+        "Medicare"
+    ]
+
+    # Unpublishing or deleting a blog should remove it from the archive
+    operations.update_blog(blog=blog, published=False)
+    assert queries.get_archive_index() == []
+    operations.update_blog(blog=blog, published=True)
+    operations.delete_blog(blog=blog)
+    assert models.ArchiveEntry.query.count() == 0
+
+
+def test_archive_rebuild(client, database, factory):
+    factory.Blog(title="Medibank")
+    factory.Blog(title="Dismissed", published=False)
+
+    models.ArchiveEntry.rebuild()
+
+    assert [entry.title for entry in queries.get_archive_index()] == [
+        "Medibank"
+    ]
+
+
+def test_blog_is_not_created_without_its_index(client, database, factory):
+    author = factory.Account(confirmed=True)
+
+    # A failure to index the blog should roll back the blog and its archive
+    with mock.patch.object(
+        target=search, attribute="index_blog", side_effect=RuntimeError
+    ), pytest.raises(expected_exception=exceptions.UnableToCreate):
+        operations.create_blog(
+            title="Medibank",
+            body="<p>It's time</p>",
+            author=author,
+            published=True,
+        )
+    assert models.Blog.query.count() == 0
+    assert models.ArchiveEntry.query.count() == 0
@@ -0,0 +1,104 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+import re
+from xml.etree import ElementTree
+
+import pytest
+import pytz
+
+from website.domain.blogs import queries
+
+# Elements whose content differs between feeds generated at different times,
+# or by different writers
+VOLATILE_ELEMENTS = re.compile(
+    r"<(lastBuildDate|generator|updated)\b[^>]*>[^<]*</\1>"
+)
+
+
+@pytest.fixture()
+def blogs(database, factory):
+    author = factory.Account(confirmed=True, display="Gough & <Margaret>")
+    category = factory.Category(title='"Labor"')
+    now = datetime.datetime.now(tz=pytz.utc)
+    factory.Blog(
+        title="Medibank & Medicare",
+        body="<p>It's time</p>",
+        author=author,
+        categories=[category],
+        created_at=now,
+    )
+    factory.Blog(
+        title="Dismissed",
+        description=None,
+        author=author,
+        created_at=now - datetime.timedelta(days=1),
+    )
+    factory.Blog(
+        title="Unpublished",
+        author=author,
+        published=False,
+        created_at=now - datetime.timedelta(days=2),
+    )
+
+
+@pytest.mark.parametrize(argnames="full_content", argvalues=[True, False])
+def test_streamed_rss_matches_generated_rss(app, client, blogs, full_content):
+    with app.test_request_context(path="/rss"):
+        generated = queries.get_rss_blogs(
+            published=True, full_content=full_content
+        ).decode("utf-8")
+        streamed = "".join(
+            queries.stream_rss_blogs(published=True, full_content=full_content)
+        )
+
+    assert "Dismissed" in streamed
+    assert "Unpublished" not in streamed
+    assert VOLATILE_ELEMENTS.sub("", streamed) == VOLATILE_ELEMENTS.sub(
+        "", generated
+    )
+
+
+@pytest.mark.parametrize(argnames="full_content", argvalues=[True, False])
+def test_streamed_atom_matches_generated_atom(
+    app, client, blogs, full_content
+):
+    with app.test_request_context(path="/atom"):
+        generator = queries._create_generator(
+            host="http://localhost",
+            blogs=queries.get_blogs(published=True),
+            full_content=full_content,
+        )
+        generator.link(href="http://localhost/atom", rel="self")
+        generated = generator.atom_str().decode("utf-8")
+        streamed = "".join(
+            queries.stream_atom_blogs(
+                published=True, full_content=full_content
+            )
+        )
+
+    feed = ElementTree.fromstring(streamed.encode("utf-8"))
+    namespaces = {"atom": "http://www.w3.org/2005/Atom"}
+    titles = [
+        title.text
+        for title in feed.findall("atom:entry/atom:title", namespaces)
+    ]
+    assert titles == ["Medibank & Medicare", "Dismissed"]
+    assert VOLATILE_ELEMENTS.sub("", streamed) == VOLATILE_ELEMENTS.sub(
+        "", generated
+    )
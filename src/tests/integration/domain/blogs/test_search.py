@@ -0,0 +1,100 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+
+from website.domain import exceptions
+from website.domain.blogs import operations, search
+from website.domain.common import pagination
+
+
+def test_search_follows_blog_operations(client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = operations.create_blog(
+        title="Medibank",
+        body="<p>Universal <strong>health</strong> insurance</p>",
+        author=author,
+        published=True,
+    )
+    operations.create_blog(
+        title="Dismissed",
+        description="The health of the nation",
+        body="<p>Well may we say</p>",
+        author=author,
+        published=True,
+    )
+    operations.create_blog(
+        title="Draft", body="<p>Health</p>", author=author, published=False
+    )
+
+    # Only the text of published blogs should be matched, with matches in
+    # the description ranked above matches in the body
+    page = search.search_blogs(query="health")
+    assert [blog.title for blog in page.items] == ["Dismissed", "Medibank"]
+    assert search.search_blogs(query="strong").items == []
+    assert search.search_blogs(query="universal insurance").items == [blog]
+    assert search.search_blogs(query="universal dismissed").items == []
+
+    # Updating or deleting a blog should update the index
+    operations.update_blog(blog=blog, body="<p>Medicare</p>")
+    assert search.search_blogs(query="universal").items == []
+    operations.delete_blog(blog=blog)
+    assert search.search_blogs(query="medicare").items == []
+
+
+def test_search_pages(client, database, factory):
+    for title in ("Health", "Health policy", "Health care"):
+        factory.Blog(title=title)
+    assert search.rebuild_index() == 3
+
+    first = search.search_blogs(query="health", per_page=2)
+    second = search.search_blogs(
+        query="health", per_page=2, cursor=first.next_cursor
+    )
+    assert len(first.items) == 2
+    assert len(second.items) == 1
+    assert set(first.items + second.items) == set(
+        search.search_blogs(query="health", per_page=3).items
+    )
+    assert (
+        search.search_blogs(
+            query="health", per_page=2, cursor=second.prev_cursor
+        ).items
+        == first.items
+    )
+
+
+@pytest.mark.parametrize(argnames="query", argvalues=["", "'\"*", "NEAR"])
+def test_search_ignores_syntax(client, database, factory, query):
+    factory.Blog(title="Health")
+    search.rebuild_index()
+
+    assert search.search_blogs(query=query).items == []
+
+
+@pytest.mark.parametrize(
+    argnames="values",
+    argvalues=[[1], ["1.0", 2], [[1], 2], [1.0, "2"], [1.0, True]],
+)
+def test_search_invalid_cursor(client, database, values):
+    # Search cursors hold a numeric rank and an integer id
+    cursor = pagination.encode_cursor(
+        direction=pagination.DIRECTION_NEXT, values=values
+    )
+
+    with pytest.raises(expected_exception=exceptions.InvalidCursor):
+        search.search_blogs(query="health", cursor=cursor)
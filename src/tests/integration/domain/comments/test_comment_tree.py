@@ -0,0 +1,238 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+
+import pytest
+import pytz
+
+from tests import utils
+from website.data.comments import models as comment_models
+from website.domain.comments import operations, queries
+
+
+@pytest.fixture()
+def foreign_keys(database):
+    """
+    Enforce foreign keys, as PostgreSQL does, which SQLite only does when
+    asked.
+    """
+    database.session.execute("PRAGMA foreign_keys = ON")
+    yield
+    database.session.execute("PRAGMA foreign_keys = OFF")
+
+
+def _create_thread(author, blog):
+    """
+    Create a thread of comments, each replying to the last.
+    """
+    comment = operations.create_comment(body="0", author=author, blog=blog)
+    for depth in range(1, 8):
+        comment = operations.create_comment(
+            body=str(depth), author=author, parent=comment
+        )
+    return comment
+
+
+def test_get_comment_threads(client, database, factory, app, monkeypatch):
+    monkeypatch.setitem(app.config, "COMMENTS_MAX_DEPTH", 10)
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    first = operations.create_comment(body="First", author=author, blog=blog)
+    first.thread_at = datetime.datetime.now(tz=pytz.utc) - datetime.timedelta(
+        days=1
+    )
+    database.session.commit()
+    reply = operations.create_comment(
+        body="Reply", author=author, parent=first
+    )
+    operations.create_comment(body="Nested", author=author, parent=reply)
+    operations.create_comment(body="Sibling", author=author, parent=first)
+    _create_thread(author=author, blog=blog)
+    # Refresh the expired instances, so only the tree is queried below
+    username, _ = author.username, blog.id
+
+    with utils.count_queries(engine=database.engine) as statements:
+        tree = queries.get_comment_threads_page(blog=blog).items
+
+        # Threads are ordered newest first, and replies oldest first
+        assert [node.body for node in tree] == ["0", "First"]
+        first_node = tree[1]
+        assert [node.body for node in first_node.replies] == [
+            "Reply",
+            "Sibling",
+        ]
+        assert first_node.replies[0].replies[0].body == "Nested"
+        assert first_node.replies[0].replies[0].level == 2
+        assert first_node.author_username == username
+
+        # Deep threads should be nested all the way down
+        node = tree[0]
+        while node.replies:
+            assert len(node.replies) == 1
+            node = node.replies[0]
+        assert node.body == "7"
+        assert node.level == 7
+    assert len(statements) == 2
+
+
+def test_get_comment_subtree(client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    first = operations.create_comment(body="First", author=author, blog=blog)
+    reply = operations.create_comment(
+        body="Reply", author=author, parent=first
+    )
+    operations.create_comment(body="Nested", author=author, parent=reply)
+
+    tree = queries.get_comment_threads_page(parent=first).items
+
+    assert [node.body for node in tree] == ["Reply"]
+    assert [node.body for node in tree[0].replies] == ["Nested"]
+
+
+def test_get_comment_threads_page(client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    last = _create_thread(author=author, blog=blog)
+    for body in ("First", "Second"):
+        operations.create_comment(body=body, author=author, blog=blog)
+    threads = queries.get_comment_threads_page(blog=blog).items
+
+    # Threads should be paged through in the same order as a single page
+    first = queries.get_comment_threads_page(blog=blog, per_page=2)
+    second = queries.get_comment_threads_page(
+        blog=blog, per_page=2, cursor=first.next_cursor
+    )
+    assert [node.id for node in first.items + second.items] == [
+        node.id for node in threads
+    ]
+    assert second.next_cursor is None
+    previous = queries.get_comment_threads_page(
+        blog=blog, per_page=2, cursor=second.prev_cursor
+    )
+    assert [node.id for node in previous.items] == [
+        node.id for node in first.items
+    ]
+
+    # Replies beyond the maximum depth should be left for their own cursor
+    thread = next(node for node in threads if node.body == "0")
+    page = queries.get_comment_threads_page(blog=blog, max_depth=2)
+    node = next(node for node in page.items if node.id == thread.id)
+    assert node.replies_cursor is None
+    node = node.replies[0].replies[0]
+    assert node.level == 2
+    assert node.replies == []
+    assert node.replies_cursor is not None
+
+    page = queries.get_comment_threads_page(
+        parent=queries.get_comment(id=node.id),
+        cursor=node.replies_cursor,
+        max_depth=2,
+    )
+    assert [node.level for node in page.items] == [3]
+    node = page.items[0].replies[0].replies[0]
+    assert node.level == 5
+    assert node.replies_cursor is not None
+
+    # Threads without deeper replies have nothing to continue
+    page = queries.get_comment_threads_page(
+        parent=queries.get_comment(id=last.parent_id), max_depth=2
+    )
+    assert [node.body for node in page.items] == ["7"]
+    assert page.items[0].replies_cursor is None
+
+
+def test_get_comment_threads_without_legacy_comments(
+    client, database, factory
+):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    legacy = operations.create_comment(
+        body="It's time", author=author, blog=blog
+    )
+    operations.create_comment(body="Reply", author=author, parent=legacy)
+    operations.create_comment(body="Well may we say", author=author, blog=blog)
+    # Comments from before paths were added have none
+    table = comment_models.Comment.__table__
+    database.session.execute(
+        table.update()
+        .where(table.c.id == legacy.id)
+        .values(path=None, updated_at=table.c.updated_at)
+    )
+    database.session.commit()
+
+    threads = queries.get_comment_threads_page(blog=blog).items
+
+    assert [node.body for node in threads] == ["Well may we say"]
+    assert legacy.level == 0
+    replies = queries.get_comment_threads_page(parent=legacy).items
+    assert [node.body for node in replies] == ["Reply"]
+
+
+def test_delete_comment_subtree(client, database, factory, foreign_keys):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    leaf = _create_thread(author=author, blog=blog)
+    root = leaf
+    while root.parent is not None:
+        root = root.parent
+    middle = root.replies.one()
+    other = operations.create_comment(body="Other", author=author, blog=blog)
+    middle_id, leaf_id, _ = middle.id, leaf.id, blog.id
+
+    with utils.count_queries(engine=database.engine) as statements:
+        operations.delete_comment(comment=middle)
+
+        # The replies, however many there are, then the comment
+        deletes = [s for s in statements if s.startswith("DELETE")]
+        assert len(deletes) == 2
+
+    assert comment_models.Comment.query.get(middle_id) is None
+    assert comment_models.Comment.query.get(leaf_id) is None
+    assert comment_models.Comment.query.count() == 2
+    assert blog.comment_count == 2
+    assert root.reply_count == 0
+    assert other.reply_count == 0
+
+
+def test_delete_legacy_comment(client, database, factory, foreign_keys):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    comment = operations.create_comment(
+        body="It's time", author=author, blog=blog
+    )
+    reply = operations.create_comment(
+        body="Well may we say", author=author, parent=comment
+    )
+    reply_id = reply.id
+    # Comments from before paths were added have none
+    table = comment_models.Comment.__table__
+    database.session.execute(
+        table.update()
+        .where(table.c.id == reply_id)
+        .values(path=None, updated_at=table.c.updated_at)
+    )
+    database.session.commit()
+
+    operations.delete_comment(
+        comment=comment_models.Comment.query.get(reply_id)
+    )
+
+    assert comment_models.Comment.query.get(reply_id) is None
+    assert comment.reply_count == 0
+    assert blog.comment_count == 1
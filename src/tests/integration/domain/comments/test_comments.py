@@ -0,0 +1,89 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from unittest import mock
+
+from website import db
+from website.data.comments import models
+from website.domain.comments import operations
+
+
+def test_create_comment_commits_once(client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+
+    with mock.patch.object(
+        db.session, "commit", wraps=db.session.commit
+    ) as commit:
+        comment = operations.create_comment(
+            body="It's time", author=author, blog=blog
+        )
+        reply = operations.create_comment(
+            body="Well may we say", author=author, parent=comment
+        )
+
+    assert commit.call_count == 2
+    assert comment.path == f"{comment.id:010d}"
+    assert reply.path == f"{comment.id:010d}.{reply.id:010d}"
+    assert reply.thread_at == comment.thread_at
+    assert comment.updated_at is None
+    assert reply.level == 1
+
+
+def test_comment_counts_are_maintained(client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    comment = operations.create_comment(
+        body="It's time", author=author, blog=blog
+    )
+    reply = operations.create_comment(
+        body="Well may we say", author=author, parent=comment
+    )
+    operations.create_comment(body="God save", author=author, parent=reply)
+    other = operations.create_comment(
+        body="Maintain", author=author, blog=blog
+    )
+
+    assert blog.comment_count == 4
+    assert comment.reply_count == 1
+    assert reply.reply_count == 1
+    assert blog.updated_at is None
+
+    operations.delete_comment(comment=reply)
+
+    assert blog.comment_count == 2
+    assert comment.reply_count == 0
+    assert other.reply_count == 0
+
+
+def test_recount_comments(client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    comment = operations.create_comment(
+        body="It's time", author=author, blog=blog
+    )
+    operations.create_comment(
+        body="Well may we say", author=author, parent=comment
+    )
+    blog.comment_count = 0
+    comment.reply_count = 5
+    database.session.commit()
+
+    models.Comment.recount()
+
+    assert blog.comment_count == 2
+    assert comment.reply_count == 1
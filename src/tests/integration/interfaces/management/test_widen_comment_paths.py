@@ -0,0 +1,107 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from website import db
+from website.data.comments import models
+from website.domain.comments import operations
+from website.interfaces.management.tempjobs import commands as tempjob_commands
+from website.interfaces.management.tempjobs.commands import widen_comment_paths
+
+
+def _create_legacy_thread(author, blog):
+    comment = operations.create_comment(
+        body="It's time", author=author, blog=blog
+    )
+    reply = operations.create_comment(
+        body="Well may we say", author=author, parent=comment
+    )
+    # Pad the paths to the old width, as they were before widening
+    table = models.Comment.__table__
+    for instance in (comment, reply):
+        db.session.execute(
+            table.update()
+            .where(table.c.id == instance.id)
+            .values(
+                path=models.PATH_SEPARATOR.join(
+                    f"{int(segment):06d}"
+                    for segment in instance.path.split(models.PATH_SEPARATOR)
+                ),
+                updated_at=table.c.updated_at,
+            )
+        )
+    return comment.id, reply.id
+
+
+def _get_path(id):
+    return models.Comment.query.get(id).path
+
+
+def test_widen_comment_paths_in_batches(app, client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    comment_id, reply_id = _create_legacy_thread(author=author, blog=blog)
+    other_id = operations.create_comment(
+        body="Maintain", author=author, blog=blog
+    ).id
+    database.session.commit()
+
+    result = app.test_cli_runner().invoke(
+        widen_comment_paths.command, ["--batch-size", "1", "--not-dry-run"]
+    )
+
+    assert result.exit_code == 0
+    assert "Rewrote 2 paths to 10 digits." in result.output
+    assert _get_path(comment_id) == f"{comment_id:010d}"
+    assert _get_path(reply_id) == f"{comment_id:010d}.{reply_id:010d}"
+    assert _get_path(other_id) == f"{other_id:010d}"
+    assert models.Comment.query.get(reply_id).updated_at is None
+
+
+def test_widen_comment_paths_resumes_after_id(app, client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    comment_id, reply_id = _create_legacy_thread(author=author, blog=blog)
+    database.session.commit()
+
+    result = app.test_cli_runner().invoke(
+        widen_comment_paths.command,
+        ["--after-id", str(comment_id), "--not-dry-run"],
+    )
+
+    assert result.exit_code == 0
+    assert _get_path(comment_id) == f"{comment_id:06d}"
+    assert _get_path(reply_id) == f"{comment_id:010d}.{reply_id:010d}"
+
+
+def test_widen_comment_paths_dry_run(app, client, database, factory):
+    author = factory.Account(confirmed=True)
+    blog = factory.Blog(comment=True)
+    comment_id, _ = _create_legacy_thread(author=author, blog=blog)
+    database.session.commit()
+
+    result = app.test_cli_runner().invoke(widen_comment_paths.command, [])
+
+    assert result.exit_code == 0
+    assert "Would rewrite 2 paths to 10 digits." in result.output
+    assert _get_path(comment_id) == f"{comment_id:06d}"
+
+
+def test_widen_comment_paths_is_registered():
+    # Run as `flask tempjob widen_comment_paths`
+    assert tempjob_commands.tempjob.cli.commands["widen_comment_paths"] is (
+        widen_comment_paths.command
+    )
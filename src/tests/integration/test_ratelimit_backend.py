@@ -0,0 +1,82 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+
+from website import ratelimit
+from website.data.ratelimit import models
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def backend(app, clock):
+    return ratelimit.DatabaseBackend(config=app.config, clock=clock)
+
+
+def test_bucket_allows_burst_then_waits(client, database, backend):
+    limit = ratelimit.Limit(capacity=2, period=60)
+
+    waits = [backend.consume(key="a", limit=limit) for _ in range(3)]
+
+    assert waits == [0, 0, pytest.approx(30)]
+
+
+def test_bucket_refills_over_time(client, database, backend, clock):
+    limit = ratelimit.Limit(capacity=2, period=60)
+    backend.consume(key="a", limit=limit)
+    backend.consume(key="a", limit=limit)
+
+    clock.now += 20
+    assert backend.consume(key="a", limit=limit) == pytest.approx(10)
+    clock.now += 10
+    assert backend.consume(key="a", limit=limit) == 0
+    assert backend.consume(key="a", limit=limit) == pytest.approx(30)
+
+
+def test_buckets_are_shared(app, client, database, clock):
+    # Each worker process creates its own backend
+    limit = ratelimit.Limit(capacity=1, period=60)
+    first = ratelimit.DatabaseBackend(config=app.config, clock=clock)
+    second = ratelimit.DatabaseBackend(config=app.config, clock=clock)
+
+    assert first.consume(key="a", limit=limit) == 0
+    assert second.consume(key="a", limit=limit) == pytest.approx(60)
+    assert second.consume(key="b", limit=limit) == 0
+
+
+def test_full_buckets_are_removed(client, database, backend, clock):
+    limit = ratelimit.Limit(capacity=1, period=60)
+    backend.consume(key="a", limit=limit)
+
+    clock.now += 60
+    backend.consume(key="b", limit=limit)
+
+    assert [bucket.key for bucket in models.RateLimitBucket.query] == ["b"]
+    backend.clear()
+    assert models.RateLimitBucket.query.count() == 0
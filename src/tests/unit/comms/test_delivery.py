@@ -0,0 +1,100 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import smtplib
+from unittest import mock
+
+import flask
+import flask_mail
+import pytest
+
+from website import mail
+from website.comms import delivery
+
+
+@pytest.fixture()
+def app():
+    app = flask.Flask(__name__)
+    app.config.update(MAIL_SUPPRESS_SEND=True)
+    mail.init_app(app)
+    with app.app_context():
+        yield app
+
+
+def _message(number):
+    return flask_mail.Message(
+        subject=f"Message {number}",
+        sender="gough.whitlam@alp.org.au",
+        recipients=["jeremy.corbyn@labour.org.uk"],
+        body="text",
+    )
+
+
+class TestSendBatch:
+    def test_batch_is_sent_over_one_connection(self, app):
+        # ARRANGE
+        messages = [_message(number) for number in range(5)]
+
+        # ACT
+        with mock.patch.object(
+            target=mail, attribute="connect", wraps=mail.connect
+        ) as mock_connect, mail.record_messages() as outbox:
+            errors = delivery.send_batch(messages=messages)
+
+        # ASSERT
+        assert mock_connect.call_count == 1
+        assert outbox == messages
+        assert errors == [None] * 5
+
+    def test_refused_recipients_do_not_stop_batch(self, app):
+        # ARRANGE
+        connection = mock.MagicMock()
+        connection.__enter__.return_value = connection
+        connection.send.side_effect = [
+            smtplib.SMTPRecipientsRefused(recipients={}),
+            None,
+        ]
+
+        # ACT
+        with mock.patch.object(
+            target=mail, attribute="connect", return_value=connection
+        ):
+            errors = delivery.send_batch(messages=[_message(1), _message(2)])
+
+        # ASSERT
+        assert errors[0] is not None
+        assert errors[1] is None
+
+    def test_failed_connection_fails_remaining_messages(self, app):
+        # ARRANGE
+        connection = mock.MagicMock()
+        connection.__enter__.return_value = connection
+        connection.send.side_effect = [
+            None,
+            smtplib.SMTPServerDisconnected("Gone"),
+        ]
+
+        # ACT
+        with mock.patch.object(
+            target=mail, attribute="connect", return_value=connection
+        ):
+            errors = delivery.send_batch(
+                messages=[_message(number) for number in range(3)]
+            )
+
+        # ASSERT
+        assert errors == [None, "Gone", "Gone"]
@@ -14,65 +14,80 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-import threading
 from unittest import mock
 
 import flask
-import flask_mail
+import pytest
 
 from website.comms import dispatch
+from website.data.outbox import models as outbox_models
 from website.domain.accounts import utils
 
 
+class TestInitApp:
+    @pytest.mark.parametrize(
+        argnames="config",
+        argvalues=[
+            {"MAIL_SENDER": "gough.whitlam@alp.org.au"},
+            {"MAIL_DEFAULT_SENDER": "gough.whitlam@alp.org.au"},
+        ],
+    )
+    def test_sender_is_set(self, config):
+        # ARRANGE
+        app = flask.Flask(import_name=__name__)
+        app.config.update(MAIL_SENDER=None, MAIL_DEFAULT_SENDER=None)
+        app.config.update(config)
+
+        # ACT / ASSERT
+        dispatch.init_app(app=app)
+
+    def test_missing_sender_raises_exception(self):
+        # ARRANGE
+        app = flask.Flask(import_name=__name__)
+        app.config.update(MAIL_SENDER=None, MAIL_DEFAULT_SENDER=None)
+
+        # ACT / ASSERT
+        with pytest.raises(expected_exception=ValueError):
+            dispatch.init_app(app=app)
+
+
 class TestSendConfirmAccountEmail:
     @mock.patch.object(
         target=flask,
         attribute="current_app",
         new=mock.Mock(config={"MAIL_SENDER": "gough.whitlam@alp.org.au"}),
     )
-    @mock.patch.object(target=flask, attribute="render_template")
+    @mock.patch.object(target=flask, attribute="url_for")
     @mock.patch.object(target=dispatch, attribute="_send_email")
     @mock.patch.object(target=utils, attribute="get_confirm_email_token")
     def test_confirm_account_email_sent(
-        self,
-        mock_get_confirm_email_token,
-        mock_send_email,
-        mock_render_template,
+        self, mock_get_confirm_email_token, mock_send_email, mock_url_for,
     ):
         # ARRANGE
-        text_template = "emails/confirm_email/confirm_email.txt"
-        html_template = "emails/confirm_email/confirm_email.html"
         token = "valid_token"
-        website_name = "Website"
-        account = mock.Mock(email="jeremy.corbyn@labour.org.uk")
+        account = mock.Mock(
+            email="jeremy.corbyn@labour.org.uk", username="jeremy"
+        )
         mock_get_confirm_email_token.return_value = token
+        mock_url_for.return_value = "http://localhost/confirm_account"
 
         # ACT
         dispatch.send_confirm_account_email(account=account)
 
         # ASSERT
-        mock_render_template.assert_has_calls(
-            calls=[
-                mock.call(
-                    account=account,
-                    name=website_name,
-                    template_name_or_list=text_template,
-                    token=token,
-                ),
-                mock.call(
-                    account=account,
-                    name=website_name,
-                    template_name_or_list=html_template,
-                    token=token,
-                ),
-            ]
+        mock_url_for.assert_called_once_with(
+            endpoint="accounts.confirm_email", token=token, _external=True
         )
         mock_send_email.assert_called_once_with(
             subject="Confirm your email",
             sender="gough.whitlam@alp.org.au",
             recipients=[account.email],
-            text_body=mock.ANY,
-            html_body=mock.ANY,
+            template="confirm_email",
+            context={
+                "name": "Website",
+                "username": "jeremy",
+                "url": "http://localhost/confirm_account",
+            },
         )
 
 
@@ -82,49 +97,37 @@ class TestSendResetPasswordEmail:
         attribute="current_app",
         new=mock.Mock(config={"MAIL_SENDER": "gough.whitlam@alp.org.au"}),
     )
-    @mock.patch.object(target=flask, attribute="render_template")
+    @mock.patch.object(target=flask, attribute="url_for")
     @mock.patch.object(target=dispatch, attribute="_send_email")
     @mock.patch.object(target=utils, attribute="get_reset_password_token")
     def test_reset_password_email_sent(
-        self,
-        mock_get_reset_password_token,
-        mock_send_email,
-        mock_render_template,
+        self, mock_get_reset_password_token, mock_send_email, mock_url_for,
     ):
         # ARRANGE
-        text_template = "emails/reset_password/reset_password.txt"
-        html_template = "emails/reset_password/reset_password.html"
         token = "valid_token"
-        website_name = "Website"
-        account = mock.Mock(email="jeremy.corbyn@labour.org.uk")
+        account = mock.Mock(
+            email="jeremy.corbyn@labour.org.uk", username="jeremy"
+        )
         mock_get_reset_password_token.return_value = token
+        mock_url_for.return_value = "http://localhost/reset_password"
 
         # ACT
         dispatch.send_reset_password_email(account=account)
 
         # ASSERT
-        mock_render_template.assert_has_calls(
-            calls=[
-                mock.call(
-                    account=account,
-                    name=website_name,
-                    template_name_or_list=text_template,
-                    token=token,
-                ),
-                mock.call(
-                    account=account,
-                    name=website_name,
-                    template_name_or_list=html_template,
-                    token=token,
-                ),
-            ]
+        mock_url_for.assert_called_once_with(
+            endpoint="accounts.reset_password", token=token, _external=True
         )
         mock_send_email.assert_called_once_with(
             subject="Reset your password",
             sender="gough.whitlam@alp.org.au",
             recipients=[account.email],
-            text_body=mock.ANY,
-            html_body=mock.ANY,
+            template="reset_password",
+            context={
+                "name": "Website",
+                "username": "jeremy",
+                "url": "http://localhost/reset_password",
+            },
         )
 
 
@@ -139,14 +142,9 @@ class TestSendContactEmail:
             }
         ),
     )
-    @mock.patch.object(target=flask, attribute="render_template")
     @mock.patch.object(target=dispatch, attribute="_send_email")
-    def test_contact_email_sent(
-        self, mock_send_email, mock_render_template,
-    ):
+    def test_contact_email_sent(self, mock_send_email):
         # ARRANGE
-        text_template = "emails/contact_email/contact_email.txt"
-        html_template = "emails/contact_email/contact_email.html"
         email = "jeremy.corbyn@labour.org.uk"
         enquiry = "For the many, not the few."
         body = "It's time"
@@ -155,60 +153,57 @@ class TestSendContactEmail:
         dispatch.send_contact_email(email=email, enquiry=enquiry, body=body)
 
         # ASSERT
-        mock_render_template.assert_has_calls(
-            calls=[
-                mock.call(
-                    email=email,
-                    enquiry=enquiry,
-                    body=body,
-                    template_name_or_list=text_template,
-                ),
-                mock.call(
-                    email=email,
-                    enquiry=enquiry,
-                    body=body,
-                    template_name_or_list=html_template,
-                ),
-            ]
-        )
         mock_send_email.assert_called_once_with(
             subject=f"Enquiry: {enquiry}",
             sender="gough.whitlam@alp.org.au",
             recipients=["richard.dinatale@greens.org.au"],
-            text_body=mock.ANY,
-            html_body=mock.ANY,
+            template="contact_email",
+            context={"email": email, "enquiry": enquiry, "body": body},
         )
 
 
 class TestSendEmail:
-    @mock.patch.object(target=threading, attribute="Thread")
-    @mock.patch.object(target=flask_mail, attribute="Message")
-    @mock.patch.object(target=dispatch, attribute="_send_async_email")
-    @mock.patch.object(target=flask, attribute="current_app", new=mock.Mock())
-    def test_send_email_happy_path(
-        self, mock_send_async_email, mock_message, mock_thread,
-    ):
-        # ARRANGE
-        message = mock.Mock()
-        mock_message.return_value = message
-
+    @mock.patch.object(target=outbox_models.OutboxEmail, attribute="new")
+    def test_send_email_happy_path(self, mock_new):
         # ACT
         dispatch._send_email(
             subject="For the many, not the few",
             sender="gough.whitlam@alp.org.au",
             recipients=["jeremy.corbyn@labour.org.uk"],
-            text_body="text",
-            html_body="text",
+            template="contact_email",
+            context={"body": "It's time"},
         )
 
         # ASSERT
-        mock_message.assert_called_once_with(
+        mock_new.assert_called_once_with(
             subject="For the many, not the few",
             sender="gough.whitlam@alp.org.au",
             recipients=["jeremy.corbyn@labour.org.uk"],
-            body="text",
-            html="text",
+            template="contact_email",
+            context={"body": "It's time"},
         )
-        mock_thread.assert_called_once_with(
-            target=mock_send_async_email, args=(mock.ANY, message)
+
+    @mock.patch.object(
+        target=flask,
+        attribute="current_app",
+        new=mock.Mock(config={"MAIL_DEFAULT_SENDER": "bob.hawke@alp.org.au"}),
+    )
+    @mock.patch.object(target=outbox_models.OutboxEmail, attribute="new")
+    def test_send_email_default_sender(self, mock_new):
+        # ACT
+        dispatch._send_email(
+            subject="For the many, not the few",
+            sender=None,
+            recipients=["jeremy.corbyn@labour.org.uk"],
+            template="contact_email",
+            context={"body": "It's time"},
+        )
+
+        # ASSERT
+        mock_new.assert_called_once_with(
+            subject="For the many, not the few",
+            sender="bob.hawke@alp.org.au",
+            recipients=["jeremy.corbyn@labour.org.uk"],
+            template="contact_email",
+            context={"body": "It's time"},
         )
@@ -0,0 +1,71 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+
+import flask
+import jinja2
+import pytest
+
+import website
+from website.comms import templates
+
+TEMPLATE_FOLDER = os.path.join(
+    os.path.dirname(website.__file__), "interfaces/common/templates"
+)
+
+
+@pytest.fixture()
+def app():
+    app = flask.Flask(__name__, template_folder=TEMPLATE_FOLDER)
+    templates.templates.init_app(app=app)
+    with app.app_context():
+        yield app
+
+
+class TestEmailTemplates:
+    def test_email_templates_are_precompiled(self, app):
+        assert "emails/contact_email/contact_email.txt" in (
+            app.extensions["email_templates"]
+        )
+        assert not any(
+            not name.startswith("emails/")
+            for name in app.extensions["email_templates"]
+        )
+
+    def test_only_html_is_escaped(self, app):
+        # ACT
+        rendered = templates.templates.render(
+            name="contact_email",
+            context={
+                "email": "jeremy.corbyn@labour.org.uk",
+                "enquiry": "<b>",
+                "body": "For the many, not the few",
+            },
+        )
+
+        # ASSERT
+        assert "<b>" in rendered.text
+        assert "&lt;b&gt;" in rendered.html
+
+    def test_missing_context_raises_exception(self, app):
+        with pytest.raises(expected_exception=jinja2.UndefinedError):
+            templates.templates.render(name="contact_email", context={})
+
+    def test_missing_template_raises_exception(self, app):
+        with pytest.raises(expected_exception=jinja2.TemplateNotFound):
+            templates.templates.render(name="missing", context={})
@@ -0,0 +1,85 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import threading
+
+import flask
+import pytest
+
+from website.data.accounts import hashing
+
+
+@pytest.fixture()
+def config():
+    app = flask.Flask(__name__)
+    app.config.update(
+        PASSWORD_HASH_WORKERS=0,
+        PASSWORD_HASH_QUEUE=1,
+        PASSWORD_HASH_TIMEOUT=10,
+    )
+    with app.app_context():
+        yield app.config
+
+
+class TestHashingPool:
+    def test_inline_hashing_is_bounded(self, config):
+        # ARRANGE
+        app = flask.current_app._get_current_object()
+        pool = hashing.HashingPool()
+        started, release = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            release.wait()
+
+        def run_in_thread():
+            with app.app_context():
+                pool.run(hold)
+
+        thread = threading.Thread(target=run_in_thread)
+        thread.start()
+        started.wait()
+
+        # ACT / ASSERT
+        with pytest.raises(expected_exception=hashing.PoolFull):
+            pool.run(pow, 2, 3)
+        release.set()
+        thread.join()
+        assert pool.run(pow, 2, 3) == 8
+
+    def test_hashing_in_worker_processes(self, config):
+        # ARRANGE
+        config["PASSWORD_HASH_WORKERS"] = 1
+        pool = hashing.HashingPool()
+
+        # ACT
+        try:
+            result = pool.run(pow, 2, 10)
+        finally:
+            pool.shutdown()
+
+        # ASSERT
+        assert result == 1024
+
+    def test_full_queue_fails_fast(self, config):
+        # ARRANGE
+        config["PASSWORD_HASH_QUEUE"] = 0
+        pool = hashing.HashingPool()
+
+        # ACT / ASSERT
+        with pytest.raises(expected_exception=hashing.PoolFull):
+            pool.run(pow, 2, 3)
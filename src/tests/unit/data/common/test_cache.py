@@ -0,0 +1,75 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from website.data.common import cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache:
+    def test_item_expires_after_ttl(self):
+        # ARRANGE
+        clock = Clock()
+        lru_cache = cache.LRUCache(max_size=2, clock=clock)
+        lru_cache.set("key", "value", ttl=10)
+
+        # ACT
+        clock.now = 9
+        fresh = lru_cache.get("key")
+        clock.now = 10
+        expired = lru_cache.get("key")
+
+        # ASSERT
+        assert fresh == "value"
+        assert expired is None
+        assert len(lru_cache) == 0
+
+    def test_least_recently_used_item_is_evicted(self):
+        # ARRANGE
+        lru_cache = cache.LRUCache(max_size=2)
+        lru_cache.set("first", 1, ttl=10)
+        lru_cache.set("second", 2, ttl=10)
+        lru_cache.get("first")
+
+        # ACT
+        lru_cache.set("third", 3, ttl=10)
+
+        # ASSERT
+        assert lru_cache.get("first") == 1
+        assert lru_cache.get("second") is None
+        assert lru_cache.get("third") == 3
+
+    def test_delete_and_clear(self):
+        # ARRANGE
+        lru_cache = cache.LRUCache(max_size=2)
+        lru_cache.set("first", 1, ttl=10)
+        lru_cache.set("second", 2, ttl=10)
+
+        # ACT
+        lru_cache.delete("first")
+        lru_cache.delete("missing")
+
+        # ASSERT
+        assert lru_cache.get("first") is None
+        lru_cache.clear()
+        assert len(lru_cache) == 0
@@ -14,25 +14,22 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-import datetime
 from unittest import mock
 
 from website.domain.blogs import queries
 
 
 class TestRetrieveArchivedBlogs:
-    @mock.patch.object(target=queries, attribute="get_blogs")
-    def test_blogs_have_correct_format(self, mock_get_blogs):
-        newest_blog = mock.Mock(
-            created_at=datetime.datetime(year=2020, month=1, day=6)
-        )
-        midway_blog = mock.Mock(
-            created_at=datetime.datetime(year=2020, month=1, day=1)
-        )
-        oldest_blog = mock.Mock(
-            created_at=datetime.datetime(year=2019, month=5, day=1)
-        )
-        mock_get_blogs.return_value = [newest_blog, midway_blog, oldest_blog]
+    @mock.patch.object(target=queries, attribute="get_archive_entries")
+    def test_blogs_have_correct_format(self, mock_get_archive_entries):
+        newest_blog = mock.Mock(year=2020, month=1)
+        midway_blog = mock.Mock(year=2020, month=1)
+        oldest_blog = mock.Mock(year=2019, month=5)
+        mock_get_archive_entries.return_value = [
+            newest_blog,
+            midway_blog,
+            oldest_blog,
+        ]
 
         data = queries.retrieve_archived_blogs()
 
@@ -40,3 +37,18 @@ class TestRetrieveArchivedBlogs:
             2020: {1: [newest_blog, midway_blog]},
             2019: {5: [oldest_blog]},
         }
+        assert list(data) == [2020, 2019]
+        mock_get_archive_entries.assert_called_once_with(published=None)
+
+    @mock.patch.object(target=queries, attribute="get_archive_entries")
+    @mock.patch.object(target=queries, attribute="get_archive_index")
+    def test_published_blogs_read_from_archive_index(
+        self, mock_get_archive_index, mock_get_archive_entries
+    ):
+        entry = mock.Mock(year=2020, month=1)
+        mock_get_archive_index.return_value = [entry]
+
+        data = queries.retrieve_archived_blogs(published=True)
+
+        assert data == {2020: {1: [entry]}}
+        mock_get_archive_entries.assert_not_called()
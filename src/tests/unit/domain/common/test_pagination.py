@@ -0,0 +1,105 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from website.domain import exceptions
+from website.domain.common import pagination
+
+
+class TestCursor:
+    def test_cursor_round_trip(self):
+        # ARRANGE
+        cursor = pagination.encode_cursor(
+            direction=pagination.DIRECTION_NEXT, values=["2020-01-01", 4]
+        )
+
+        # ACT
+        decoded = pagination.decode_cursor(cursor=cursor)
+
+        # ASSERT
+        assert decoded == pagination.Cursor(
+            direction=pagination.DIRECTION_NEXT, values=["2020-01-01", 4]
+        )
+
+    @pytest.mark.parametrize(
+        argnames="cursor",
+        argvalues=[
+            "not a cursor",
+            pagination.encode_cursor(direction="sideways", values=[1]),
+        ],
+    )
+    def test_invalid_cursor_raises_exception(self, cursor):
+        with pytest.raises(expected_exception=exceptions.InvalidCursor):
+            pagination.decode_cursor(cursor=cursor)
+
+
+class TestPaginate:
+    def test_first_page_has_only_next_cursor(self):
+        # ACT
+        page = pagination.paginate(
+            rows=[3, 2, 1], per_page=2, cursor=None, key=lambda row: [row]
+        )
+
+        # ASSERT
+        assert page.items == [3, 2]
+        assert page.prev_cursor is None
+        assert pagination.decode_cursor(page.next_cursor) == (
+            pagination.Cursor(direction=pagination.DIRECTION_NEXT, values=[2])
+        )
+
+    def test_last_page_has_only_prev_cursor(self):
+        # ARRANGE
+        cursor = pagination.Cursor(
+            direction=pagination.DIRECTION_NEXT, values=[2]
+        )
+
+        # ACT
+        page = pagination.paginate(
+            rows=[1], per_page=2, cursor=cursor, key=lambda row: [row]
+        )
+
+        # ASSERT
+        assert page.items == [1]
+        assert page.next_cursor is None
+        assert pagination.decode_cursor(page.prev_cursor) == (
+            pagination.Cursor(direction=pagination.DIRECTION_PREV, values=[1])
+        )
+
+    def test_backwards_page_is_reversed(self):
+        # ARRANGE
+        cursor = pagination.Cursor(
+            direction=pagination.DIRECTION_PREV, values=[2]
+        )
+
+        # ACT
+        page = pagination.paginate(
+            rows=[3, 4, 5], per_page=2, cursor=cursor, key=lambda row: [row]
+        )
+
+        # ASSERT
+        assert page.items == [4, 3]
+        assert pagination.decode_cursor(page.next_cursor).values == [3]
+        assert pagination.decode_cursor(page.prev_cursor).values == [4]
+
+    def test_empty_page_has_no_cursors(self):
+        # ACT
+        page = pagination.paginate(
+            rows=[], per_page=2, cursor=None, key=lambda row: [row]
+        )
+
+        # ASSERT
+        assert page == pagination.Page(items=[])
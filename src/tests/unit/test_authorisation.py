@@ -1,6 +1,7 @@
 from unittest import mock
 
 import flask_bouncer
+import pytest
 from bouncer import models as bouncer_models
 
 from website import authorisation
@@ -149,3 +150,78 @@ class TestDefineAuthorisation:
                 ),
             ]
         )
+
+
+ACCOUNTS = [
+    mock.Mock(
+        id=1, is_authenticated=False, is_admin=False, is_confirmed=False
+    ),
+    mock.Mock(id=1, is_authenticated=True, is_admin=False, is_confirmed=False),
+    mock.Mock(id=1, is_authenticated=True, is_admin=False, is_confirmed=True),
+    mock.Mock(id=1, is_authenticated=True, is_admin=True, is_confirmed=True),
+]
+ACTIONS = [
+    flask_bouncer.READ,
+    flask_bouncer.SHOW,
+    flask_bouncer.CREATE,
+    flask_bouncer.EDIT,
+    flask_bouncer.DELETE,
+]
+SUBJECTS = [
+    account_models.Account,
+    blog_models.Blog,
+    category_models.Category,
+    comment_models.Comment,
+    account_models.Account(id=1),
+    account_models.Account(id=2),
+    blog_models.Blog(author_id=1, published=False),
+    blog_models.Blog(author_id=2, published=False),
+    blog_models.Blog(author_id=2, published=True),
+]
+
+
+class TestCan:
+    @pytest.mark.parametrize(argnames="account", argvalues=ACCOUNTS)
+    @pytest.mark.parametrize(argnames="action", argvalues=ACTIONS)
+    @pytest.mark.parametrize(argnames="subject", argvalues=SUBJECTS)
+    def test_compiled_rules_match_bouncer(self, account, action, subject):
+        # ARRANGE
+        ability = bouncer_models.Ability(
+            user=account,
+            authorization_method=authorisation.define_authorisation,
+        )
+        ability.aliased_actions = flask_bouncer.Bouncer().alias_actions
+
+        # ACT
+        allowed = authorisation.can(
+            action=action, subject=subject, account=account
+        )
+
+        # ASSERT
+        assert allowed == ability.can(action, subject)
+
+    def test_every_subject_of_a_rule_is_matched(self):
+        # Bouncer only matches instances against the first class of a rule,
+        # so it would refuse this
+        assert authorisation.can(
+            action=flask_bouncer.READ,
+            subject=comment_models.Comment(author_id=2),
+            account=ACCOUNTS[0],
+        )
+
+    def test_rules_are_compiled_once_per_role(self):
+        # ACT
+        anonymous = authorisation.get_rules(account=ACCOUNTS[0])
+        unconfirmed = authorisation.get_rules(account=ACCOUNTS[1])
+        confirmed = authorisation.get_rules(account=ACCOUNTS[2])
+        other = authorisation.get_rules(
+            account=mock.Mock(
+                id=2, is_authenticated=True, is_admin=False, is_confirmed=True
+            )
+        )
+
+        # ASSERT
+        assert authorisation.get_rules(account=ACCOUNTS[0]) is anonymous
+        assert authorisation.get_rules(account=ACCOUNTS[2]) is confirmed
+        assert unconfirmed == anonymous
+        assert other != confirmed
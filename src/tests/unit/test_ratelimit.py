@@ -0,0 +1,126 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from unittest import mock
+
+import flask
+import pytest
+from werkzeug import utils
+
+from website import ratelimit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+@pytest.fixture()
+def backend(clock):
+    return ratelimit.MemoryBackend(
+        config={"RATELIMIT_MEMORY_SIZE": 2}, clock=clock
+    )
+
+
+class TestMemoryBackend:
+    def test_bucket_allows_burst_then_waits(self, backend):
+        # ARRANGE
+        limit = ratelimit.Limit(capacity=2, period=60)
+
+        # ACT
+        waits = [backend.consume(key="a", limit=limit) for _ in range(3)]
+
+        # ASSERT
+        assert waits == [0, 0, 30]
+
+    def test_bucket_refills_over_time(self, backend, clock):
+        # ARRANGE
+        limit = ratelimit.Limit(capacity=2, period=60)
+        backend.consume(key="a", limit=limit)
+        backend.consume(key="a", limit=limit)
+
+        # ACT
+        clock.now = 20
+        wait = backend.consume(key="a", limit=limit)
+
+        # ASSERT
+        assert wait == pytest.approx(10)
+        clock.now = 30
+        assert backend.consume(key="a", limit=limit) == 0
+
+    def test_buckets_are_separate(self, backend):
+        # ARRANGE
+        limit = ratelimit.Limit(capacity=1, period=60)
+        backend.consume(key="a", limit=limit)
+
+        # ACT / ASSERT
+        assert backend.consume(key="b", limit=limit) == 0
+        assert backend.consume(key="a", limit=limit) == 60
+
+    def test_full_buckets_are_forgotten(self, backend, clock):
+        # ARRANGE
+        limit = ratelimit.Limit(capacity=1, period=60)
+        backend.consume(key="a", limit=limit)
+
+        # ACT
+        clock.now = 60
+
+        # ASSERT
+        assert backend._buckets.get(key="a") is None
+        assert backend.consume(key="a", limit=limit) == 0
+
+
+class TestInitApp:
+    def test_incomplete_backend_raises_exception(self):
+        # ARRANGE
+        class IncompleteBackend(ratelimit.Backend):
+            def consume(self, key, limit):
+                return 0
+
+        app = flask.Flask(import_name=__name__)
+        app.config["RATELIMIT_BACKEND"] = "tests.IncompleteBackend"
+
+        # ACT / ASSERT
+        with mock.patch.object(
+            target=utils,
+            attribute="import_string",
+            return_value=IncompleteBackend,
+        ):
+            with pytest.raises(expected_exception=TypeError):
+                ratelimit.init_app(app=app)
+
+
+class TestParseLimit:
+    def test_parse_limit(self):
+        assert ratelimit.parse_limit(value="10/3600") == ratelimit.Limit(
+            capacity=10, period=3600
+        )
+
+    @pytest.mark.parametrize(
+        argnames="value", argvalues=["10", "ten/3600", "0/3600", "1/0"]
+    )
+    def test_invalid_limit_raises_exception(self, value):
+        with pytest.raises(expected_exception=ValueError):
+            ratelimit.parse_limit(value=value)
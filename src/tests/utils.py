@@ -14,6 +14,29 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import contextlib
+
+from sqlalchemy import event
+
+
+@contextlib.contextmanager
+def count_queries(engine):
+    """
+    Record every SQL statement executed on the engine within the context.
+
+    Yields the list of recorded statements.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args, **kwargs):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
 
 def login_account(client, email: str, password: str):
     """
@@ -87,6 +87,21 @@ class Website(flask.Flask):
         # Flask-Mail
         mail.init_app(app=self)
 
+        # Outbound email, queued in the outbox
+        from website.comms import dispatch
+
+        dispatch.init_app(app=self)
+
+        # Email templates, rendered by the outbox worker
+        from website.comms import templates
+
+        templates.templates.init_app(app=self)
+
+        # Rate limits
+        from website import ratelimit
+
+        ratelimit.init_app(app=self)
+
         # Flask-Marshmallow
         marshmallow.init_app(app=self)
 
@@ -136,10 +151,14 @@ class Website(flask.Flask):
         self.register_blueprint(blueprint=comment_views.comments)
 
     def register_commands(self):
+        from website.interfaces.management.systemjobs import (
+            commands as systemjob_commands,
+        )
         from website.interfaces.management.tempjobs import (
             commands as tempjob_commands,
         )
 
+        self.register_blueprint(blueprint=systemjob_commands.systemjob)
         self.register_blueprint(blueprint=tempjob_commands.tempjob)
 
 
@@ -14,9 +14,16 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import functools
+import inspect
+from typing import Any, Callable, FrozenSet, NamedTuple, Optional, Tuple
+
+import flask
 import flask_bouncer
 from bouncer import models as bouncer_models
+from werkzeug import exceptions as http_exceptions
 
+from website import bouncer
 from website.data.accounts import models as account_models
 from website.data.blogs import models as blog_models
 from website.data.categories import models as category_models
@@ -76,3 +83,163 @@ def define_authorisation(
     they.can(
         action=flask_bouncer.READ, subject=blog_models.Blog, published=True
     )
+
+
+# The classes of account that rules are compiled for. Only the rules of
+# confirmed accounts depend on who the account is.
+ROLE_ANONYMOUS = "anonymous"
+ROLE_UNCONFIRMED = "unconfirmed"
+ROLE_CONFIRMED = "confirmed"
+ROLE_ADMIN = "admin"
+
+# Maximum number of compiled rule sets kept, one per confirmed account
+RULES_CACHE_SIZE = 1024
+
+
+class CompiledRule(NamedTuple):
+    """
+    A bouncer Rule with its actions expanded and its subjects and conditions
+    flattened, so that it can be matched without building an Ability.
+    """
+
+    allowed: bool
+    actions: FrozenSet[str]
+    subjects: Tuple[Any, ...]
+    conditions: Tuple[Tuple[str, Any], ...]
+
+
+class _Principal(NamedTuple):
+    """
+    Stand-in for an Account with a given role, to compile rules from.
+    """
+
+    id: Optional[int]
+    is_authenticated: bool
+    is_admin: bool
+    is_confirmed: bool
+
+
+def can(action: str, subject: Any, account: Optional[Any] = None) -> bool:
+    """
+    Check whether an account, the current user by default, can perform an
+    action on a subject. A drop-in for `flask_bouncer.can` which evaluates the
+    compiled rules of the account's role.
+    """
+    if flask.has_request_context():
+        flask.request._authorized = True
+    if account is None:
+        account = bouncer.get_current_user()
+    is_class = inspect.isclass(subject)
+    for rule in reversed(get_rules(account=account)):
+        if _matches(
+            rule=rule, action=action, subject=subject, is_class=is_class
+        ):
+            return rule.allowed
+    return False
+
+
+def ensure(action: str, subject: Any):
+    """
+    A drop-in for `flask_bouncer.ensure`.
+
+    Raises:
+        - `Forbidden` if the current user cannot perform the action.
+    """
+    account = bouncer.get_current_user()
+    if not can(action=action, subject=subject, account=account):
+        raise http_exceptions.Forbidden(
+            f"{account} does not have {action} access to {subject}"
+        )
+
+
+def requires(action: str, subject: Any) -> Callable:
+    """
+    A drop-in for the `flask_bouncer.requires` view decorator.
+    """
+
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def decorated_function(*args, **kwargs):
+            ensure(action=action, subject=subject)
+            return view_func(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
+def get_rules(account: Any) -> Tuple[CompiledRule, ...]:
+    """
+    Return the compiled rules of an account, which are compiled once for each
+    role (and each confirmed account) and then cached.
+    """
+    if not account.is_authenticated:
+        return _compile_rules(role=ROLE_ANONYMOUS, account_id=None)
+    if account.is_admin:
+        return _compile_rules(role=ROLE_ADMIN, account_id=None)
+    if account.is_confirmed:
+        return _compile_rules(role=ROLE_CONFIRMED, account_id=account.id)
+    return _compile_rules(role=ROLE_UNCONFIRMED, account_id=None)
+
+
+# Private
+
+
+@functools.lru_cache(maxsize=RULES_CACHE_SIZE)
+def _compile_rules(
+    role: str, account_id: Optional[int]
+) -> Tuple[CompiledRule, ...]:
+    """
+    Define the rules of a role with `define_authorisation`, and compile them.
+    """
+    principal = _Principal(
+        id=account_id,
+        is_authenticated=role != ROLE_ANONYMOUS,
+        is_admin=role == ROLE_ADMIN,
+        is_confirmed=role in (ROLE_CONFIRMED, ROLE_ADMIN),
+    )
+    rules = bouncer_models.RuleList()
+    define_authorisation(account=principal, they=rules)
+    ability = bouncer_models.Ability(user=None)
+    ability.aliased_actions = bouncer.alias_actions
+    return tuple(
+        CompiledRule(
+            allowed=rule.base_behavior,
+            actions=frozenset(ability.expand_actions(rule.actions)),
+            subjects=tuple(rule.subjects),
+            conditions=tuple((rule.conditions or {}).items()),
+        )
+        for rule in rules
+    )
+
+
+def _matches(
+    rule: CompiledRule, action: str, subject: Any, is_class: bool
+) -> bool:
+    """
+    Match a compiled rule with the same semantics as `bouncer.models.Rule`,
+    except that every subject of the rule is matched against, rather than
+    only the first class.
+    """
+    if flask_bouncer.MANAGE not in rule.actions and action not in rule.actions:
+        return False
+    if flask_bouncer.ALL not in rule.subjects and not any(
+        _matches_subject(
+            rule_subject=rule_subject, subject=subject, is_class=is_class
+        )
+        for rule_subject in rule.subjects
+    ):
+        return False
+    # Conditions are only checked against instances, not classes
+    return is_class or all(
+        getattr(subject, key) == value for key, value in rule.conditions
+    )
+
+
+def _matches_subject(rule_subject: Any, subject: Any, is_class: bool) -> bool:
+    if isinstance(rule_subject, str):
+        name = subject.__name__ if is_class else type(subject).__name__
+        return name == rule_subject
+    if is_class:
+        return issubclass(subject, rule_subject)
+    return isinstance(subject, rule_subject)
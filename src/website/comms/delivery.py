@@ -0,0 +1,125 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+import smtplib
+from typing import Dict, List, NamedTuple, Optional
+
+import flask
+import flask_mail
+import jinja2
+
+from website import mail
+from website.comms import templates
+from website.data.outbox import models
+
+
+class Delivery(NamedTuple):
+    """
+    The outcome of delivering a batch of emails from the outbox.
+    """
+
+    sent: int = 0
+    failed: int = 0
+
+
+def deliver_outbox(batch_size: Optional[int] = None) -> Delivery:
+    """
+    Claim a batch of emails from the outbox, render them, and send them over
+    a single connection. Emails which couldn't be sent are retried after
+    `MAIL_RETRY_DELAY` seconds, doubling after each attempt, until they have
+    been attempted `MAIL_MAX_ATTEMPTS` times.
+
+    Returns:
+        - How many emails were sent, and how many weren't.
+    """
+    config = flask.current_app.config
+    emails = models.OutboxEmail.claim(
+        limit=batch_size or config["MAIL_BATCH_SIZE"],
+        lease=datetime.timedelta(seconds=config["MAIL_LEASE"]),
+    )
+    if not emails:
+        return Delivery()
+
+    errors: Dict[int, Optional[str]] = {}
+    messages = {}
+    for email in emails:
+        try:
+            messages[email.id] = _build_message(email=email)
+        except jinja2.TemplateError as error:
+            errors[email.id] = f"Unable to render email: {error}"
+    if messages:
+        errors.update(
+            zip(messages.keys(), send_batch(messages=list(messages.values())))
+        )
+
+    failed = 0
+    for email in emails:
+        error = errors[email.id]
+        if error is None:
+            email.complete()
+            continue
+        failed += 1
+        email.release(
+            error=error,
+            delay=datetime.timedelta(
+                seconds=config["MAIL_RETRY_DELAY"] * 2 ** (email.attempts - 1)
+            ),
+            max_attempts=config["MAIL_MAX_ATTEMPTS"],
+        )
+    return Delivery(sent=len(emails) - failed, failed=failed)
+
+
+def send_batch(messages: List[flask_mail.Message]) -> List[Optional[str]]:
+    """
+    Send messages over a single SMTP connection.
+
+    Returns:
+        - The error for each message, or `None` if it was sent.
+    """
+    errors: List[Optional[str]] = []
+    try:
+        with mail.connect() as connection:
+            for message in messages:
+                try:
+                    connection.send(message=message)
+                except smtplib.SMTPRecipientsRefused as error:
+                    errors.append(str(error))
+                    continue
+                errors.append(None)
+    except (smtplib.SMTPException, OSError) as error:
+        # The connection failed, so none of the remaining messages were sent
+        errors.extend([str(error)] * (len(messages) - len(errors)))
+    return errors
+
+
+# Private
+
+
+def _build_message(email: models.OutboxEmail) -> flask_mail.Message:
+    text_body, html_body = email.text_body, email.html_body
+    if email.template is not None:
+        text_body, html_body = templates.templates.render(
+            name=email.template, context=email.context
+        )
+    return flask_mail.Message(
+        subject=email.subject,
+        sender=email.sender,
+        recipients=email.recipients,
+        body=text_body,
+        html=html_body,
+    )
@@ -14,35 +14,43 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-import threading
-
 import flask
-import flask_mail
 
-from website import mail
 from website.data.accounts import models
+from website.data.outbox import models as outbox_models
 from website.domain.accounts import utils
 
 
+def init_app(app: flask.Flask):
+    """
+    Check an application has a sender for its emails, so that a view fails
+    to start rather than after it has saved what the email is about.
+
+    Raises:
+        - `ValueError` if neither `MAIL_SENDER` nor `MAIL_DEFAULT_SENDER` is
+          set.
+    """
+    if not (app.config["MAIL_SENDER"] or app.config["MAIL_DEFAULT_SENDER"]):
+        raise ValueError("Set MAIL_SENDER or MAIL_DEFAULT_SENDER.")
+
+
 def send_confirm_account_email(account: models.Account):
     """
     Send a 'confirm email' email to the provided account's email address.
     """
     token = utils.get_confirm_email_token(account=account)
-    context = {"name": "Website", "account": account, "token": token}
-
     _send_email(
         subject="Confirm your email",
         sender=flask.current_app.config["MAIL_SENDER"],
         recipients=[account.email],
-        text_body=flask.render_template(
-            template_name_or_list="emails/confirm_email/confirm_email.txt",
-            **context,
-        ),
-        html_body=flask.render_template(
-            template_name_or_list="emails/confirm_email/confirm_email.html",
-            **context,
-        ),
+        template="confirm_email",
+        context={
+            "name": "Website",
+            "username": account.username,
+            "url": flask.url_for(
+                endpoint="accounts.confirm_email", token=token, _external=True
+            ),
+        },
     )
 
 
@@ -51,20 +59,18 @@ def send_reset_password_email(account: models.Account):
     Send a 'reset password' email to the provided account's email address.
     """
     token = utils.get_reset_password_token(account=account)
-    context = {"name": "Website", "account": account, "token": token}
-
     _send_email(
         subject="Reset your password",
         sender=flask.current_app.config["MAIL_SENDER"],
         recipients=[account.email],
-        text_body=flask.render_template(
-            template_name_or_list="emails/reset_password/reset_password.txt",
-            **context,
-        ),
-        html_body=flask.render_template(
-            template_name_or_list="emails/reset_password/reset_password.html",
-            **context,
-        ),
+        template="reset_password",
+        context={
+            "name": "Website",
+            "username": account.username,
+            "url": flask.url_for(
+                endpoint="accounts.reset_password", token=token, _external=True
+            ),
+        },
     )
 
 
@@ -72,42 +78,29 @@ def send_contact_email(email: str, enquiry: str, body: str):
     """
     Send a contact email to the provided `CONTACT_ADDRESS`.
     """
-    context = {"email": email, "enquiry": enquiry, "body": body}
     _send_email(
         subject=f"Enquiry: {enquiry}",
         sender=flask.current_app.config["MAIL_SENDER"],
         recipients=[flask.current_app.config["CONTACT_ADDRESS"]],
-        text_body=flask.render_template(
-            template_name_or_list="emails/contact_email/contact_email.txt",
-            **context,
-        ),
-        html_body=flask.render_template(
-            template_name_or_list="emails/contact_email/contact_email.html",
-            **context,
-        ),
+        template="contact_email",
+        context={"email": email, "enquiry": enquiry, "body": body},
     )
 
 
 def _send_email(
-    subject: str, sender: str, recipients: list, text_body: str, html_body: str
+    subject: str, sender: str, recipients: list, template: str, context: dict
 ):
     """
-    Send an email asynchronously.
+    Add an email to the outbox, to be rendered and sent by `flask systemjob
+    deliver_outbox`. Links in the email must be built into `context` here,
+    while there's a request to build them from. Without a `sender` the email
+    is sent from `MAIL_DEFAULT_SENDER`, as Flask-Mail would.
     """
-    message = flask_mail.Message(
+    # TODO: Add events
+    outbox_models.OutboxEmail.new(
         subject=subject,
-        sender=sender,
+        sender=sender or flask.current_app.config["MAIL_DEFAULT_SENDER"],
         recipients=recipients,
-        body=text_body,
-        html=html_body,
+        template=template,
+        context=context,
     )
-    threading.Thread(
-        target=_send_async_email,
-        args=(flask.current_app._get_current_object(), message),
-    ).start()
-
-
-def _send_async_email(app, message):
-    with app.app_context():
-        # TODO: Add events
-        mail.send(message=message)
@@ -0,0 +1,92 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from typing import Dict, NamedTuple
+
+import flask
+import jinja2
+
+# Email templates live in `emails/<name>/<name>.{txt,html}`
+TEMPLATE_DIRECTORY = "emails"
+
+
+class RenderedEmail(NamedTuple):
+    text: str
+    html: str
+
+
+class EmailTemplates:
+    """
+    Renders email templates outside of Flask's template environment, so that
+    no context processors run and no request is needed. This lets the outbox
+    worker render emails instead of the request which queued them.
+
+    The templates are compiled once, when the application is created.
+    """
+
+    def init_app(self, app: flask.Flask):
+        environment = jinja2.Environment(
+            loader=app.jinja_loader,
+            autoescape=jinja2.select_autoescape(
+                enabled_extensions=("html",), default_for_string=False
+            ),
+            # Fail loudly rather than send an email with blanks in it
+            undefined=jinja2.StrictUndefined,
+            auto_reload=False,
+        )
+        app.extensions["email_templates"] = {
+            name: environment.get_template(name=name)
+            for name in environment.list_templates(
+                filter_func=lambda name: name.startswith(
+                    f"{TEMPLATE_DIRECTORY}/"
+                )
+            )
+        }
+
+    def render(self, name: str, context: dict) -> RenderedEmail:
+        """
+        Render the text and HTML bodies of an email.
+
+        Params:
+            `name` - Name of the email, such as 'confirm_email'.
+        Raises:
+            - `jinja2.TemplateError` if a template is missing or fails to
+              render.
+        Returns:
+            - The rendered bodies.
+        """
+        return RenderedEmail(
+            text=self._get_template(name=f"{name}/{name}.txt").render(context),
+            html=self._get_template(name=f"{name}/{name}.html").render(
+                context
+            ),
+        )
+
+    # Private
+
+    def _get_template(self, name: str) -> jinja2.Template:
+        templates: Dict[str, jinja2.Template] = flask.current_app.extensions[
+            "email_templates"
+        ]
+        path = f"{TEMPLATE_DIRECTORY}/{name}"
+        try:
+            return templates[path]
+        except KeyError:
+            raise jinja2.TemplateNotFound(name=path)
+
+
+templates = EmailTemplates()
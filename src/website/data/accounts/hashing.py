@@ -0,0 +1,133 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from typing import Any, Callable, Optional
+
+import flask
+
+
+class PoolFull(Exception):
+    """
+    Exception for when too many passwords are already being hashed.
+    """
+
+    pass
+
+
+class HashingPool:
+    """
+    Runs password hashing in a pool of worker processes, so that CPU-bound
+    hashing doesn't hold up the threads serving requests.
+
+    At most `PASSWORD_HASH_QUEUE` hashes may be running or waiting at once in
+    each web process, beyond which `PoolFull` is raised straight away rather
+    than queueing behind them. With `PASSWORD_HASH_WORKERS` set to `0`, hashes
+    are run inline but are still bounded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._workers: int = 0
+        self._semaphore: Optional[threading.BoundedSemaphore] = None
+        self._queue: int = 0
+
+    def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call `func` in the pool and wait for its result.
+
+        Raises:
+            - `PoolFull` if the queue is full, or the result takes longer than
+                `PASSWORD_HASH_TIMEOUT` seconds.
+        Returns:
+            - The result of `func`.
+        """
+        config = flask.current_app.config
+        executor, semaphore = self._get_pool(
+            workers=config["PASSWORD_HASH_WORKERS"],
+            queue=config["PASSWORD_HASH_QUEUE"],
+        )
+        if not semaphore.acquire(blocking=False):
+            raise PoolFull("Too many passwords are being hashed.")
+        if executor is None:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                semaphore.release()
+
+        try:
+            future = executor.submit(func, *args, **kwargs)
+        except Exception:
+            semaphore.release()
+            raise
+        # The slot is only freed once the work is done, even if we give up
+        # waiting for it, so the queue can never grow past its bound
+        future.add_done_callback(lambda _: semaphore.release())
+        try:
+            return future.result(timeout=config["PASSWORD_HASH_TIMEOUT"])
+        except concurrent.futures.TimeoutError:
+            raise PoolFull("Timed out waiting for a password hash.")
+
+    def shutdown(self):
+        """
+        Stop the worker processes, if any are running.
+        """
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            self._pid = None
+
+    # Private
+
+    def _get_pool(self, workers: int, queue: int):
+        """
+        Return the executor and semaphore for the current process, creating
+        them when first used, after forking, or when their settings change.
+        """
+        with self._lock:
+            if (
+                self._pid != os.getpid()
+                or self._workers != workers
+                or self._queue != queue
+            ):
+                if self._executor is not None and self._pid == os.getpid():
+                    self._executor.shutdown(wait=True)
+                # Workers are spawned rather than forked, so they don't inherit
+                # locks held by other threads of the web process
+                self._executor = (
+                    concurrent.futures.ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    if workers > 0
+                    else None
+                )
+                self._semaphore = threading.BoundedSemaphore(value=queue)
+                self._pid = os.getpid()
+                self._workers = workers
+                self._queue = queue
+            return self._executor, self._semaphore
+
+
+# The pool used by Accounts to hash and check passwords
+pool = HashingPool()
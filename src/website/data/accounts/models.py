@@ -14,12 +14,25 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import datetime
+from typing import Optional
+
 import flask
 import flask_login
-from sqlalchemy import sql
+import pytz
+import sqlalchemy
+from sqlalchemy import orm, sql
 from werkzeug import security
 
 from website import db, login
+from website.data.accounts import hashing
+from website.data.common import cache
+
+# Maximum number of Accounts held by the user loader's cache
+ACCOUNT_CACHE_SIZE: int = 1024
+
+# Snapshots of the columns of recently loaded Accounts, keyed by id
+_account_cache = cache.LRUCache(max_size=ACCOUNT_CACHE_SIZE)
 
 
 class Account(db.Model, flask_login.UserMixin):  # type: ignore
@@ -60,7 +73,28 @@ class Account(db.Model, flask_login.UserMixin):  # type: ignore
 
     @login.user_loader
     def load_account(account_id):
-        return Account.query.get(ident=int(account_id))
+        """
+        Load the Account of the logged in user. The Account's columns are
+        cached for `ACCOUNT_CACHE_TTL` seconds, and while cached the Account
+        is added to the session without being queried.
+
+        The cache is per process, and only invalidated in the process which
+        changed the Account, so admins are always queried. Revoking their
+        rights then takes effect at once in every process.
+        """
+        account_id = int(account_id)
+        values = _account_cache.get(account_id)
+        if values is None:
+            account = Account.query.get(ident=account_id)
+            ttl = flask.current_app.config["ACCOUNT_CACHE_TTL"]
+            if account is not None and not account.admin and ttl > 0:
+                _account_cache.set(
+                    account_id, _get_snapshot(account=account), ttl=ttl
+                )
+            return account
+        account = Account(**values)
+        orm.make_transient_to_detached(account)
+        return db.session.merge(account, load=False)
 
     @classmethod
     def new(
@@ -120,30 +154,92 @@ class Account(db.Model, flask_login.UserMixin):  # type: ignore
             setattr(self, key, value)
         db.session.commit()
 
-    def delete(self, delete_blogs: bool = False):
+    def mark_seen(
+        self, seen_at: datetime.datetime, interval: datetime.timedelta
+    ) -> bool:
         """
-        Delete Account.
+        Set when the Account was last seen, but only when the stored value is
+        older than `interval`, so an Account seen on every request is only
+        written to occasionally. A Core UPDATE is used, so `updated_at` isn't
+        changed.
 
-        Params:
-            - `delete_blogs` whether the blogs associated to the Account should
-                be deleted. If set to `False`, the blogs will instead be
-                transferred to the default Account.
+        Returns whether the Account was written to.
+        """
+        stale_at = seen_at - interval
+        if self.seen_at is not None:
+            last_seen_at = self.seen_at
+            if last_seen_at.tzinfo is None:
+                # SQLite doesn't store the timezone, which is always UTC
+                last_seen_at = last_seen_at.replace(tzinfo=pytz.utc)
+            if last_seen_at > stale_at:
+                return False
+
+        table = type(self).__table__
+        result = db.session.execute(
+            table.update()
+            .where(
+                sql.and_(
+                    table.c.id == self.id,
+                    sql.or_(
+                        table.c.seen_at.is_(None), table.c.seen_at <= stale_at
+                    ),
+                )
+            )
+            .values(seen_at=seen_at, updated_at=table.c.updated_at)
+        )
+        db.session.commit()
+        _account_cache.delete(self.id)
+        return result.rowcount > 0
+
+    def delete(self):
+        """
+        Delete Account. Its blogs should have been deleted or given up first,
+        see `operations.delete_account`.
         """
-        # TODO: Make this an atomic transaction - i.e. all-or-nothing.
-        for blog in self.blogs:
-            if delete_blogs:
-                blog.delete()
-            else:
-                blog.update(author=None)
         db.session.delete(self)
         db.session.commit()
 
+    def rehash_password(self, password: str):
+        """
+        Hash the password again with the configured hashing parameters. The
+        password itself is unchanged, so a Core UPDATE is used to leave
+        `updated_at` and `seen_at` alone.
+        """
+        table = type(self).__table__
+        db.session.execute(
+            table.update()
+            .where(table.c.id == self.id)
+            .values(
+                password=Account._hash_password(password=password),
+                updated_at=table.c.updated_at,
+                seen_at=table.c.seen_at,
+            )
+        )
+        db.session.commit()
+        _account_cache.delete(self.id)
+
     def check_password(self, password: str) -> bool:
         """
-        Check the password against saved hashed password.
+        Check the password against saved hashed password, in the hashing pool.
+
+        Raises:
+            - `PoolFull` if the hashing pool is full.
+        """
+        return hashing.pool.run(
+            security.check_password_hash,
+            pwhash=self.password,
+            password=password,
+        )
+
+    def needs_rehash(self) -> bool:
+        """
+        Check whether the password was hashed with other parameters than the
+        configured ones.
         """
-        return security.check_password_hash(
-            pwhash=self.password, password=password
+        method, _, rest = self.password.partition("$")
+        salt, _, _ = rest.partition("$")
+        return method != get_hash_method() or len(salt) != (
+            flask.current_app.config["PASSWORD_SALT_LENGTH"]
         )
 
     # Properties
@@ -165,6 +261,61 @@ class Account(db.Model, flask_login.UserMixin):  # type: ignore
     @classmethod
     def _hash_password(cls, password: str) -> str:
         """
-        Return hashed password.
+        Return hashed password, hashed in the hashing pool.
+
+        Raises:
+            - `PoolFull` if the hashing pool is full.
         """
-        return security.generate_password_hash(password=password)
+        return hashing.pool.run(
+            security.generate_password_hash,
+            password=password,
+            method=get_hash_method(),
+            salt_length=flask.current_app.config["PASSWORD_SALT_LENGTH"],
+        )
+
+
+def get_hash_method(
+    method: Optional[str] = None, iterations: Optional[int] = None
+) -> str:
+    """
+    Return the werkzeug hash method for the given, or configured, method and
+    number of iterations. Iterations only apply to PBKDF2 methods.
+    """
+    config = flask.current_app.config
+    if method is None:
+        method = config["PASSWORD_HASH_METHOD"]
+    if iterations is None:
+        iterations = config["PASSWORD_HASH_ITERATIONS"]
+    if method.startswith("pbkdf2:") and method.count(":") == 1:
+        return f"{method}:{iterations}"
+    return method
+
+
+def clear_account_cache():
+    """
+    Remove every Account from the user loader's cache.
+    """
+    _account_cache.clear()
+
+
+# Private
+
+
+def _get_snapshot(account: Account) -> dict:
+    """
+    Return the values of an Account's columns.
+    """
+    return {
+        attribute.key: getattr(account, attribute.key)
+        for attribute in orm.class_mapper(Account).column_attrs
+    }
+
+
+@sqlalchemy.event.listens_for(Account, "after_update")
+@sqlalchemy.event.listens_for(Account, "after_delete")
+def _invalidate_cached_account(mapper, connection, target):
+    """
+    Remove an Account from the user loader's cache once it is changed, which
+    covers `Account.update` and `Account.delete` as well as the admin views.
+    """
+    _account_cache.delete(target.id)
@@ -18,6 +18,7 @@
 
 from typing import Any, List, Optional
 
+import sqlalchemy
 from sqlalchemy import sql
 
 from website import db
@@ -25,6 +26,10 @@ from website import db
 
 class Blog(db.Model):  # type: ignore
     __tablename__ = "blogs"
+    __table_args__ = (
+        # Supports keyset pagination of blogs, newest first
+        db.Index("ix_blogs_created_at_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer(), primary_key=True)
     title = db.Column(db.String(100), index=True, nullable=False)
@@ -34,6 +39,10 @@ class Blog(db.Model):  # type: ignore
 
     published = db.Column(db.Boolean(), nullable=False, default=False)
     comment = db.Column(db.Boolean(), nullable=False, default=False)
+    # Maintained by `Comment.new` and `Comment.delete`
+    comment_count = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
 
     created_at = db.Column(
         db.DateTime(timezone=True),
@@ -50,6 +59,13 @@ class Blog(db.Model):  # type: ignore
     comments = db.relationship(
         "Comment", cascade="all, delete", backref="blog", lazy=True
     )
+    archive_entry = db.relationship(
+        "ArchiveEntry",
+        cascade="all, delete-orphan",
+        backref="blog",
+        lazy=True,
+        uselist=False,
+    )
 
     def __repr__(self):
         return f"<Blog {self.title}>"
@@ -73,9 +89,12 @@ class Blog(db.Model):  # type: ignore
         categories: Optional[List[Any]] = None,
         published: bool = False,
         comment: bool = False,
+        commit: bool = True,
     ):
         """
-        Create a new Blog in the database.
+        Create a new Blog in the database. When `commit` is false the Blog is
+        only flushed, so that the caller can write related rows in the same
+        transaction.
 
         Returns a Blog.
         """
@@ -93,15 +112,18 @@ class Blog(db.Model):  # type: ignore
             blog.categories = categories
 
         db.session.add(blog)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
 
         return blog
 
     # Mutators
 
-    def update(self, **kwargs):
+    def update(self, commit: bool = True, **kwargs):
         """
-        Update Blog.
+        Update Blog. When `commit` is false the changes are only flushed.
         """
         allowed_attributes = [
             "title",
@@ -115,7 +137,10 @@ class Blog(db.Model):  # type: ignore
         for key, value in kwargs.items():
             assert key in allowed_attributes
             setattr(self, key, value)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
 
     def delete(self):
         """
@@ -129,3 +154,113 @@ class Blog(db.Model):  # type: ignore
     @property
     def is_published(self) -> bool:
         return self.published
+
+
+class ArchiveEntry(db.Model):  # type: ignore
+    """
+    Materialised archive entry for a published Blog, so that the archive can
+    be listed without touching the blogs table.
+    """
+
+    __tablename__ = "blog_archive"
+    __table_args__ = (
+        db.Index(
+            "ix_blog_archive_year_month_created_at",
+            "year",
+            "month",
+            "created_at",
+        ),
+    )
+
+    blog_id = db.Column(
+        db.Integer(),
+        db.ForeignKey("blogs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    year = db.Column(db.Integer(), nullable=False)
+    month = db.Column(db.Integer(), nullable=False)
+    slug = db.Column(db.String(200), nullable=False)
+    title = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ArchiveEntry {self.year}-{self.month} {self.title}>"
+
+    # Mutators
+
+    @classmethod
+    def sync(cls, blog: Blog):
+        """
+        Add, update or remove the archive entry of a Blog, so that only
+        published blogs are archived. The caller commits the change, along
+        with the change to the Blog.
+        """
+        if not blog.published:
+            blog.archive_entry = None
+        else:
+            if not blog.archive_entry:
+                blog.archive_entry = cls()
+            blog.archive_entry.year = blog.created_at.year
+            blog.archive_entry.month = blog.created_at.month
+            blog.archive_entry.slug = blog.slug
+            blog.archive_entry.title = blog.title
+            blog.archive_entry.created_at = blog.created_at
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Replace every archive entry with entries for the published blogs.
+        """
+        blogs = db.session.query(
+            Blog.id,
+            sql.cast(sql.extract("year", Blog.created_at), db.Integer),
+            sql.cast(sql.extract("month", Blog.created_at), db.Integer),
+            Blog.slug,
+            Blog.title,
+            Blog.created_at,
+        ).filter(Blog.published.is_(True))
+
+        db.session.query(cls).delete()
+        db.session.execute(
+            cls.__table__.insert().from_select(
+                ["blog_id", "year", "month", "slug", "title", "created_at"],
+                blogs.statement,
+            )
+        )
+        db.session.commit()
+
+
+# The full-text search index over blogs, maintained by `domain.blogs.search`.
+# SQLite uses an FTS5 virtual table, and PostgreSQL a weighted tsvector with a
+# GIN index. Neither can be described by a model, so they're created here.
+SEARCH_TABLE = "blog_search"
+SEARCH_TABLE_DDL = {
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING "
+        "fts5(title, description, body, tokenize = 'porter unicode61')",
+    ],
+    "postgresql": [
+        f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+        "blog_id INTEGER PRIMARY KEY REFERENCES blogs (id) ON DELETE CASCADE, "
+        "document TSVECTOR NOT NULL)",
+        f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+        f"ON {SEARCH_TABLE} USING GIN (document)",
+    ],
+}
+
+for dialect, statements in SEARCH_TABLE_DDL.items():
+    for statement in statements:
+        sqlalchemy.event.listen(
+            db.metadata,
+            "after_create",
+            sqlalchemy.DDL(statement).execute_if(dialect=dialect),
+        )
+sqlalchemy.event.listen(
+    db.metadata,
+    "before_drop",
+    sqlalchemy.DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}").execute_if(
+        callable_=lambda ddl, target, bind, **kwargs: (
+            bind.dialect.name in SEARCH_TABLE_DDL
+        )
+    ),
+)
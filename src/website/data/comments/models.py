@@ -17,11 +17,13 @@
 import datetime
 from typing import Any, Optional
 
+import flask
 from sqlalchemy import sql
 
 from website import db
+from website.data.blogs import models as blog_models
 
-NUMBER_OF_DIGITS: int = 6
+PATH_SEPARATOR: str = "."
 
 
 class Comment(db.Model):  # type: ignore
@@ -30,6 +32,10 @@ class Comment(db.Model):  # type: ignore
     id = db.Column(db.Integer(), primary_key=True)
     body = db.Column(db.String(200), nullable=False)
     path = db.Column(db.Text(), index=True)
+    # The number of direct replies, maintained by `new` and `delete`
+    reply_count = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
 
     created_at = db.Column(
         db.DateTime(timezone=True),
@@ -73,7 +79,13 @@ class Comment(db.Model):  # type: ignore
         parent: Optional[Any] = None,
         thread_at: Optional[datetime.datetime] = None,
     ):
-        # TODO: Make this a transaction
+        """
+        Create a Comment and its materialised path in a single transaction.
+
+        The row is flushed to get its id, and the path is set before the
+        transaction is committed, so a Comment without a path is never
+        visible to other connections.
+        """
         comment = cls(
             body=body,
             author=author,
@@ -81,12 +93,35 @@ class Comment(db.Model):  # type: ignore
             parent=parent,
             thread_at=thread_at,
         )
-        db.session.add(comment)
-        db.session.commit()
-        comment.updated_at = None
-        prefix = f"{comment.parent.path}." if comment.parent else ""
-        comment.path = prefix + "{:0{}d}".format(comment.id, NUMBER_OF_DIGITS)
-        db.session.commit()
+        if parent is not None and thread_at is None:
+            # Copy the parent's stored value, so that it compares equal to
+            # the parent's on every backend (SQLite stores it as text)
+            comment.thread_at = (
+                db.session.query(cls.thread_at)
+                .filter(cls.id == parent.id)
+                .as_scalar()
+            )
+        try:
+            db.session.add(comment)
+            db.session.flush()
+            prefix = (
+                f"{comment.parent.path}{PATH_SEPARATOR}"
+                if comment.parent
+                else ""
+            )
+            comment.path = prefix + format_path_segment(id=comment.id)
+            # Setting the path isn't an update of the Comment
+            comment.updated_at = None
+            _update_counts(
+                blog_id=comment.blog_id,
+                parent_id=comment.parent_id,
+                comments=1,
+                replies=1,
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         return comment
 
     # Mutators
@@ -106,13 +141,146 @@ class Comment(db.Model):  # type: ignore
 
     def delete(self):
         """
-        Delete Comment.
+        Delete Comment and every reply beneath it, updating the counts of its
+        Blog and parent in the same transaction. The parent's reply count is
+        only decremented if the Comment itself was deleted.
+        """
+        cls = type(self)
+        blog_id, parent_id, path = self.blog_id, self.parent_id, self.path
+        try:
+            # Replies go first, as they reference the Comment. Those within
+            # the subtree are deleted together, by a single statement.
+            replies = 0
+            # Legacy comments without a path can't have their replies found
+            if path is not None:
+                replies = cls.query.filter(
+                    cls.blog_id == blog_id,
+                    cls.path.like(f"{path}{PATH_SEPARATOR}%"),
+                ).delete(synchronize_session="fetch")
+            deleted = cls.query.filter(cls.id == self.id).delete(
+                synchronize_session="fetch"
+            )
+            _update_counts(
+                blog_id=blog_id,
+                parent_id=parent_id,
+                comments=-(deleted + replies),
+                replies=-deleted,
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def recount(cls):
+        """
+        Recompute the comment count of every Blog and the reply count of
+        every Comment.
         """
-        db.session.delete(self)
+        blogs = blog_models.Blog.__table__
+        comments = cls.__table__
+        replies = comments.alias("replies")
+        db.session.execute(
+            blogs.update().values(
+                comment_count=sql.select([sql.func.count()])
+                .where(comments.c.blog_id == blogs.c.id)
+                .as_scalar(),
+                updated_at=blogs.c.updated_at,
+            )
+        )
+        db.session.execute(
+            comments.update().values(
+                reply_count=sql.select([sql.func.count()])
+                .where(replies.c.parent_id == comments.c.id)
+                .as_scalar(),
+                updated_at=comments.c.updated_at,
+            )
+        )
         db.session.commit()
 
     # Properties
 
     @property
     def level(self):
-        return len(self.path) // NUMBER_OF_DIGITS - 1
+        return get_level(path=self.path)
+
+
+def get_path_digits() -> int:
+    """
+    Return the width each id is zero-padded to within a Comment's path.
+    """
+    return flask.current_app.config["COMMENT_PATH_DIGITS"]
+
+
+def format_path_segment(id: int, digits: Optional[int] = None) -> str:
+    """
+    Return the path segment of a Comment with the given id.
+
+    Params:
+        `digits` - Width to pad the id to, defaults to `get_path_digits`.
+    """
+    if digits is None:
+        digits = get_path_digits()
+    return "{:0{}d}".format(id, digits)
+
+
+def widen_path(path: str, digits: int) -> str:
+    """
+    Return the path with every segment re-padded to `digits` wide. Segments
+    that are already wider are left as they are.
+    """
+    return PATH_SEPARATOR.join(
+        format_path_segment(id=int(segment), digits=digits)
+        for segment in path.split(PATH_SEPARATOR)
+    )
+
+
+def get_root_path(path: str, level: int) -> str:
+    """
+    Return the path of the ancestor at the given level of a Comment's path.
+    """
+    return PATH_SEPARATOR.join(path.split(PATH_SEPARATOR)[: level + 1])
+
+
+def get_level(path: Optional[str]) -> int:
+    """
+    Return the depth of a Comment from its path, where top-level comments
+    have a level of `0`. Legacy comments without a path are given a level of
+    `0` too.
+    """
+    if path is None:
+        return 0
+    return path.count(PATH_SEPARATOR)
+
+
+# Private
+
+
+def _update_counts(
+    blog_id: int, parent_id: Optional[int], comments: int, replies: int
+):
+    """
+    Add to the comment count of a Blog, and the reply count of the parent
+    Comment, within the current transaction. The counts are added to in SQL,
+    so that concurrent transactions don't overwrite each other's changes, and
+    without touching `updated_at`.
+    """
+    blogs = blog_models.Blog.__table__
+    db.session.execute(
+        blogs.update()
+        .where(blogs.c.id == blog_id)
+        .values(
+            comment_count=blogs.c.comment_count + comments,
+            updated_at=blogs.c.updated_at,
+        )
+    )
+    if parent_id is not None:
+        table = Comment.__table__
+        db.session.execute(
+            table.update()
+            .where(table.c.id == parent_id)
+            .values(
+                reply_count=table.c.reply_count + replies,
+                updated_at=table.c.updated_at,
+            )
+        )
@@ -0,0 +1,82 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import collections
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    A thread-safe, in-process cache holding at most `max_size` items, each of
+    which expires after its own time to live. Once the cache is full, the
+    least recently used item is evicted first.
+    """
+
+    def __init__(
+        self, max_size: int, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max_size
+        self._clock = clock
+        self._items: "collections.OrderedDict[Hashable, tuple]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the item stored under `key`, or `None` if it is missing or has
+        expired.
+        """
+        with self._lock:
+            try:
+                expires_at, value = self._items[key]
+            except KeyError:
+                return None
+            if expires_at <= self._clock():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """
+        Store an item under `key` for `ttl` seconds.
+        """
+        with self._lock:
+            self._items[key] = (self._clock() + ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """
+        Remove the item stored under `key`, if there is one.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every item.
+        """
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,46 @@
+"""Add blog search index
+
+Revision ID: 5d7b3e9c1f20
+Revises: 8c2e4f1a9d37
+Create Date: 2020-09-20 16:41:09.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7b3e9c1f20'
+down_revision = '8c2e4f1a9d37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The index can't be described by a model, so is created by hand. Blogs
+    # are indexed by running `flask systemjob rebuild_search_index`, as only
+    # their text (not their markup) is indexed.
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE blog_search USING "
+            "fts5(title, description, body, tokenize = 'porter unicode61')"
+        )
+    elif dialect == 'postgresql':
+        op.create_table('blog_search',
+        sa.Column('blog_id', sa.Integer(), nullable=False),
+        sa.Column('document', postgresql.TSVECTOR(), nullable=False),
+        sa.ForeignKeyConstraint(['blog_id'], ['blogs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('blog_id')
+        )
+        op.create_index('ix_blog_search_document', 'blog_search', ['document'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TABLE blog_search')
+    elif dialect == 'postgresql':
+        op.drop_index('ix_blog_search_document', table_name='blog_search')
+        op.drop_table('blog_search')
@@ -0,0 +1,215 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+import uuid
+from typing import List, Optional
+
+import pytz
+from sqlalchemy import sql
+
+from website import db
+
+
+class OutboxEmail(db.Model):  # type: ignore
+    """
+    An email waiting to be sent by `flask systemjob deliver_outbox`.
+
+    Workers claim emails by setting `claimed_by` and `lease_expires_at`, so
+    several can run at once. An email whose lease expires, because its worker
+    died, can be claimed again.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # Supports claiming the emails which are due to be sent
+        db.Index(
+            "ix_outbox_failed_at_available_at", "failed_at", "available_at"
+        ),
+    )
+
+    id = db.Column(db.Integer(), primary_key=True)
+    subject = db.Column(db.String(200), nullable=False)
+    sender = db.Column(db.String(255), nullable=False)
+    recipients = db.Column(db.JSON(), nullable=False)
+    # Rendered by the worker, see `comms.templates`
+    template = db.Column(db.String(100))
+    context = db.Column(db.JSON())
+    # Emails queued before templates were rendered by the worker
+    text_body = db.Column(db.Text())
+    html_body = db.Column(db.Text())
+
+    attempts = db.Column(
+        db.Integer(), nullable=False, default=0, server_default="0"
+    )
+    last_error = db.Column(db.Text())
+    available_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    claimed_by = db.Column(db.String(32))
+    lease_expires_at = db.Column(db.DateTime(timezone=True))
+    # Set once the email has run out of attempts
+    failed_at = db.Column(db.DateTime(timezone=True))
+
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        server_default=sql.func.current_timestamp(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<OutboxEmail {self.id}>"
+
+    @classmethod
+    def new(
+        cls,
+        subject: str,
+        sender: str,
+        recipients: List[str],
+        template: str,
+        context: dict,
+    ):
+        """
+        Create a new OutboxEmail in the database, ready to be sent.
+
+        Returns an OutboxEmail.
+        """
+        email = cls(
+            subject=subject,
+            sender=sender,
+            recipients=recipients,
+            template=template,
+            context=context,
+            available_at=_now(),
+        )
+
+        db.session.add(email)
+        db.session.commit()
+
+        return email
+
+    @classmethod
+    def claim(
+        cls,
+        limit: int,
+        lease: datetime.timedelta,
+        now: Optional[datetime.datetime] = None,
+    ) -> List["OutboxEmail"]:
+        """
+        Claim up to `limit` emails which are due to be sent, for `lease`.
+
+        The claim is a single UPDATE which repeats its conditions outside of
+        the subquery, so a concurrent worker that claimed a row first causes
+        it to be skipped rather than claimed twice.
+
+        The emails are detached from the session, so that completing one
+        doesn't expire the others.
+
+        Returns:
+            - The claimed emails, oldest first.
+        """
+        now = now or _now()
+        token = uuid.uuid4().hex
+        table = cls.__table__
+        claimable = sql.and_(
+            table.c.failed_at.is_(None),
+            table.c.available_at <= now,
+            sql.or_(
+                table.c.lease_expires_at.is_(None),
+                table.c.lease_expires_at <= now,
+            ),
+        )
+        due = (
+            sql.select([table.c.id])
+            .where(claimable)
+            .order_by(table.c.available_at, table.c.id)
+            .limit(limit)
+        )
+        db.session.execute(
+            table.update()
+            .where(sql.and_(table.c.id.in_(due), claimable))
+            .values(
+                claimed_by=token,
+                lease_expires_at=now + lease,
+                attempts=table.c.attempts + 1,
+            )
+        )
+        db.session.commit()
+        emails = cls.query.filter_by(claimed_by=token).order_by(cls.id).all()
+        for email in emails:
+            db.session.expunge(email)
+        return emails
+
+    # Mutators
+
+    def complete(self) -> bool:
+        """
+        Remove a claimed OutboxEmail once it has been sent.
+
+        Returns:
+            - Whether the claim was still held.
+        """
+        table = self.__table__
+        result = db.session.execute(
+            table.delete().where(
+                sql.and_(
+                    table.c.id == self.id,
+                    table.c.claimed_by == self.claimed_by,
+                )
+            )
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def release(
+        self, error: str, delay: datetime.timedelta, max_attempts: int
+    ) -> bool:
+        """
+        Release a claimed OutboxEmail which could not be sent, to be retried
+        after `delay`. Once `max_attempts` is reached it is marked as failed.
+
+        Returns:
+            - Whether the claim was still held.
+        """
+        now = _now()
+        values = {
+            "claimed_by": None,
+            "lease_expires_at": None,
+            "last_error": error,
+        }
+        if self.attempts >= max_attempts:
+            values["failed_at"] = now
+        else:
+            values["available_at"] = now + delay
+        table = self.__table__
+        result = db.session.execute(
+            table.update()
+            .where(
+                sql.and_(
+                    table.c.id == self.id,
+                    table.c.claimed_by == self.claimed_by,
+                )
+            )
+            .values(**values)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+
+# Private
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(tz=pytz.utc)
@@ -0,0 +1,114 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+from sqlalchemy import exc, sql
+
+from website import db
+
+
+class RateLimitBucket(db.Model):  # type: ignore
+    """
+    A token bucket stored for `ratelimit.DatabaseBackend`, so that every
+    worker process shares it.
+
+    Times are seconds since the epoch, rather than datetimes, so that buckets
+    can be refilled with the same arithmetic on every database.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+
+    key = db.Column(db.String(512), primary_key=True)
+    tokens = db.Column(db.Float(), nullable=False)
+    updated_at = db.Column(db.Float(), nullable=False)
+    # When the bucket will have refilled, after which it can be removed
+    expires_at = db.Column(db.Float(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RateLimitBucket {self.key}>"
+
+    @classmethod
+    def consume(
+        cls, key: str, capacity: int, rate: float, now: float
+    ) -> float:
+        """
+        Take a token from the bucket stored under `key`, which holds up to
+        `capacity` tokens and refills at `rate` tokens a second.
+
+        The token is taken by a single UPDATE, which only matches the bucket
+        while it has a token left, so concurrent requests can't take the same
+        one. A missing bucket is full, and is inserted with a token taken.
+
+        Returns:
+            - `0` if a token was taken, otherwise how many seconds until the
+              bucket has one.
+        """
+        table = cls.__table__
+        refilled = table.c.tokens + (now - table.c.updated_at) * rate
+        tokens = sql.case([(refilled > capacity, capacity)], else_=refilled)
+        try:
+            result = db.session.execute(
+                table.update()
+                .where(sql.and_(table.c.key == key, tokens >= 1))
+                .values(
+                    tokens=tokens - 1,
+                    updated_at=now,
+                    expires_at=now + (capacity - tokens + 1) / rate,
+                )
+            )
+            if result.rowcount == 1:
+                db.session.commit()
+                return 0
+
+            bucket = db.session.execute(
+                sql.select([table.c.tokens, table.c.updated_at]).where(
+                    table.c.key == key
+                )
+            ).first()
+            if bucket is not None:
+                db.session.commit()
+                available = min(
+                    capacity, bucket.tokens + (now - bucket.updated_at) * rate
+                )
+                return max(0.0, (1 - available) / rate)
+
+            # Buckets are only removed once full, which is the same as missing
+            db.session.execute(table.delete().where(table.c.expires_at <= now))
+            db.session.execute(
+                table.insert().values(
+                    key=key,
+                    tokens=capacity - 1,
+                    updated_at=now,
+                    expires_at=now + 1 / rate,
+                )
+            )
+            db.session.commit()
+            return 0
+        except exc.IntegrityError:
+            # Another request inserted the bucket first, so take from theirs
+            db.session.rollback()
+            return cls.consume(key=key, capacity=capacity, rate=rate, now=now)
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def clear(cls):
+        """
+        Remove every RateLimitBucket.
+        """
+        db.session.execute(cls.__table__.delete())
+        db.session.commit()
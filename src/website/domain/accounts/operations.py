@@ -14,9 +14,15 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import datetime
+
+import flask
+import pytz
+
 from website.comms import dispatch
-from website.data.accounts import models
+from website.data.accounts import hashing, models
 from website.domain import exceptions
+from website.domain.blogs import operations as blog_operations
 
 
 def create_account(
@@ -27,6 +33,7 @@ def create_account(
 
     Raises:
         - `UnableToCreate` if Account cannot be created.
+        - `TooBusy` if the password cannot be hashed right now.
     Returns:
         - A new Account.
     """
@@ -34,6 +41,8 @@ def create_account(
         account = models.Account.new(
             username=username, display=display, email=email, password=password
         )
+    except hashing.PoolFull:
+        raise exceptions.TooBusy("Unable to create account right now.")
     except Exception:
         raise exceptions.UnableToCreate("Unable to create account.")
 
@@ -51,9 +60,12 @@ def update_account(account: models.Account, **kwargs):
 
     Raises:
         - `UnableToUpdate` if account cannot be updated.
+        - `TooBusy` if the password cannot be hashed right now.
     """
     try:
         account.update(**kwargs)
+    except hashing.PoolFull:
+        raise exceptions.TooBusy("Unable to update account right now.")
     except Exception:
         raise exceptions.UnableToUpdate("Unable to update account.")
 
@@ -62,15 +74,47 @@ def update_account(account: models.Account, **kwargs):
     # TODO: Publish an event
 
 
+def mark_account_seen(account: models.Account) -> bool:
+    """
+    Record that an Account has been seen. The Account is written to at most
+    once every `ACCOUNT_SEEN_INTERVAL` seconds.
+
+    Returns:
+        - Whether the Account was written to.
+    """
+    interval = datetime.timedelta(
+        seconds=flask.current_app.config["ACCOUNT_SEEN_INTERVAL"]
+    )
+    try:
+        return account.mark_seen(
+            seen_at=datetime.datetime.now(tz=pytz.utc), interval=interval
+        )
+    except Exception:
+        raise exceptions.UnableToUpdate("Unable to update account.")
+
+
 def delete_account(account: models.Account, delete_blogs: bool = False):
     """
     Delete an Account from the database.
 
+    Params:
+        - `delete_blogs` whether the blogs associated to the Account should
+            be deleted. If set to `False`, the blogs will instead be left
+            without an author.
+
     Raises:
         - `UnableToDelete` if account cannot be deleted.
     """
+    # TODO: Make this an atomic transaction - i.e. all-or-nothing.
     try:
-        account.delete(delete_blogs=delete_blogs)
+        # Go through the blog operations, so that the archive, search index
+        # and feeds follow
+        for blog in list(account.blogs):
+            if delete_blogs:
+                blog_operations.delete_blog(blog=blog)
+            else:
+                blog_operations.update_blog(blog=blog, author=None)
+        account.delete()
     except Exception:
         raise exceptions.UnableToDelete("Unable to delete account.")
 
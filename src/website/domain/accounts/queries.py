@@ -16,7 +16,7 @@
 
 from typing import List, Optional
 
-from website.data.accounts import models
+from website.data.accounts import hashing, models
 from website.domain import exceptions
 
 
@@ -82,12 +82,14 @@ def get_accounts(
 def check_login(email: str, password: str) -> models.Account:
     """
     Determine whether the email and password are correct for an Account, and if
-    the Account is confirmed.
+    the Account is confirmed. Passwords hashed with outdated parameters are
+    rehashed.
 
     Raises:
         - `DoesNotExist` if the Account does not exist.
         - `InvalidPassword` if the Account's password is incorrect.
         - `EmailNotConfirmed` if the Account is not confirmed.
+        - `TooBusy` if the password cannot be checked right now.
     Returns:
         - The Account associated to the provided `email`.
     """
@@ -97,8 +99,19 @@ def check_login(email: str, password: str) -> models.Account:
 
     if not account:
         raise exceptions.DoesNotExist("Account does not exist.")
-    if not account.check_password(password=password):
+    try:
+        valid = account.check_password(password=password)
+    except hashing.PoolFull:
+        raise exceptions.TooBusy("Unable to check password right now.")
+    if not valid:
         raise exceptions.InvalidPassword("Password is invalid.")
+    if account.needs_rehash():
+        # Upgrade the stored hash while the password is known
+        try:
+            account.rehash_password(password=password)
+        except Exception:
+            # The old hash is still valid, so the login can go ahead
+            pass
     if not account.is_confirmed:
         raise exceptions.EmailNotConfirmed("Email is not confirmed.")
     return account
@@ -16,10 +16,12 @@
 
 from typing import List, Optional
 
+from website import db
 from website.data.accounts import models as account_models
 from website.data.blogs import models as blog_models
 from website.data.categories import models as category_models
 from website.domain import exceptions, utils
+from website.domain.blogs import queries, search
 
 
 def create_blog(
@@ -32,7 +34,8 @@ def create_blog(
     comment: bool = False,
 ) -> blog_models.Blog:
     """
-    Create a Blog in the database.
+    Create a Blog in the database, along with its archive entry and search
+    index entry, in a single transaction.
 
     Raises:
         - `UnableToCreate` if Blog cannot be created.
@@ -59,10 +62,16 @@ def create_blog(
             categories=categories,
             published=published,
             comment=comment,
+            commit=False,
         )
+        blog_models.ArchiveEntry.sync(blog=blog)
+        search.index_blog(blog=blog)
+        db.session.commit()
     except Exception:
+        db.session.rollback()
         # TODO: Publish an event
         raise exceptions.UnableToCreate("Unable to create blog.")
+    queries.clear_rss_cache()
 
     # TODO: Publish an event
 
@@ -77,22 +86,30 @@ def update_blog(blog: blog_models.Blog, **kwargs):
         - `UnableToUpdate` if Blog cannot be updated.
     """
     try:
-        blog.update(**kwargs)
+        blog.update(commit=False, **kwargs)
+        blog_models.ArchiveEntry.sync(blog=blog)
+        search.index_blog(blog=blog)
+        db.session.commit()
     except Exception:
+        db.session.rollback()
         # TODO: Publish an event
         raise exceptions.UnableToUpdate("Unable to update blog.")
+    queries.clear_rss_cache()
 
     # TODO: Publish an event
 
 
 def delete_blog(blog: blog_models.Blog):
     """
-    Delete a Blog from the database.
+    Delete a Blog from the database. Its archive entry is deleted with it.
     """
     try:
+        search.remove_blog(blog=blog)
         blog.delete()
     except Exception:
+        db.session.rollback()
         raise exceptions.UnableToDelete("Unable to delete blog.")
+    queries.clear_rss_cache()
 
     # TODO: Send comms emails
 
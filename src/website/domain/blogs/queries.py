@@ -14,24 +14,78 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-
-from typing import Dict, List, Optional, Union
+import datetime
+import hashlib
+from email import utils as email_utils
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from xml.sax import saxutils
 
 import flask
+import pytz
 from feedgen import feed
+from sqlalchemy import orm, sql
 
+from website import db
 from website.data.accounts import models as account_models
 from website.data.blogs import models as blog_models
 from website.data.categories import models as category_models
+from website.data.common import cache
 from website.domain import exceptions
+from website.domain.common import pagination
+
+# Columns which are too heavy to load when only listing blogs
+LISTING_DEFERRED_COLUMNS = (blog_models.Blog.body,)
+
+# Strategies for eagerly loading a Blog's relationships
+LOAD_JOINED = "joined"
+LOAD_SELECTIN = "selectin"
+LOADING_STRATEGIES = {
+    LOAD_JOINED: orm.joinedload,
+    LOAD_SELECTIN: orm.selectinload,
+}
+
+# Number of blogs fetched from the database at a time when streaming feeds
+FEED_BATCH_SIZE = 50
+
+# Number of generated RSS feeds kept in memory, and for how many seconds.
+# The host is part of each key and comes from the client, so the cache must
+# stay bounded.
+RSS_CACHE_SIZE = 64
+RSS_CACHE_TTL = 3600
+
+# Generated RSS feeds, keyed on host and filters, holding (etag, feed)
+_rss_cache = cache.LRUCache(max_size=RSS_CACHE_SIZE)
+# The latest FeedVersion of each feed, keyed like `_rss_cache`, which is
+# what its `last_modified` is based on
+_rss_versions = cache.LRUCache(max_size=RSS_CACHE_SIZE)
+
+
+class FeedVersion(NamedTuple):
+    """
+    Validators for a generated feed. `last_modified` is when the `etag` was
+    first seen, so that it only moves forward.
+    """
+
+    etag: str
+    last_modified: datetime.datetime
 
 
 def get_blog(
-    id: Optional[int] = None, slug: Optional[str] = None
+    id: Optional[int] = None,
+    slug: Optional[str] = None,
+    load_author: Optional[str] = None,
+    load_categories: Optional[str] = None,
 ) -> blog_models.Blog:
     """
     Determine whether a Blog is available via the provided keyword arguments.
 
+    Params:
+        `load_author` - Strategy for eagerly loading the author, either
+            `LOAD_JOINED` or `LOAD_SELECTIN`. It is lazily loaded by default.
+        `load_categories` - Strategy for eagerly loading the categories,
+            either `LOAD_JOINED` or `LOAD_SELECTIN`. They are lazily loaded by
+            default.
+
     Raises:
         - `DoesNotExist` if the Blog does not exist.
     Returns:
@@ -44,7 +98,15 @@ def get_blog(
     if slug:
         filters.append(blog_models.Blog.slug.ilike(other=slug))
 
-    blog = blog_models.Blog.query.filter(*filters).first()
+    blog = (
+        blog_models.Blog.query.filter(*filters)
+        .options(
+            *_get_blog_options(
+                load_author=load_author, load_categories=load_categories
+            )
+        )
+        .first()
+    )
     if not blog:
         raise exceptions.DoesNotExist("Blog does not exist.")
     return blog
@@ -54,6 +116,10 @@ def get_blogs(
     author: Optional[Union[account_models.Account, int]] = None,
     category: Optional[category_models.Category] = None,
     published: Optional[bool] = None,
+    listing: bool = False,
+    load_author: Optional[str] = None,
+    load_categories: Optional[str] = None,
+    limit: Optional[int] = None,
 ) -> List[blog_models.Blog]:
     """
     Get all blogs matching the provided keyword arguments.
@@ -63,38 +129,176 @@ def get_blogs(
             with no author, use `0`.
         `category` - Only blogs with this category will be returned.
         `published` - Whether to return published or unpublished blogs.
+        `listing` - Whether to defer loading the columns that listings do not
+            display, such as the body.
+        `load_author` - Strategy for eagerly loading each blog's author,
+            either `LOAD_JOINED` or `LOAD_SELECTIN`. Authors are lazily loaded
+            by default.
+        `load_categories` - Strategy for eagerly loading each blog's
+            categories, either `LOAD_JOINED` or `LOAD_SELECTIN`. Categories
+            are lazily loaded by default.
+        `limit` - The maximum number of blogs to return, newest first.
 
     Returns:
         A list of Blogs.
     """
-    filters = []
+    filters = _get_blog_filters(
+        author=author, category=category, published=published
+    )
 
-    if author is not None and author != 0:
-        filters.append(blog_models.Blog.author == author)
-    if author == 0:
-        filters.append(blog_models.Blog.author is None)
-    if category is not None:
-        filters.append(
-            blog_models.Blog.categories.any(
-                category_models.Category.id.in_([category.id])
+    blogs = (
+        blog_models.Blog.query.filter(*filters)
+        .options(
+            *_get_blog_options(
+                listing=listing,
+                load_author=load_author,
+                load_categories=load_categories,
             )
         )
-    if published is not None:
-        filters.append(blog_models.Blog.published == published)
+        .order_by(blog_models.Blog.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return blogs
+
+
+def get_blogs_page(
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    per_page: Optional[int] = None,
+    listing: bool = False,
+    load_author: Optional[str] = None,
+    load_categories: Optional[str] = None,
+) -> pagination.Page:
+    """
+    Get a single page of blogs matching the provided keyword arguments, newest
+    first.
+
+    Pages are keyed on `(created_at, id)` rather than an offset, so the cost of
+    fetching a page does not grow with the number of blogs before it.
+
+    Params:
+        `author` - Only blogs with this author will be returned. To get blogs
+            with no author, use `0`.
+        `category` - Only blogs with this category will be returned.
+        `published` - Whether to return published or unpublished blogs.
+        `cursor` - Opaque cursor taken from a previous Page. The first page is
+            returned when this is not provided.
+        `per_page` - Maximum number of blogs on the page. Defaults to the
+            `BLOGS_PER_PAGE` setting.
+        `listing` - Whether to defer loading the columns that listings do not
+            display, such as the body.
+        `load_author` - Strategy for eagerly loading each blog's author,
+            either `LOAD_JOINED` or `LOAD_SELECTIN`. Authors are lazily loaded
+            by default.
+        `load_categories` - Strategy for eagerly loading each blog's
+            categories, either `LOAD_JOINED` or `LOAD_SELECTIN`. Categories
+            are lazily loaded by default.
+
+    Raises:
+        - `InvalidCursor` if the cursor cannot be decoded.
+    Returns:
+        - A Page of Blogs.
+    """
+    if per_page is None:
+        per_page = flask.current_app.config["BLOGS_PER_PAGE"]
+    filters = _get_blog_filters(
+        author=author, category=category, published=published
+    )
+    ordering = [blog_models.Blog.created_at.desc(), blog_models.Blog.id.desc()]
+
+    decoded_cursor = None
+    if cursor:
+        decoded_cursor = pagination.decode_cursor(cursor=cursor)
+        filters.append(_get_keyset_filter(cursor=decoded_cursor))
+        if decoded_cursor.direction == pagination.DIRECTION_PREV:
+            ordering = [
+                blog_models.Blog.created_at.asc(),
+                blog_models.Blog.id.asc(),
+            ]
 
     blogs = (
         blog_models.Blog.query.filter(*filters)
-        .order_by(blog_models.Blog.created_at.desc())
+        .options(
+            *_get_blog_options(
+                listing=listing,
+                load_author=load_author,
+                load_categories=load_categories,
+            )
+        )
+        .order_by(*ordering)
+        .limit(per_page + 1)
         .all()
     )
-    return blogs
+    return pagination.paginate(
+        rows=blogs,
+        per_page=per_page,
+        cursor=decoded_cursor,
+        key=lambda blog: [blog.created_at, blog.id],
+    )
+
+
+def get_archive_entries(published: Optional[bool] = None) -> list:
+    """
+    Get lightweight archive entries for all blogs, newest first.
+
+    The year and month are extracted by the database, and only the columns
+    needed to link to each blog are loaded.
+
+    Params:
+        `published` - Whether to return published or unpublished blogs.
+
+    Returns:
+        A list of rows with the `year`, `month`, `id`, `slug` and `title` of
+        each blog.
+    """
+    filters = _get_blog_filters(published=published)
+
+    entries = (
+        db.session.query(
+            sql.cast(
+                sql.extract("year", blog_models.Blog.created_at), db.Integer
+            ).label("year"),
+            sql.cast(
+                sql.extract("month", blog_models.Blog.created_at), db.Integer
+            ).label("month"),
+            blog_models.Blog.id,
+            blog_models.Blog.slug,
+            blog_models.Blog.title,
+        )
+        .filter(*filters)
+        .order_by(
+            blog_models.Blog.created_at.desc(), blog_models.Blog.id.desc()
+        )
+        .all()
+    )
+    return entries
+
+
+def get_archive_index() -> List[blog_models.ArchiveEntry]:
+    """
+    Get the materialised archive entries of all published blogs, newest first.
+
+    Returns:
+        A list of ArchiveEntries.
+    """
+    return blog_models.ArchiveEntry.query.order_by(
+        blog_models.ArchiveEntry.year.desc(),
+        blog_models.ArchiveEntry.month.desc(),
+        blog_models.ArchiveEntry.created_at.desc(),
+    ).all()
 
 
 def retrieve_archived_blogs(
     published: Optional[bool] = None,
 ) -> Dict[int, dict]:
     """
-    Get a dictionary containing archived blogs sorted from oldest to newest.
+    Get a dictionary containing archived blogs sorted from newest to oldest.
+
+    Published blogs are read from the materialised archive index, which is
+    kept up to date by the blog operations.
 
     Args:
         published (bool, optional): Whether to return all, published or
@@ -102,54 +306,531 @@ def retrieve_archived_blogs(
 
     Returns:
         dict: The first two integer keys represent the year and month (in that
-        order) the blog posts were created.
+        order) the blog posts were created. Each month holds a list of entries
+        with at least a `slug` and a `title`.
     """
-    blogs = get_blogs(published=published)
+    if published:
+        entries = get_archive_index()
+    else:
+        entries = get_archive_entries(published=published)
     blog_data: Dict[int, dict] = dict()
-    for blog in blogs:
-        date = blog.created_at.date()
-        year = date.year
-        month = date.month
-        if not blog_data.get(year):
-            blog_data.update({year: dict()})
-        if not blog_data[year].get(month):
-            blog_data[year].update({month: list()})
-        blog_data[year][month].append(blog)
+    for entry in entries:
+        months = blog_data.setdefault(entry.year, dict())
+        months.setdefault(entry.month, list()).append(entry)
     return blog_data
 
 
+def get_rss_version(
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+    max_items: Optional[int] = None,
+    full_content: Optional[bool] = None,
+) -> FeedVersion:
+    """
+    Get the version of the RSS feed for the provided keyword arguments, using
+    a single aggregate query rather than loading any blogs.
+
+    The version changes whenever a matching blog is created, updated or
+    deleted, so it can be used as a validator for conditional requests.
+
+    The version's `last_modified` is when it was first seen, rather than when
+    its newest blog was modified, as a blog which is deleted or unpublished
+    leaves the feed without moving that forward. Versions are remembered per
+    process, so a new one is seen as modified, which only costs a client a
+    fresh copy.
+
+    Params:
+        `author` - Only blogs with this author will be included. To include
+            blogs with no author, use `0`.
+        `category` - Only blogs with this category will be included.
+        `published` - Whether to include published or unpublished blogs.
+        `max_items` - See `get_rss_blogs`.
+        `full_content` - See `get_rss_blogs`.
+
+    Returns:
+        - The FeedVersion of the RSS feed.
+    """
+    host = flask.request.host_url[:-1]
+    filters = _get_blog_filters(
+        author=author, category=category, published=published
+    )
+    modified_at, count, last_id = (
+        db.session.query(
+            sql.func.max(
+                sql.func.coalesce(
+                    blog_models.Blog.updated_at, blog_models.Blog.created_at
+                )
+            ),
+            sql.func.count(blog_models.Blog.id),
+            sql.func.max(blog_models.Blog.id),
+        )
+        .filter(*filters)
+        .one()
+    )
+    key = _get_feed_key(
+        host=host,
+        author=author,
+        category=category,
+        published=published,
+        max_items=max_items,
+        full_content=full_content,
+    )
+    etag = hashlib.sha1(
+        f"{key}|{modified_at}|{count}|{last_id}".encode("utf-8")
+    ).hexdigest()
+
+    previous: Optional[FeedVersion] = _rss_versions.get(key=key)
+    if previous and previous.etag == etag:
+        return previous
+    # Clients only send back whole seconds
+    last_modified = datetime.datetime.now(tz=pytz.utc).replace(microsecond=0)
+    if previous and last_modified <= previous.last_modified:
+        last_modified = previous.last_modified + datetime.timedelta(seconds=1)
+    version = FeedVersion(etag=etag, last_modified=last_modified)
+    _rss_versions.set(key=key, value=version, ttl=RSS_CACHE_TTL)
+    return version
+
+
 def get_rss_blogs(
     author: Optional[Union[account_models.Account, int]] = None,
     category: Optional[category_models.Category] = None,
     published: Optional[bool] = None,
-) -> str:
+    max_items: Optional[int] = None,
+    full_content: Optional[bool] = None,
+    version: Optional[FeedVersion] = None,
+) -> bytes:
     """
-    Return blogs in the RSS format.
+    Return blogs in the RSS format, newest first.
+
+    Up to `RSS_CACHE_SIZE` generated feeds are cached per host and keyword
+    arguments until their version changes, or until `clear_rss_cache` is
+    called.
 
     Params:
         `author` - Only blogs with this author will be returned. To get blogs
             with no author, use `0`.
         `category` - Only blogs with this category will be returned.
         `published` - Whether to return published or unpublished blogs.
+        `max_items` - The maximum number of blogs to return. This can only
+            lower the `FEED_MAX_ITEMS` setting, which is used by default.
+        `full_content` - Whether to include each blog's body, rather than
+            only its description. This can only be enabled if the
+            `FEED_FULL_CONTENT` setting is, which is used by default.
+        `version` - The current version of the feed, if it has already been
+            retrieved with `get_rss_version`.
+    """
+    if version is None:
+        version = get_rss_version(
+            author=author,
+            category=category,
+            published=published,
+            max_items=max_items,
+            full_content=full_content,
+        )
+    host = flask.request.host_url[:-1]
+    key = _get_feed_key(
+        host=host,
+        author=author,
+        category=category,
+        published=published,
+        max_items=max_items,
+        full_content=full_content,
+    )
+    cached: Optional[Tuple[str, bytes]] = _rss_cache.get(key=key)
+    if cached and cached[0] == version.etag:
+        return cached[1]
+
+    max_items, full_content = _get_feed_options(
+        max_items=max_items, full_content=full_content
+    )
+    blogs = get_blogs(
+        author=author,
+        category=category,
+        published=published,
+        listing=not full_content,
+        load_author=LOAD_JOINED,
+        load_categories=LOAD_SELECTIN,
+        limit=max_items,
+    )
+
+    generator = _create_generator(
+        host=host, blogs=blogs, full_content=full_content
+    )
+    generator.link(href=_get_feed_url(host=host), rel="self")
+
+    rss = generator.rss_str()
+    _rss_cache.set(key=key, value=(version.etag, rss), ttl=RSS_CACHE_TTL)
+    return rss
+
+
+def clear_rss_cache():
+    """
+    Discard every cached RSS feed. Versions are kept, so that each feed's
+    `last_modified` keeps moving forward.
+    """
+    _rss_cache.clear()
+
+
+def stream_rss_blogs(
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+    max_items: Optional[int] = None,
+    full_content: Optional[bool] = None,
+) -> Iterator[str]:
+    """
+    Stream blogs in the RSS format, newest first.
+
+    Unlike `get_rss_blogs`, no document tree is built: the feed is written
+    incrementally while blogs are read from a server-side cursor, so memory
+    use doesn't grow with the size of the feed. Other than the generator
+    element, the output matches that of `get_rss_blogs`.
+
+    Params:
+        See `get_rss_blogs`.
+
+    Returns:
+        - An iterator over chunks of the RSS feed.
     """
     host = flask.request.host_url[:-1]
-    rss_url = flask.url_for(endpoint="main.rss")
-    blogs = get_blogs(author=author, category=category, published=published)
+    feed_url = _get_feed_url(host=host)
+    config = flask.current_app.config
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+    yield "<?xml version='1.0' encoding='UTF-8'?>\n"
+    yield (
+        '<rss xmlns:atom="http://www.w3.org/2005/Atom" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'version="2.0"><channel>'
+    )
+    yield _xml_element("title", config["FEED_TITLE"])
+    yield _xml_element("link", feed_url)
+    yield _xml_element("description", config["FEED_DESCRIPTION"])
+    yield _xml_element("atom:link", href=feed_url, rel="self")
+    yield _xml_element("docs", "http://www.rssboard.org/rss-specification")
+    yield _xml_element("lastBuildDate", email_utils.format_datetime(now))
+
+    max_items, full_content = _get_feed_options(
+        max_items=max_items, full_content=full_content
+    )
+    for blog in _stream_feed_blogs(
+        author=author,
+        category=category,
+        published=published,
+        max_items=max_items,
+        full_content=full_content,
+    ):
+        yield _create_rss_item(host=host, blog=blog, full_content=full_content)
+    yield "</channel></rss>"
+
+
+def stream_atom_blogs(
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+    max_items: Optional[int] = None,
+    full_content: Optional[bool] = None,
+) -> Iterator[str]:
+    """
+    Stream blogs in the Atom format, newest first.
 
-    generator = _create_generator(host=host, blogs=blogs)
-    generator.link(href=f"{host}{rss_url}", rel="self")
+    Like `stream_rss_blogs`, the feed is written incrementally while blogs
+    are read from a server-side cursor.
 
-    return generator.rss_str()
+    Params:
+        See `get_rss_blogs`.
+
+    Returns:
+        - An iterator over chunks of the Atom feed.
+    """
+    host = flask.request.host_url[:-1]
+    feed_url = _get_feed_url(host=host)
+    config = flask.current_app.config
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+    yield "<?xml version='1.0' encoding='UTF-8'?>\n"
+    yield '<feed xmlns="http://www.w3.org/2005/Atom">'
+    yield _xml_element("id", f"{host}/")
+    yield _xml_element("title", config["FEED_TITLE"])
+    yield _xml_element("updated", now.isoformat())
+    yield _xml_element("link", href=feed_url, rel="self")
+    yield _xml_element("subtitle", config["FEED_DESCRIPTION"])
+
+    max_items, full_content = _get_feed_options(
+        max_items=max_items, full_content=full_content
+    )
+    for blog in _stream_feed_blogs(
+        author=author,
+        category=category,
+        published=published,
+        max_items=max_items,
+        full_content=full_content,
+    ):
+        yield _create_atom_entry(
+            host=host, blog=blog, full_content=full_content
+        )
+    yield "</feed>"
 
 
 # Private
 
 
-def _create_generator(host: str, blogs: List[blog_models.Blog] = []):
+def _get_feed_key(
+    host: str,
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+    max_items: Optional[int] = None,
+    full_content: Optional[bool] = None,
+) -> tuple:
+    return (
+        host,
+        getattr(author, "id", author),
+        getattr(category, "id", category),
+        published,
+        *_get_feed_options(max_items=max_items, full_content=full_content),
+    )
+
+
+def _get_feed_options(
+    max_items: Optional[int] = None, full_content: Optional[bool] = None,
+) -> Tuple[int, bool]:
+    # Requests can narrow the configured feed, but never widen it
+    config = flask.current_app.config
+    if max_items is None or max_items < 1:
+        max_items = config["FEED_MAX_ITEMS"]
+    max_items = min(max_items, config["FEED_MAX_ITEMS"])
+    if full_content is None:
+        full_content = config["FEED_FULL_CONTENT"]
+    full_content = full_content and config["FEED_FULL_CONTENT"]
+    return max_items, full_content
+
+
+def _get_blog_filters(
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+) -> list:
+    filters = []
+
+    if author is not None and author != 0:
+        filters.append(blog_models.Blog.author == author)
+    if author == 0:
+        filters.append(blog_models.Blog.author is None)
+    if category is not None:
+        filters.append(
+            blog_models.Blog.categories.any(
+                category_models.Category.id.in_([category.id])
+            )
+        )
+    if published is not None:
+        filters.append(blog_models.Blog.published == published)
+    return filters
+
+
+def _get_blog_options(
+    listing: bool = False,
+    load_author: Optional[str] = None,
+    load_categories: Optional[str] = None,
+) -> list:
+    options = []
+
+    if listing:
+        options.extend(
+            orm.defer(column) for column in LISTING_DEFERRED_COLUMNS
+        )
+    if load_author is not None:
+        loader = LOADING_STRATEGIES[load_author]
+        options.append(loader(blog_models.Blog.author))
+    if load_categories is not None:
+        loader = LOADING_STRATEGIES[load_categories]
+        options.append(loader(blog_models.Blog.categories))
+    return options
+
+
+def _get_keyset_filter(cursor: pagination.Cursor):
+    try:
+        created_at, id = cursor.values
+        created_at = datetime.datetime.fromisoformat(created_at)
+        id = int(id)
+    except (TypeError, ValueError):
+        raise exceptions.InvalidCursor("Cursor is invalid.")
+
+    # Compare against the stored timestamp of the anchoring blog where it still
+    # exists, as SQLite stores timestamps as text and a bound datetime would
+    # not compare equal to its own row. The cursor's copy is only a fallback
+    # for when the anchoring blog has since been deleted.
+    anchor = sql.func.coalesce(
+        db.session.query(blog_models.Blog.created_at)
+        .filter(blog_models.Blog.id == id)
+        .as_scalar(),
+        created_at,
+    )
+    if cursor.direction == pagination.DIRECTION_PREV:
+        return sql.or_(
+            blog_models.Blog.created_at > anchor,
+            sql.and_(
+                blog_models.Blog.created_at == anchor,
+                blog_models.Blog.id > id,
+            ),
+        )
+    return sql.or_(
+        blog_models.Blog.created_at < anchor,
+        sql.and_(
+            blog_models.Blog.created_at == anchor, blog_models.Blog.id < id,
+        ),
+    )
+
+
+def _get_feed_url(host: str) -> str:
+    feed_url = flask.url_for(
+        endpoint=flask.request.endpoint, **flask.request.view_args
+    )
+    return f"{host}{feed_url}"
+
+
+def _stream_feed_blogs(
+    author: Optional[Union[account_models.Account, int]],
+    category: Optional[category_models.Category],
+    published: Optional[bool],
+    max_items: int,
+    full_content: bool,
+) -> Iterator[blog_models.Blog]:
+    filters = _get_blog_filters(
+        author=author, category=category, published=published
+    )
+    return (
+        blog_models.Blog.query.filter(*filters)
+        .options(
+            *_get_blog_options(
+                listing=not full_content,
+                load_author=LOAD_JOINED,
+                load_categories=LOAD_SELECTIN,
+            )
+        )
+        .order_by(blog_models.Blog.created_at.desc())
+        .limit(max_items)
+        .execution_options(stream_results=True)
+        .yield_per(FEED_BATCH_SIZE)
+    )
+
+
+def _xml_element(tag: str, text: Optional[str] = None, **attributes) -> str:
+    # Escaped the same way as lxml, so streamed feeds match feedgen's
+    entities = {'"': "&quot;"}
+    attributes = "".join(
+        f' {name}="{saxutils.escape(value, entities)}"'
+        for name, value in attributes.items()
+    )
+    if text is None:
+        return f"<{tag}{attributes}/>"
+    return f"<{tag}{attributes}>{saxutils.escape(text)}</{tag}>"
+
+
+def _create_rss_item(
+    host: str, blog: blog_models.Blog, full_content: bool = True
+) -> str:
+    # Mirrors the items written by feedgen for `_create_generator`
+    blog_url = flask.url_for(endpoint="blogs.display", slug=blog.slug)
+    parts = [
+        _xml_element("title", blog.title),
+        _xml_element("link", f"{host}{blog_url}"),
+    ]
+    if blog.description:
+        parts.append(_xml_element("description", blog.description))
+        if full_content and blog.body:
+            parts.append(_xml_element("content:encoded", blog.body))
+    elif full_content and blog.body:
+        parts.append(_xml_element("description", blog.body))
+    if blog.author is not None:
+        parts.append(
+            _xml_element(
+                "author", f"{blog.author.email} ({blog.author.display})"
+            )
+        )
+    parts.append(_xml_element("guid", f"{host}{blog_url}", isPermaLink="true"))
+    for category in blog.categories:
+        category_url = flask.url_for(
+            endpoint="categories.display", slug=category.slug
+        )
+        parts.append(
+            _xml_element(
+                "category", category.title, domain=f"{host}{category_url}"
+            )
+        )
+    parts.append(
+        _xml_element(
+            "pubDate",
+            email_utils.format_datetime(_as_utc(value=blog.created_at)),
+        )
+    )
+    return "<item>" + "".join(parts) + "</item>"
+
+
+def _create_atom_entry(
+    host: str, blog: blog_models.Blog, full_content: bool = True
+) -> str:
+    blog_url = flask.url_for(endpoint="blogs.display", slug=blog.slug)
+    updated = _as_utc(value=blog.updated_at or blog.created_at)
+    parts = [
+        _xml_element("id", f"{host}{blog_url}"),
+        _xml_element("title", blog.title),
+        _xml_element("updated", updated.isoformat()),
+    ]
+    if blog.author is not None:
+        author_url = flask.url_for(
+            endpoint="accounts.display", username=blog.author.username
+        )
+        parts.append(
+            "<author>"
+            + _xml_element("name", blog.author.display)
+            + _xml_element("email", blog.author.email)
+            + _xml_element("uri", f"{host}{author_url}")
+            + "</author>"
+        )
+    if full_content and blog.body:
+        parts.append(_xml_element("content", blog.body, type="html"))
+    parts.append(
+        _xml_element("link", href=f"{host}{blog_url}", rel="alternate")
+    )
+    if blog.description:
+        parts.append(_xml_element("summary", blog.description))
+    for category in blog.categories:
+        category_url = flask.url_for(
+            endpoint="categories.display", slug=category.slug
+        )
+        parts.append(
+            _xml_element(
+                "category",
+                term=category.slug,
+                scheme=f"{host}{category_url}",
+                label=category.title,
+            )
+        )
+    parts.append(
+        _xml_element("published", _as_utc(value=blog.created_at).isoformat())
+    )
+    return "<entry>" + "".join(parts) + "</entry>"
+
+
+def _as_utc(
+    value: Optional[datetime.datetime],
+) -> Optional[datetime.datetime]:
+    # Some backends (e.g. SQLite) drop the timezone, which feeds require
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def _create_generator(
+    host: str, blogs: List[blog_models.Blog] = [], full_content: bool = True
+):
     title = flask.current_app.config["FEED_TITLE"]
     description = flask.current_app.config["FEED_DESCRIPTION"]
 
     generator = feed.FeedGenerator()
+    generator.id(id=f"{host}/")
     generator.title(title=title)
     generator.description(description=description)
 
@@ -157,23 +838,30 @@ def _create_generator(host: str, blogs: List[blog_models.Blog] = []):
         categories = list()
         blog_url = flask.url_for(endpoint="blogs.display", slug=blog.slug)
         author_url = flask.url_for(
-            endpoint="accounts.display", username=blog.author.display
+            endpoint="accounts.display", username=blog.author.username
         )
 
-        entry = generator.add_entry()
+        # Blogs are already ordered, newest first
+        entry = generator.add_entry(order="append")
         entry.title(title=blog.title)
-        entry.description(description=blog.description, isSummary=True)
-        entry.content(content=blog.body)
+        # Also the RSS description. `description(isSummary=True)` would set
+        # a summary which feedgen can't write to Atom.
+        entry.summary(summary=blog.description)
+        if full_content:
+            entry.content(content=blog.body, type="html")
         entry.guid(
             guid=f"{host}{blog_url}", permalink=True,
         )
+        entry.link(href=f"{host}{blog_url}", rel="alternate")
         entry.author(
             name=blog.author.display,
             uri=f"{host}{author_url}",
             email=blog.author.email,
         )
-        entry.published(published=blog.created_at)
-        entry.updated(updated=blog.updated_at)
+        entry.published(published=_as_utc(value=blog.created_at))
+        entry.updated(
+            updated=_as_utc(value=blog.updated_at or blog.created_at)
+        )
 
         for category in blog.categories:
             category_url = flask.url_for(
@@ -181,7 +869,7 @@ def _create_generator(host: str, blogs: List[blog_models.Blog] = []):
             )
             category = dict(
                 label=category.title,
-                term=category.description,
+                term=category.slug,
                 scheme=f"{host}{category_url}",
             )
             categories.append(category)
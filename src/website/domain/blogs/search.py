@@ -0,0 +1,270 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import html
+import re
+from typing import Optional
+
+import bleach
+import flask
+from sqlalchemy import orm, sql
+
+from website import db
+from website.data.blogs import models as blog_models
+from website.domain import exceptions
+from website.domain.blogs import queries
+from website.domain.common import pagination
+
+# Relative weights of the title, description and body when ranking results
+# with SQLite. PostgreSQL weights them as A, B and C respectively.
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Number of blogs loaded at a time when rebuilding the index
+INDEX_BATCH_SIZE = 100
+
+
+def index_blog(blog: blog_models.Blog):
+    """
+    Add a Blog to the search index, replacing any existing entry for it. The
+    caller commits the change.
+
+    Params:
+        `blog` - The Blog to index.
+    """
+    _index_blog(blog=blog)
+
+
+def remove_blog(blog: blog_models.Blog):
+    """
+    Remove a Blog from the search index. The caller commits the change.
+
+    Params:
+        `blog` - The Blog to remove.
+    """
+    backend = _get_backend()
+    if backend is not None:
+        column = "rowid" if backend == "sqlite" else "blog_id"
+        db.session.execute(
+            f"DELETE FROM {blog_models.SEARCH_TABLE} WHERE {column} = :id",
+            dict(id=blog.id),
+        )
+
+
+def rebuild_index() -> int:
+    """
+    Replace the search index with entries for every blog.
+
+    Returns:
+        - The number of blogs indexed.
+    """
+    if _get_backend() is None:
+        return 0
+    db.session.execute(f"DELETE FROM {blog_models.SEARCH_TABLE}")
+    count = 0
+    blogs = blog_models.Blog.query.order_by(blog_models.Blog.id).yield_per(
+        INDEX_BATCH_SIZE
+    )
+    for blog in blogs:
+        _index_blog(blog=blog)
+        count += 1
+    db.session.commit()
+    return count
+
+
+def search_blogs(
+    query: str,
+    published: Optional[bool] = True,
+    cursor: Optional[str] = None,
+    per_page: Optional[int] = None,
+    listing: bool = False,
+) -> pagination.Page:
+    """
+    Get a single page of blogs matching a search query, most relevant first.
+
+    Blogs are matched on their title, description and body, with matches in
+    the title ranked highest. Pages are keyed on `(rank, id)`, in the same
+    way as `queries.get_blogs_page`.
+
+    Params:
+        `query` - The search terms. Blogs must match every term.
+        `published` - Whether to return published or unpublished blogs.
+        `cursor` - Opaque cursor taken from a previous Page. The first page is
+            returned when this is not provided.
+        `per_page` - Maximum number of blogs on the page. Defaults to the
+            `BLOGS_PER_PAGE` setting.
+        `listing` - Whether to defer loading the columns that listings do not
+            display, such as the body.
+
+    Raises:
+        - `InvalidCursor` if the cursor cannot be decoded.
+    Returns:
+        - A Page of Blogs.
+    """
+    if per_page is None:
+        per_page = flask.current_app.config["BLOGS_PER_PAGE"]
+    decoded_cursor = None
+    if cursor:
+        decoded_cursor = pagination.decode_cursor(cursor=cursor)
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return pagination.Page(items=[])
+
+    ranked = _get_ranked_blogs(terms=terms)
+    filters = []
+    if published is not None:
+        filters.append(blog_models.Blog.published == published)
+    ordering = [ranked.c.rank.asc(), ranked.c.blog_id.asc()]
+    if decoded_cursor:
+        filters.append(
+            _get_keyset_filter(ranked=ranked, cursor=decoded_cursor)
+        )
+        if decoded_cursor.direction == pagination.DIRECTION_PREV:
+            ordering = [ranked.c.rank.desc(), ranked.c.blog_id.desc()]
+
+    options = [
+        orm.joinedload(blog_models.Blog.author),
+        orm.selectinload(blog_models.Blog.categories),
+    ]
+    if listing:
+        options.extend(
+            orm.defer(column) for column in queries.LISTING_DEFERRED_COLUMNS
+        )
+    rows = (
+        db.session.query(blog_models.Blog, ranked.c.rank)
+        .join(ranked, ranked.c.blog_id == blog_models.Blog.id)
+        .filter(*filters)
+        .options(*options)
+        .order_by(*ordering)
+        .limit(per_page + 1)
+        .all()
+    )
+    page = pagination.paginate(
+        rows=rows,
+        per_page=per_page,
+        cursor=decoded_cursor,
+        key=lambda row: [row.rank, row.Blog.id],
+    )
+    return page._replace(items=[row.Blog for row in page.items])
+
+
+# Private
+
+
+def _get_backend() -> Optional[str]:
+    dialect = db.session.get_bind().dialect.name
+    if dialect in blog_models.SEARCH_TABLE_DDL:
+        return dialect
+    return None
+
+
+def _index_blog(blog: blog_models.Blog):
+    values = dict(
+        id=blog.id,
+        title=blog.title,
+        description=blog.description or "",
+        body=_get_text(body=blog.body),
+    )
+    backend = _get_backend()
+    if backend == "sqlite":
+        db.session.execute(
+            f"DELETE FROM {blog_models.SEARCH_TABLE} WHERE rowid = :id",
+            values,
+        )
+        db.session.execute(
+            f"INSERT INTO {blog_models.SEARCH_TABLE} "
+            "(rowid, title, description, body) "
+            "VALUES (:id, :title, :description, :body)",
+            values,
+        )
+    elif backend == "postgresql":
+        db.session.execute(
+            f"INSERT INTO {blog_models.SEARCH_TABLE} (blog_id, document) "
+            "VALUES (:id, "
+            "setweight(to_tsvector('english', :title), 'A') || "
+            "setweight(to_tsvector('english', :description), 'B') || "
+            "setweight(to_tsvector('english', :body), 'C')) "
+            "ON CONFLICT (blog_id) DO UPDATE SET document = excluded.document",
+            values,
+        )
+
+
+def _get_text(body: str) -> str:
+    # Only the text of a blog is indexed, not its markup
+    return html.unescape(bleach.clean(text=body, tags=[], strip=True))
+
+
+def _get_ranked_blogs(terms: list):
+    """
+    Return a subquery of the ids of blogs matching every term, with a rank
+    where lower is more relevant.
+    """
+    backend = _get_backend()
+    if backend == "sqlite":
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+        # Quote each term, so that they're never read as FTS5 syntax
+        statement = sql.text(
+            f"SELECT rowid AS blog_id, "
+            f"bm25({blog_models.SEARCH_TABLE}, {weights}) AS rank "
+            f"FROM {blog_models.SEARCH_TABLE} "
+            f"WHERE {blog_models.SEARCH_TABLE} MATCH :query"
+        ).bindparams(query=" ".join(f'"{term}"' for term in terms))
+    elif backend == "postgresql":
+        statement = sql.text(
+            "SELECT blog_id, -ts_rank(document, search_query) AS rank "
+            f"FROM {blog_models.SEARCH_TABLE}, "
+            "plainto_tsquery('english', :query) AS search_query "
+            "WHERE document @@ search_query"
+        ).bindparams(query=" ".join(terms))
+    else:
+        # Without a search index, fall back to scanning titles
+        statement = sql.select(
+            [
+                blog_models.Blog.id.label("blog_id"),
+                sql.literal(0.0).label("rank"),
+            ]
+        ).where(
+            sql.and_(
+                *[blog_models.Blog.title.ilike(f"%{term}%") for term in terms]
+            )
+        )
+        return statement.alias("ranked")
+    return statement.columns(blog_id=db.Integer, rank=db.Float).alias("ranked")
+
+
+def _get_keyset_filter(ranked, cursor: pagination.Cursor):
+    try:
+        rank, blog_id = cursor.values
+    except ValueError:
+        raise exceptions.InvalidCursor("Cursor is invalid.")
+    # The values are compiled into the query, so only accept what a page
+    # would have put there. `bool` is a subclass of `int`.
+    if (
+        isinstance(rank, bool)
+        or not isinstance(rank, (int, float))
+        or isinstance(blog_id, bool)
+        or not isinstance(blog_id, int)
+    ):
+        raise exceptions.InvalidCursor("Cursor is invalid.")
+    if cursor.direction == pagination.DIRECTION_PREV:
+        return sql.or_(
+            ranked.c.rank < rank,
+            sql.and_(ranked.c.rank == rank, ranked.c.blog_id < blog_id),
+        )
+    return sql.or_(
+        ranked.c.rank > rank,
+        sql.and_(ranked.c.rank == rank, ranked.c.blog_id > blog_id),
+    )
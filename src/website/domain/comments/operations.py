@@ -51,18 +51,12 @@ def create_comment(
             raise exceptions.UnableToCreate(
                 "Cannot create comments on this blog"
             )
-        thread_at = None
     elif parent:
         blog = parent.blog
-        thread_at = parent.thread_at
 
     try:
         comment = comment_models.Comment.new(
-            body=body,
-            author=author,
-            blog=blog,
-            parent=parent,
-            thread_at=thread_at,
+            body=body, author=author, blog=blog, parent=parent,
         )
     except Exception:
         # TODO: Publish an event
@@ -15,12 +15,39 @@
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 
-from typing import Optional, Union
+import datetime
+from typing import List, NamedTuple, Optional, Set, Union
 
+import flask
+from sqlalchemy import sql
+
+from website import db
 from website.data.accounts import models as account_models
 from website.data.blogs import models as blog_models
 from website.data.comments import models as comment_models
 from website.domain import exceptions
+from website.domain.common import pagination
+
+
+class CommentNode(NamedTuple):
+    """
+    Lightweight, read-only view of a Comment within a comment tree, which can
+    be rendered without touching the ORM.
+    """
+
+    id: int
+    body: str
+    path: str
+    level: int
+    created_at: datetime.datetime
+    updated_at: Optional[datetime.datetime]
+    thread_at: datetime.datetime
+    parent_id: Optional[int]
+    author_id: Optional[int]
+    author_username: Optional[str]
+    author_display: Optional[str]
+    replies: List["CommentNode"]
+    replies_cursor: Optional[str] = None
 
 
 def get_comment(id: Optional[int] = None) -> comment_models.Comment:
@@ -83,3 +110,234 @@ def get_comments(
     )
 
     return comments
+
+
+def get_comment_threads_page(
+    blog: Optional[blog_models.Blog] = None,
+    parent: Optional[comment_models.Comment] = None,
+    cursor: Optional[str] = None,
+    per_page: Optional[int] = None,
+    max_depth: Optional[int] = None,
+) -> pagination.Page:
+    """
+    Get a single page of comment threads, newest first.
+
+    Threads are the top-level comments of a blog, or the direct replies to
+    `parent`, and are keyed on `(thread_at, path)`. Legacy comments without a
+    path are left out. Each thread includes its
+    replies up to `max_depth` levels below it. Comments with replies beyond
+    that have a `replies_cursor`, which continues the thread when used as
+    the cursor for that comment's own replies.
+
+    Params:
+        `blog` - Only comments on this blog will be returned.
+        `parent` - Only replies to this comment will be returned.
+        `cursor` - Opaque cursor taken from a previous Page, or from a
+            CommentNode's `replies_cursor`. The first page is returned when
+            this is not provided.
+        `per_page` - Maximum number of threads on the page. Defaults to the
+            `COMMENTS_PER_PAGE` setting.
+        `max_depth` - How many levels of replies to include in each thread.
+            This can only lower the `COMMENTS_MAX_DEPTH` setting, which is
+            used by default.
+
+    Raises:
+        - `InvalidCursor` if the cursor cannot be decoded.
+    Returns:
+        - A Page of CommentNodes, with their replies nested within them.
+    """
+    config = flask.current_app.config
+    if per_page is None:
+        per_page = config["COMMENTS_PER_PAGE"]
+    if max_depth is None or max_depth < 0:
+        max_depth = config["COMMENTS_MAX_DEPTH"]
+    max_depth = min(max_depth, config["COMMENTS_MAX_DEPTH"])
+
+    Comment = comment_models.Comment
+    filters = list()
+    if blog is not None:
+        filters.append(Comment.blog_id == blog.id)
+    if parent is not None:
+        filters.append(Comment.parent_id == parent.id)
+    else:
+        filters.append(Comment.parent_id.is_(None))
+    # Legacy comments without a path can't be placed in a thread
+    filters.append(Comment.path.isnot(None))
+    ordering = [Comment.thread_at.desc(), Comment.path.asc()]
+
+    decoded_cursor = None
+    if cursor:
+        decoded_cursor = pagination.decode_cursor(cursor=cursor)
+        filters.append(_get_keyset_filter(cursor=decoded_cursor))
+        if decoded_cursor.direction == pagination.DIRECTION_PREV:
+            ordering = [Comment.thread_at.asc(), Comment.path.desc()]
+
+    rows = (
+        _get_node_query()
+        .filter(*filters)
+        .order_by(*ordering)
+        .limit(per_page + 1)
+        .all()
+    )
+    page = pagination.paginate(
+        rows=rows,
+        per_page=per_page,
+        cursor=decoded_cursor,
+        key=lambda row: [row.thread_at, row.path],
+    )
+    if not page.items:
+        return page
+
+    # Fetch the replies within `max_depth` of every thread in one query
+    base_level = parent.level + 1 if parent is not None else 0
+    max_level = base_level + max_depth
+    replies = []
+    if max_depth > 0:
+        replies = (
+            _get_node_query()
+            .filter(
+                sql.or_(
+                    *[
+                        Comment.path.like(
+                            f"{row.path}{comment_models.PATH_SEPARATOR}%"
+                        )
+                        for row in page.items
+                    ]
+                ),
+                _get_level_expression() <= max_level,
+            )
+            .order_by(Comment.path.asc())
+            .all()
+        )
+
+    # Find the comments on the last level that have replies of their own
+    last_level = [
+        row.id
+        for row in page.items + replies
+        if comment_models.get_level(path=row.path) == max_level
+    ]
+    truncated = set()
+    if last_level:
+        truncated = {
+            parent_id
+            for parent_id, in db.session.query(Comment.parent_id)
+            .filter(Comment.parent_id.in_(last_level))
+            .distinct()
+        }
+
+    threads = dict()
+    for row in replies:
+        root_path = comment_models.get_root_path(
+            path=row.path, level=base_level
+        )
+        threads.setdefault(root_path, []).append(row)
+    items = [
+        _build_tree(
+            rows=[row] + threads.get(row.path, []),
+            base_level=base_level,
+            truncated=truncated,
+        )[0]
+        for row in page.items
+    ]
+    return page._replace(items=items)
+
+
+# Private
+
+
+def _get_node_query():
+    Comment = comment_models.Comment
+    Account = account_models.Account
+    return db.session.query(
+        Comment.id,
+        Comment.body,
+        Comment.path,
+        Comment.created_at,
+        Comment.updated_at,
+        Comment.thread_at,
+        Comment.parent_id,
+        Comment.author_id,
+        Account.username,
+        Account.display,
+    ).outerjoin(Account, Comment.author_id == Account.id)
+
+
+def _get_level_expression():
+    """
+    SQL expression for the level of a Comment, counting the separators in its
+    path so it holds whatever width the path segments are padded to.
+    """
+    path = comment_models.Comment.path
+    return sql.func.length(path) - sql.func.length(
+        sql.func.replace(path, comment_models.PATH_SEPARATOR, "")
+    )
+
+
+def _build_tree(
+    rows: list, base_level: int, truncated: Set[int] = frozenset()
+) -> List[CommentNode]:
+    """
+    Assemble rows ordered by path into a tree, in one pass. Comments whose ids
+    are in `truncated` are given a cursor for their replies.
+    """
+    roots: List[CommentNode] = []
+    # The most recent node at each level, i.e. the ancestors of the next node
+    ancestors: List[CommentNode] = []
+    for row in rows:
+        replies_cursor = None
+        if row.id in truncated:
+            replies_cursor = pagination.encode_cursor(
+                direction=pagination.DIRECTION_NEXT,
+                values=[row.thread_at, row.path],
+            )
+        node = CommentNode(
+            id=row.id,
+            body=row.body,
+            path=row.path,
+            level=comment_models.get_level(path=row.path),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            thread_at=row.thread_at,
+            parent_id=row.parent_id,
+            author_id=row.author_id,
+            author_username=row.username,
+            author_display=row.display,
+            replies=[],
+            replies_cursor=replies_cursor,
+        )
+        depth = node.level - base_level
+        del ancestors[depth:]
+        if ancestors:
+            ancestors[-1].replies.append(node)
+        else:
+            roots.append(node)
+        ancestors.append(node)
+    return roots
+
+
+def _get_keyset_filter(cursor: pagination.Cursor):
+    try:
+        thread_at, path = cursor.values
+        thread_at = datetime.datetime.fromisoformat(thread_at)
+        path = str(path)
+    except (TypeError, ValueError):
+        raise exceptions.InvalidCursor("Cursor is invalid.")
+
+    Comment = comment_models.Comment
+    # As with blogs, compare against the stored timestamp of the anchoring
+    # comment where it still exists, falling back to the cursor's copy
+    anchor = sql.func.coalesce(
+        db.session.query(Comment.thread_at)
+        .filter(Comment.path == path)
+        .as_scalar(),
+        thread_at,
+    )
+    if cursor.direction == pagination.DIRECTION_PREV:
+        return sql.or_(
+            Comment.thread_at > anchor,
+            sql.and_(Comment.thread_at == anchor, Comment.path < path),
+        )
+    return sql.or_(
+        Comment.thread_at < anchor,
+        sql.and_(Comment.thread_at == anchor, Comment.path > path),
+    )
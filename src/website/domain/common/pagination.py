@@ -0,0 +1,105 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import base64
+import binascii
+import json
+from typing import Any, List, NamedTuple, Optional
+
+from website.domain import exceptions
+
+DIRECTION_NEXT = "next"
+DIRECTION_PREV = "prev"
+
+
+class Cursor(NamedTuple):
+    """
+    Decoded keyset cursor. `values` holds the sort key of the row the page
+    starts after (or before, when `direction` is `DIRECTION_PREV`).
+    """
+
+    direction: str
+    values: List[Any]
+
+
+class Page(NamedTuple):
+    """
+    A single page of results, with opaque cursors pointing at the adjacent
+    pages. A cursor is `None` when there is no page in that direction.
+    """
+
+    items: list
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def encode_cursor(direction: str, values: List[Any]) -> str:
+    """
+    Encode a keyset cursor into an opaque, URL-safe string.
+    """
+    payload = json.dumps([direction, values], default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Decode an opaque cursor created by `encode_cursor`.
+
+    Raises:
+        - `InvalidCursor` if the cursor cannot be decoded.
+    Returns:
+        - The decoded Cursor.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        direction, values = json.loads(payload.decode("utf-8"))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise exceptions.InvalidCursor("Cursor is invalid.")
+    if direction not in (DIRECTION_NEXT, DIRECTION_PREV) or not isinstance(
+        values, list
+    ):
+        raise exceptions.InvalidCursor("Cursor is invalid.")
+    return Cursor(direction=direction, values=values)
+
+
+def paginate(
+    rows: list, per_page: int, cursor: Optional[Cursor], key: Any,
+) -> Page:
+    """
+    Build a Page from rows fetched with a keyset query.
+
+    The rows must have been fetched with a limit of `per_page + 1`, so that
+    the extra row tells us whether another page exists. When paging backwards
+    the rows are expected in reverse order, and are flipped here.
+
+    Params:
+        `key` - Callable returning the list of sort key values for a row.
+    """
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    backwards = cursor is not None and cursor.direction == DIRECTION_PREV
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return Page(items=rows)
+
+    next_cursor = None
+    prev_cursor = None
+    if has_more or backwards:
+        next_cursor = encode_cursor(DIRECTION_NEXT, key(rows[-1]))
+    if (has_more and backwards) or (cursor is not None and not backwards):
+        prev_cursor = encode_cursor(DIRECTION_PREV, key(rows[0]))
+    return Page(items=rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
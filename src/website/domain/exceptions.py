@@ -51,6 +51,34 @@ class UnableToDelete(Exception):
     pass
 
 
+class TooBusy(Exception):
+    """
+    Exception for when the server is too busy to handle a request, which
+    should be retried after `retry_after` seconds.
+    """
+
+    retry_after: int = 5
+
+
+class RateLimited(Exception):
+    """
+    Exception for when a client has made too many requests, and should retry
+    after `retry_after` seconds.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InvalidCursor(Exception):
+    """
+    Exception for when a pagination cursor cannot be decoded.
+    """
+
+    pass
+
+
 ####################
 # Account exceptions
 ####################
@@ -15,11 +15,14 @@
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import wtforms
+from sqlalchemy import orm
 
 from website import admin, db
 from website.data.blogs import models as blog_models
 from website.data.categories import models as category_models
 from website.domain import utils
+from website.domain.blogs import queries as blog_queries
+from website.domain.blogs import search as blog_search
 from website.interfaces.admin import base
 
 
@@ -30,10 +33,19 @@ class BlogModelView(base.ModelView):
     column_searchable_list = ["title", "description"]
     column_exclude_list = ["body"]
     column_filters = ["published"]
-    form_excluded_columns = ["slug"]
+    # The comment count is maintained by `Comment.new` and `Comment.delete`
+    form_excluded_columns = ["slug", "archive_entry", "comment_count"]
     form_overrides = dict(slug=wtforms.StringField)
     page_size = 50
 
+    def get_query(self):
+        # The body is excluded from the list view, so don't load it
+        options = [
+            orm.defer(column)
+            for column in blog_queries.LISTING_DEFERRED_COLUMNS
+        ]
+        return super().get_query().options(*options)
+
     def on_model_change(self, form, model, is_created):
         if is_created:
             # Required as we're querying the database
@@ -44,6 +56,16 @@ class BlogModelView(base.ModelView):
                 )
             model.slug = slug
 
+    def after_model_change(self, form, model, is_created):
+        # Keep the archive in step with changes made through the admin
+        blog_models.ArchiveEntry.sync(blog=model)
+        blog_search.index_blog(blog=model)
+        db.session.commit()
+        blog_queries.clear_rss_cache()
+
+    def on_model_delete(self, model):
+        blog_search.remove_blog(blog=model)
+
 
 class CategoryModelView(base.ModelView):
     column_default_sort = ("created_at", True)
@@ -23,6 +23,7 @@ from werkzeug import exceptions as werkzeug_exceptions
 from werkzeug import http as werkzeug_http
 
 from website.domain import exceptions
+from website.domain.common import pagination
 
 
 class Api(flask_restx.Api):
@@ -59,6 +60,17 @@ class Api(flask_restx.Api):
                 flask.jsonify(dict(message=str(error))),
                 http.HTTPStatus.NOT_FOUND,
             )
+        if isinstance(error, exceptions.TooBusy):
+            return (
+                flask.jsonify(dict(message=str(error))),
+                http.HTTPStatus.SERVICE_UNAVAILABLE,
+                {"Retry-After": str(error.retry_after)},
+            )
+        if isinstance(error, exceptions.InvalidCursor):
+            return (
+                flask.jsonify(dict(message=str(error))),
+                http.HTTPStatus.BAD_REQUEST,
+            )
         # Handle marshmallow exceptions
         if isinstance(error, marshmallow_exceptions.ValidationError):
             return (
@@ -77,3 +89,26 @@ class Api(flask_restx.Api):
             )
         # Handle application specific custom exceptions
         return flask.jsonify(**error.kwargs), error.http_status_code
+
+
+def get_pagination_headers(page: pagination.Page) -> dict:
+    """
+    Return a `Link` header pointing at the pages adjacent to `page`, using the
+    endpoint, view arguments and query string of the current request.
+    """
+    arguments = dict(flask.request.args.to_dict(), **flask.request.view_args)
+    links = []
+    for rel, cursor in (
+        ("next", page.next_cursor),
+        ("prev", page.prev_cursor),
+    ):
+        if cursor:
+            url = flask.url_for(
+                flask.request.endpoint,
+                _external=True,
+                **dict(arguments, cursor=cursor),
+            )
+            links.append(f'<{url}>; rel="{rel}"')
+    if not links:
+        return dict()
+    return {"Link": ", ".join(links)}
@@ -22,7 +22,7 @@ import flask_restx
 from flask import request
 from flask_restx import fields
 
-from website import decorators
+from website import authorisation, decorators
 from website.domain.accounts import operations, queries
 from website.interfaces import api
 from website.interfaces.api.accounts import serializers
@@ -52,7 +52,7 @@ class AccountDetail(flask_restx.Resource):
     @api_accounts.expect(account_marshaller)
     def put(self, id: int):
         account = queries.get_account(id=id)
-        flask_bouncer.ensure(action=flask_bouncer.EDIT, subject=account)
+        authorisation.ensure(action=flask_bouncer.EDIT, subject=account)
         payload = request.get_json(force=True)
         data = self.serializer.load(data=payload)
         operations.update_account(account=account, **data)
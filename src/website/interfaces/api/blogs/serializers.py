@@ -35,6 +35,7 @@ class Blog(marshmallow.SQLAlchemyAutoSchema):  # type: ignore
     updated_at = marshmallow.auto_field(dump_only=True)
     author = marshmallow.auto_field(dump_only=True)
     categories = marshmallow.auto_field()
+    comment_count = marshmallow.auto_field(dump_only=True)
 
     class Meta:
         fields = (
@@ -48,5 +49,6 @@ class Blog(marshmallow.SQLAlchemyAutoSchema):  # type: ignore
             "updated_at",
             "author",
             "categories",
+            "comment_count",
         )
         model = models.Blog
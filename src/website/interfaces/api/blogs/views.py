@@ -23,9 +23,9 @@ import flask_restx
 from flask import request
 from flask_restx import fields
 
-from website import decorators
+from website import authorisation, decorators
 from website.data.blogs import models
-from website.domain.blogs import operations, queries
+from website.domain.blogs import operations, queries, search
 from website.interfaces import api
 from website.interfaces.api.blogs import serializers
 
@@ -60,15 +60,15 @@ class BlogDetail(flask_restx.Resource):
     @decorators.api_login_required
     def delete(self, id: int):
         blog = queries.get_blog(id=id)
-        flask_bouncer.ensure(action=flask_bouncer.DELETE, subject=blog)
-        blog.delete()
+        authorisation.ensure(action=flask_bouncer.DELETE, subject=blog)
+        operations.delete_blog(blog=blog)
         return dict(), http.HTTPStatus.NO_CONTENT
 
     @decorators.api_login_required
     @api_blogs.expect(blog_marshaller)
     def put(self, id: int):
         blog = queries.get_blog(id=id)
-        flask_bouncer.ensure(action=flask_bouncer.EDIT, subject=blog)
+        authorisation.ensure(action=flask_bouncer.EDIT, subject=blog)
         payload = request.get_json(force=True)
         data = self.serializer.load(data=payload)
         operations.update_blog(blog=blog, **data)
@@ -79,16 +79,22 @@ class BlogList(flask_restx.Resource):
     serializer = serializers.Blog()
 
     def get(self):
-        blogs = queries.get_blogs(published=True)
+        page = queries.get_blogs_page(
+            published=True,
+            cursor=request.args.get("cursor"),
+            load_author=queries.LOAD_JOINED,
+            load_categories=queries.LOAD_SELECTIN,
+        )
         return (
-            self.serializer.dump(obj=blogs, many=True),
+            self.serializer.dump(obj=page.items, many=True),
             http.HTTPStatus.OK,
+            api.get_pagination_headers(page=page),
         )
 
     @decorators.api_login_required
     @api_blogs.expect(blog_marshaller)
     def post(self):
-        flask_bouncer.ensure(action=flask_bouncer.CREATE, subject=models.Blog)
+        authorisation.ensure(action=flask_bouncer.CREATE, subject=models.Blog)
         payload = request.get_json(force=True)
         data = self.serializer.load(data=payload)
         data["author"] = flask_login.current_user
@@ -96,5 +102,22 @@ class BlogList(flask_restx.Resource):
         return self.serializer.dump(obj=blog), http.HTTPStatus.CREATED
 
 
+class BlogSearch(flask_restx.Resource):
+    serializer = serializers.Blog()
+
+    def get(self):
+        page = search.search_blogs(
+            query=request.args.get("q", ""),
+            published=True,
+            cursor=request.args.get("cursor"),
+        )
+        return (
+            self.serializer.dump(obj=page.items, many=True),
+            http.HTTPStatus.OK,
+            api.get_pagination_headers(page=page),
+        )
+
+
 api_blogs.add_resource(BlogDetail, "/<int:id>")
 api_blogs.add_resource(BlogList, "/list")
+api_blogs.add_resource(BlogSearch, "/search")
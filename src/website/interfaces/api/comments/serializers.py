@@ -14,6 +14,8 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+from marshmallow import fields
+
 from website import marshmallow
 from website.data.comments import models
 
@@ -34,6 +36,7 @@ class Comment(marshmallow.SQLAlchemyAutoSchema):  # type: ignore
     blog = marshmallow.auto_field(dump_only=True)
     parent = marshmallow.auto_field(dump_only=True)
     replies = marshmallow.auto_field(dump_only=True)
+    reply_count = marshmallow.auto_field(dump_only=True)
 
     class Meta:
         fields = (
@@ -47,5 +50,25 @@ class Comment(marshmallow.SQLAlchemyAutoSchema):  # type: ignore
             "blog",
             "parent",
             "replies",
+            "reply_count",
         )
         model = models.Comment
+
+
+class CommentNode(marshmallow.Schema):  # type: ignore
+    """
+    Schema for a CommentNode of a comment tree, with its replies nested
+    within it. Comment trees are read-only.
+    """
+
+    id = fields.Integer(dump_only=True)
+    body = fields.String(dump_only=True)
+    path = fields.String(dump_only=True)
+    level = fields.Integer(dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
+    thread_at = fields.DateTime(dump_only=True)
+    parent = fields.Integer(attribute="parent_id", dump_only=True)
+    author = fields.Integer(attribute="author_id", dump_only=True)
+    replies = fields.List(fields.Nested("self"), dump_only=True)
+    replies_cursor = fields.String(dump_only=True)
@@ -24,7 +24,7 @@ import flask_restx
 from flask import request
 from flask_restx import fields
 
-from website import decorators
+from website import authorisation, decorators
 from website.data.comments import models as models
 from website.domain.blogs import queries as blog_queries
 from website.domain.comments import operations, queries
@@ -55,7 +55,7 @@ class CommentDetail(flask_restx.Resource):
     @decorators.api_login_required
     def delete(self, id: int):
         comment = queries.get_comment(id=id)
-        flask_bouncer.ensure(action=flask_bouncer.DELETE, subject=comment)
+        authorisation.ensure(action=flask_bouncer.DELETE, subject=comment)
         comment.delete()
         return dict(), http.HTTPStatus.NO_CONTENT
 
@@ -63,7 +63,7 @@ class CommentDetail(flask_restx.Resource):
     @api_comments.expect(comment_marshaller)
     def put(self, id: int):
         comment = queries.get_comment(id=id)
-        flask_bouncer.ensure(action=flask_bouncer.EDIT, subject=comment)
+        authorisation.ensure(action=flask_bouncer.EDIT, subject=comment)
         payload = request.get_json(force=True)
         data = self.serializer.load(data=payload)
         operations.update_comment(comment=comment, **data)
@@ -72,6 +72,7 @@ class CommentDetail(flask_restx.Resource):
 
 class CommentList(flask_restx.Resource):
     serializer = serializers.Comment()
+    thread_serializer = serializers.CommentNode()
 
     def get(
         self, blog_id: Optional[int] = None, parent_id: Optional[int] = None
@@ -81,10 +82,15 @@ class CommentList(flask_restx.Resource):
             kwargs["blog"] = blog_queries.get_blog(id=blog_id)
         elif parent_id:
             kwargs["parent"] = queries.get_comment(id=parent_id)
-        comments = queries.get_comments(**kwargs)
+        page = queries.get_comment_threads_page(
+            cursor=request.args.get("cursor"),
+            max_depth=request.args.get("max_depth", type=int),
+            **kwargs,
+        )
         return (
-            self.serializer.dump(obj=comments, many=True),
+            self.thread_serializer.dump(obj=page.items, many=True),
             http.HTTPStatus.OK,
+            api.get_pagination_headers(page=page),
         )
 
     @decorators.api_login_required
@@ -92,7 +98,7 @@ class CommentList(flask_restx.Resource):
     def post(
         self, blog_id: Optional[int] = None, parent_id: Optional[int] = None
     ):
-        flask_bouncer.ensure(
+        authorisation.ensure(
             action=flask_bouncer.CREATE, subject=models.Comment
         )
         payload = request.get_json(force=True)
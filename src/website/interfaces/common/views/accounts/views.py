@@ -18,12 +18,13 @@ import flask
 import flask_bouncer
 import flask_login
 
-from website import decorators
+from website import authorisation, decorators, ratelimit
 from website.comms import dispatch
 from website.domain import exceptions
 from website.domain.accounts import operations, queries, utils
 from website.domain.blogs import queries as blog_queries
 from website.interfaces.common.forms.accounts import forms
+from website.interfaces.common.views import utils as views_utils
 
 accounts = flask.Blueprint(
     name="accounts", import_name=__name__, url_prefix="/account"
@@ -36,17 +37,37 @@ def display(username: str):
         account = queries.get_account(username=username)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    blogs = blog_queries.get_blogs(author=account, published=True)
+    try:
+        page = blog_queries.get_blogs_page(
+            author=account,
+            published=True,
+            cursor=flask.request.args.get("cursor"),
+            listing=True,
+            load_author=blog_queries.LOAD_JOINED,
+            load_categories=blog_queries.LOAD_SELECTIN,
+        )
+    except exceptions.InvalidCursor:
+        flask.abort(status=404)
     context = {
         "title": account.display,
         "account": account,
-        "blogs": blogs,
+        "blogs": page.items,
+        "page": page,
     }
     return flask.render_template(
         template_name_or_list="accounts/display.html", **context
     )
 
 
+@accounts.route(rule="/<string:username>/rss")
+def rss(username: str):
+    try:
+        account = queries.get_account(username=username)
+    except exceptions.DoesNotExist:
+        flask.abort(status=404)
+    return views_utils.make_rss_response(author=account, published=True)
+
+
 @accounts.route(rule="/<string:username>/edit", methods=["GET", "POST"])
 @flask_login.login_required
 def edit(username: str):
@@ -54,7 +75,7 @@ def edit(username: str):
         account = queries.get_account(username=username)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    flask_bouncer.ensure(action=flask_bouncer.EDIT, subject=account)
+    authorisation.ensure(action=flask_bouncer.EDIT, subject=account)
     form = forms.Edit(obj=account)
     if form.validate_on_submit():
         try:
@@ -92,7 +113,7 @@ def delete(username: str):
         account = queries.get_account(username=username)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    flask_bouncer.ensure(action=flask_bouncer.DELETE, subject=account)
+    authorisation.ensure(action=flask_bouncer.DELETE, subject=account)
     form = forms.Delete()
     if form.validate_on_submit():
         try:
@@ -217,12 +238,16 @@ def logout():
 def request_confirm_email():
     form = forms.EmailRequest()
     if form.validate_on_submit():
+        ratelimit.check(
+            name="email_client", key=ratelimit.get_client_address()
+        )
         try:
             account = queries.get_account(email=form.email.data)
         except exceptions.DoesNotExist:
             flask.flash(message="This email does not exist.", category="error")
         else:
             if not account.is_confirmed:
+                ratelimit.check(name="email_recipient", key=account.email)
                 flask.flash(
                     message="Confirmation email has been sent.",
                     category="success",
@@ -262,11 +287,15 @@ def confirm_email(token: str):
 def request_reset_password():
     form = forms.EmailRequest()
     if form.validate_on_submit():
+        ratelimit.check(
+            name="email_client", key=ratelimit.get_client_address()
+        )
         try:
             account = queries.get_account(email=form.email.data)
         except exceptions.DoesNotExist:
             flask.flash(message="This email does not exist.", category="error")
         else:
+            ratelimit.check(name="email_recipient", key=account.email)
             flask.flash(
                 message="Reset password email has been sent.",
                 category="success",
@@ -294,7 +323,17 @@ def reset_password(token: str):
         )
     form = forms.ResetPassword()
     if form.validate_on_submit():
-        account.update(password=form.password.data)
+        try:
+            operations.update_account(
+                account=account, password=form.password.data
+            )
+        except exceptions.UnableToUpdate:
+            flask.flash(message="Unable to reset password.", category="error")
+            return flask.redirect(
+                location=flask.url_for(
+                    endpoint="accounts.reset_password", token=token
+                )
+            )
         flask.flash(message="Password has been reset.", category="success")
         return flask.redirect(
             location=flask.url_for(endpoint="accounts.login")
@@ -19,10 +19,13 @@ import flask
 import flask_bouncer
 import flask_login
 
+from website import authorisation
 from website.data.blogs import models as blog_models
 from website.data.categories import models as category_models
 from website.domain import exceptions
 from website.domain.blogs import operations, queries
+from website.domain.comments import queries as comment_queries
+from website.domain.common import pagination
 from website.interfaces import constants
 from website.interfaces.common.forms.blogs import forms
 
@@ -34,11 +37,37 @@ blogs = flask.Blueprint(
 @blogs.route(rule="/<string:slug>")
 def display(slug: str):
     try:
-        blog = queries.get_blog(slug=slug)
+        blog = queries.get_blog(
+            slug=slug,
+            load_author=queries.LOAD_JOINED,
+            load_categories=queries.LOAD_SELECTIN,
+        )
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    flask_bouncer.ensure(action=flask_bouncer.READ, subject=blog)
-    context = {"title": blog.title, "blog": blog}
+    authorisation.ensure(action=flask_bouncer.READ, subject=blog)
+    page = pagination.Page(items=[])
+    if blog.comment:
+        # Deep threads are continued from the comment they were cut off at
+        parent = None
+        parent_id = flask.request.args.get("parent", type=int)
+        try:
+            if parent_id is not None:
+                parent = comment_queries.get_comment(id=parent_id)
+                if parent.blog_id != blog.id:
+                    flask.abort(status=404)
+            page = comment_queries.get_comment_threads_page(
+                blog=blog,
+                parent=parent,
+                cursor=flask.request.args.get("cursor"),
+            )
+        except (exceptions.DoesNotExist, exceptions.InvalidCursor):
+            flask.abort(status=404)
+    context = {
+        "title": blog.title,
+        "blog": blog,
+        "comments": page.items,
+        "page": page,
+    }
     return flask.render_template(
         template_name_or_list="blogs/display.html", **context
     )
@@ -46,7 +75,7 @@ def display(slug: str):
 
 @blogs.route(rule="/create", methods=["GET", "POST"])
 @flask_login.login_required
-@flask_bouncer.requires(action=flask_bouncer.CREATE, subject=blog_models.Blog)
+@authorisation.requires(action=flask_bouncer.CREATE, subject=blog_models.Blog)
 def create():
     form = forms.Create()
     form.categories.query = category_models.Category.query.all()
@@ -88,7 +117,7 @@ def edit(slug: str):
         blog = queries.get_blog(slug=slug)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    flask_bouncer.ensure(action=flask_bouncer.EDIT, subject=blog)
+    authorisation.ensure(action=flask_bouncer.EDIT, subject=blog)
     form = forms.Edit(obj=blog)
     form.categories.query = category_models.Category.query.all()
     if form.validate_on_submit():
@@ -129,7 +158,7 @@ def delete(slug: str):
         blog = queries.get_blog(slug=slug)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    flask_bouncer.ensure(action=flask_bouncer.DELETE, subject=blog)
+    authorisation.ensure(action=flask_bouncer.DELETE, subject=blog)
     form = forms.Delete()
     if form.validate_on_submit():
         try:
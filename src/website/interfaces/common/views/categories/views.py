@@ -18,11 +18,13 @@ import flask
 import flask_bouncer
 import flask_login
 
+from website import authorisation
 from website.data.categories import models
 from website.domain import exceptions
 from website.domain.blogs import queries as blog_queries
 from website.domain.categories import operations, queries
 from website.interfaces.common.forms.categories import forms
+from website.interfaces.common.views import utils
 
 categories = flask.Blueprint(
     name="categories", import_name=__name__, url_prefix="/categories"
@@ -35,20 +37,40 @@ def display(slug: str):
         category = queries.get_category(slug=slug)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    blogs = blog_queries.get_blogs(category=category, published=True)
+    try:
+        page = blog_queries.get_blogs_page(
+            category=category,
+            published=True,
+            cursor=flask.request.args.get("cursor"),
+            listing=True,
+            load_author=blog_queries.LOAD_JOINED,
+            load_categories=blog_queries.LOAD_SELECTIN,
+        )
+    except exceptions.InvalidCursor:
+        flask.abort(status=404)
     context = {
         "title": category.title,
         "category": category,
-        "blogs": blogs,
+        "blogs": page.items,
+        "page": page,
     }
     return flask.render_template(
         template_name_or_list="categories/display.html", **context
     )
 
 
+@categories.route(rule="/<string:slug>/rss")
+def rss(slug: str):
+    try:
+        category = queries.get_category(slug=slug)
+    except exceptions.DoesNotExist:
+        flask.abort(status=404)
+    return utils.make_rss_response(category=category, published=True)
+
+
 @categories.route(rule="/create", methods=["GET", "POST"])
 @flask_login.login_required
-@flask_bouncer.requires(action=flask_bouncer.CREATE, subject=models.Category)
+@authorisation.requires(action=flask_bouncer.CREATE, subject=models.Category)
 def create():
     form = forms.Create()
     if form.validate_on_submit():
@@ -81,7 +103,7 @@ def edit(slug: str):
         category = queries.get_category(slug=slug)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    flask_bouncer.ensure(action=flask_bouncer.EDIT, subject=category)
+    authorisation.ensure(action=flask_bouncer.EDIT, subject=category)
     form = forms.Edit(obj=category)
     if form.validate_on_submit():
         try:
@@ -117,7 +139,7 @@ def delete(slug: str):
         category = queries.get_category(slug=slug)
     except exceptions.DoesNotExist:
         flask.abort(status=404)
-    flask_bouncer.ensure(action=flask_bouncer.DELETE, subject=category)
+    authorisation.ensure(action=flask_bouncer.DELETE, subject=category)
     form = forms.Delete()
     if form.validate_on_submit():
         try:
@@ -0,0 +1,144 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import datetime
+from typing import Optional, Union
+
+import flask
+import pytz
+from werkzeug import http
+
+from website.data.accounts import models as account_models
+from website.data.categories import models as category_models
+from website.domain.blogs import queries as blog_queries
+
+
+def make_rss_response(
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+) -> flask.Response:
+    """
+    Build a conditional RSS response for the provided keyword arguments.
+
+    The feed is only generated when the client's copy is out of date,
+    otherwise an empty `304 Not Modified` response is returned. The
+    `max_items` and `full_content` query string arguments can be used to
+    narrow the feed. When the `FEED_STREAMING` setting is enabled, the feed
+    is streamed rather than generated and cached in full.
+
+    Params:
+        `author` - Only blogs with this author will be included.
+        `category` - Only blogs with this category will be included.
+        `published` - Whether to include published or unpublished blogs.
+
+    Returns:
+        - The RSS response.
+    """
+    filters = dict(author=author, category=category, published=published)
+    feed_options = _get_feed_options()
+    version = blog_queries.get_rss_version(**filters, **feed_options)
+    etag = version.etag
+    last_modified = _to_naive_utc(value=version.last_modified)
+    if not _is_modified(etag=etag, last_modified=last_modified):
+        response = flask.make_response("", 304)
+    elif flask.current_app.config["FEED_STREAMING"]:
+        rss = blog_queries.stream_rss_blogs(**filters, **feed_options)
+        response = flask.Response(
+            flask.stream_with_context(rss), content_type="application/rss+xml"
+        )
+    else:
+        rss = blog_queries.get_rss_blogs(
+            **filters, **feed_options, version=version
+        )
+        response = flask.make_response(rss)
+        response.headers.set("Content-Type", "application/rss+xml")
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    return response
+
+
+def make_atom_response(
+    author: Optional[Union[account_models.Account, int]] = None,
+    category: Optional[category_models.Category] = None,
+    published: Optional[bool] = None,
+) -> flask.Response:
+    """
+    Build a conditional, streamed Atom response for the provided keyword
+    arguments. See `make_rss_response`.
+
+    Params:
+        `author` - Only blogs with this author will be included.
+        `category` - Only blogs with this category will be included.
+        `published` - Whether to include published or unpublished blogs.
+
+    Returns:
+        - The Atom response.
+    """
+    filters = dict(author=author, category=category, published=published)
+    feed_options = _get_feed_options()
+    version = blog_queries.get_rss_version(**filters, **feed_options)
+    # The Atom and RSS representations of a feed need different validators
+    etag = f"{version.etag}-atom"
+    last_modified = _to_naive_utc(value=version.last_modified)
+    if not _is_modified(etag=etag, last_modified=last_modified):
+        response = flask.make_response("", 304)
+    else:
+        atom = blog_queries.stream_atom_blogs(**filters, **feed_options)
+        response = flask.Response(
+            flask.stream_with_context(atom),
+            content_type="application/atom+xml",
+        )
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    return response
+
+
+def _get_feed_options() -> dict:
+    return dict(
+        max_items=flask.request.args.get(key="max_items", type=int),
+        full_content=flask.request.args.get(
+            key="full_content", type=_parse_bool
+        ),
+    )
+
+
+def _is_modified(
+    etag: str, last_modified: Optional[datetime.datetime]
+) -> bool:
+    return http.is_resource_modified(
+        environ=flask.request.environ, etag=etag, last_modified=last_modified
+    )
+
+
+def _to_naive_utc(
+    value: Optional[datetime.datetime],
+) -> Optional[datetime.datetime]:
+    # Werkzeug compares against naive UTC dates parsed from the request, but
+    # PostgreSQL returns timezone aware ones
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(tz=pytz.utc).replace(tzinfo=None)
+
+
+def _parse_bool(value: str) -> bool:
+    value = value.lower()
+    if value in ("1", "true", "yes"):
+        return True
+    if value in ("0", "false", "no"):
+        return False
+    raise ValueError(f"Invalid boolean: {value}")
@@ -14,35 +14,70 @@
 #   You should have received a copy of the GNU Affero General Public License
 #   along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-import datetime
-
 import flask
 import flask_bouncer
 import flask_login
-import pytz
 
+from website import authorisation, ratelimit
 from website.comms import dispatch
 from website.data.blogs import models as blog_models
 from website.data.categories import models as category_models
+from website.domain import exceptions
+from website.domain.accounts import operations as account_operations
 from website.domain.blogs import queries as blog_queries
+from website.domain.blogs import search as blog_search
 from website.domain.categories import queries as category_queries
 from website.interfaces.common.forms.main import forms
+from website.interfaces.common.views import utils
 
 main = flask.Blueprint(name="main", import_name=__name__)
 
 
 @main.route(rule="/")
 def landing():
-    blogs = blog_queries.get_blogs(published=True)
+    try:
+        page = blog_queries.get_blogs_page(
+            published=True,
+            cursor=flask.request.args.get("cursor"),
+            listing=True,
+            load_author=blog_queries.LOAD_JOINED,
+            load_categories=blog_queries.LOAD_SELECTIN,
+        )
+    except exceptions.InvalidCursor:
+        flask.abort(status=404)
     context = {
         "title": "Blog",
-        "blogs": blogs,
+        "blogs": page.items,
+        "page": page,
     }
     return flask.render_template(
         template_name_or_list="main/landing.html", **context
     )
 
 
+@main.route(rule="/search")
+def search():
+    query = flask.request.args.get("q", "")
+    try:
+        page = blog_search.search_blogs(
+            query=query,
+            published=True,
+            cursor=flask.request.args.get("cursor"),
+            listing=True,
+        )
+    except exceptions.InvalidCursor:
+        flask.abort(status=404)
+    context = {
+        "title": "Search",
+        "query": query,
+        "blogs": page.items,
+        "page": page,
+    }
+    return flask.render_template(
+        template_name_or_list="main/search.html", **context
+    )
+
+
 @main.route(rule="/about")
 def about():
     context = {"title": "About"}
@@ -69,6 +104,13 @@ def archive():
 def contact():
     form = forms.Contact()
     if form.validate_on_submit():
+        ratelimit.check(
+            name="email_client", key=ratelimit.get_client_address()
+        )
+        ratelimit.check(
+            name="contact_recipient",
+            key=flask.current_app.config["CONTACT_ADDRESS"],
+        )
         flask.flash(message="Your enquiry has been sent.", category="success")
         dispatch.send_contact_email(
             email=form.email.data,
@@ -84,10 +126,12 @@ def contact():
 
 @main.route(rule="/rss")
 def rss():
-    blogs = blog_queries.get_rss_blogs(published=True)
-    response = flask.make_response(blogs)
-    response.headers.set("Content-Type", "application/rss+xml")
-    return response
+    return utils.make_rss_response(published=True)
+
+
+@main.route(rule="/atom")
+def atom():
+    return utils.make_atom_response(published=True)
 
 
 ##################
@@ -99,12 +143,12 @@ def rss():
 def context_processor():
     actions = {
         "blogs": {
-            "create": flask_bouncer.can(
+            "create": authorisation.can(
                 action=flask_bouncer.CREATE, subject=blog_models.Blog
             )
         },
         "categories": {
-            "create": flask_bouncer.can(
+            "create": authorisation.can(
                 action=flask_bouncer.CREATE, subject=category_models.Category
             )
         },
@@ -121,9 +165,11 @@ def context_processor():
 def before_request():
     account = flask_login.current_user
     if account.is_authenticated:
-        # TODO: Find a way to update this field, without updating the
-        # updated_at field
-        account.update(seen_at=datetime.datetime.now(tz=pytz.utc))
+        try:
+            account_operations.mark_account_seen(account=account)
+        except exceptions.UnableToUpdate:
+            # Missing a visit isn't worth failing the request over
+            pass
 
 
 ################
@@ -159,6 +205,36 @@ def permission_denied(error):
     )
 
 
+@main.app_errorhandler(exceptions.TooBusy)
+def too_busy(error):
+    context = {
+        "title": "Server busy",
+        "message": "The server is busy right now. Please try again shortly.",
+    }
+    return (
+        flask.render_template(
+            template_name_or_list="main/error.html", **context
+        ),
+        503,
+        {"Retry-After": str(error.retry_after)},
+    )
+
+
+@main.app_errorhandler(exceptions.RateLimited)
+def rate_limited(error):
+    context = {
+        "title": "Too many requests",
+        "message": "You have made too many requests. Please try again later.",
+    }
+    return (
+        flask.render_template(
+            template_name_or_list="main/error.html", **context
+        ),
+        429,
+        {"Retry-After": str(error.retry_after)},
+    )
+
+
 @main.app_errorhandler(code=500)
 def internal_server_error(error):
     context = {
@@ -0,0 +1,33 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import flask
+
+from website.interfaces.management.systemjobs.commands import (
+    calibrate_password_hashing,
+    deliver_outbox,
+    rebuild_blog_archive,
+    rebuild_search_index,
+    recount_comments,
+)
+
+systemjob = flask.Blueprint(name="systemjob", import_name=__name__)
+
+systemjob.cli.add_command(calibrate_password_hashing.command)
+systemjob.cli.add_command(deliver_outbox.command)
+systemjob.cli.add_command(rebuild_blog_archive.command)
+systemjob.cli.add_command(rebuild_search_index.command)
+systemjob.cli.add_command(recount_comments.command)
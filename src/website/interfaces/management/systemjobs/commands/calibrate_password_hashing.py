@@ -0,0 +1,79 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import time
+
+import click
+from flask import cli
+from werkzeug import security
+
+from website.data.accounts import models
+
+# Number of iterations hashed to measure the time taken by one iteration
+PROBE_ITERATIONS: int = 100000
+
+
+@click.command(name="calibrate_password_hashing")
+@click.option(
+    "--target-ms",
+    default=250,
+    type=click.IntRange(min=1),
+    help="Time a single password hash should take, in milliseconds",
+)
+@click.option(
+    "--rounds",
+    default=3,
+    type=click.IntRange(min=1),
+    help="Number of measurements, of which the fastest is used",
+)
+@cli.with_appcontext
+def command(target_ms: int, rounds: int):
+    """
+    Measure how long password hashing takes on this host, and suggest the
+    `PASSWORD_HASH_ITERATIONS` which takes about `--target-ms` per hash.
+    """
+    method: str = models.get_hash_method()
+    print(f"Configured: {method} takes {_measure(method, rounds):.1f}ms.")
+    if not method.startswith("pbkdf2:"):
+        print("Only PBKDF2 methods can be calibrated.")
+        return
+
+    base_method = method.rsplit(":", 1)[0]
+    probe_method = models.get_hash_method(
+        method=base_method, iterations=PROBE_ITERATIONS
+    )
+    per_iteration = _measure(probe_method, rounds) / PROBE_ITERATIONS
+    iterations = int(target_ms / per_iteration)
+    suggested = models.get_hash_method(
+        method=base_method, iterations=iterations
+    )
+    print(
+        f"Suggested: PASSWORD_HASH_ITERATIONS={iterations} "
+        f"({suggested} takes {_measure(suggested, rounds):.1f}ms)."
+    )
+
+
+def _measure(method: str, rounds: int) -> float:
+    """
+    Return the fastest time taken to hash a password, in milliseconds.
+    """
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        security.generate_password_hash(password="calibration", method=method)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
@@ -0,0 +1,73 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import signal
+import threading
+
+import click
+import flask
+from flask import cli
+
+from website.comms import delivery
+
+
+@click.command(name="deliver_outbox")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Emails to claim at a time, defaults to `MAIL_BATCH_SIZE`.",
+)
+@click.option(
+    "--once",
+    is_flag=True,
+    default=False,
+    help="Exit once the outbox is empty, rather than polling it.",
+)
+@cli.with_appcontext
+def command(batch_size, once):
+    """
+    Send the emails waiting in the outbox, in batches. Several workers can
+    run at once, as each batch is claimed for `MAIL_LEASE` seconds.
+
+    SIGTERM and SIGINT stop the worker once its current batch is finished.
+    """
+    poll_interval = flask.current_app.config["MAIL_POLL_INTERVAL"]
+    stopping = threading.Event()
+
+    def stop(signum, frame):
+        stopping.set()
+
+    handlers = {
+        signum: signal.signal(signum, stop)
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    sent, failed = 0, 0
+    try:
+        while not stopping.is_set():
+            result = delivery.deliver_outbox(batch_size=batch_size)
+            sent += result.sent
+            failed += result.failed
+            if result.sent or result.failed:
+                continue
+            if once:
+                break
+            stopping.wait(timeout=poll_interval)
+    finally:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+    print(f"Sent {sent} emails, {failed} failed.")
@@ -0,0 +1,32 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import click
+from flask import cli
+
+from website.data.comments import models
+
+
+@click.command(name="recount_comments")
+@cli.with_appcontext
+def command():
+    """
+    Recompute the comment counts of blogs and the reply counts of comments.
+    """
+    models.Comment.recount()
+    comments: int = models.Comment.query.count()
+    print(f"Recounted {comments} comments.")
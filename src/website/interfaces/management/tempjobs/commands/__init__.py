@@ -18,8 +18,10 @@ import flask
 
 from website.interfaces.management.tempjobs.commands import (
     backfill_blog_comment_field,
+    widen_comment_paths,
 )
 
 tempjob = flask.Blueprint(name="tempjob", import_name=__name__)
 
 tempjob.cli.add_command(backfill_blog_comment_field.command)
+tempjob.cli.add_command(widen_comment_paths.command)
@@ -0,0 +1,88 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import click
+from flask import cli
+from sqlalchemy import sql
+
+from website import db
+from website.data.comments import models
+
+
+@click.command(name="widen_comment_paths")
+@click.option(
+    "--batch-size",
+    default=1000,
+    type=click.IntRange(min=1),
+    help="Number of comments to rewrite per transaction",
+)
+@click.option(
+    "--after-id",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Resume after the comment with this id",
+)
+@click.option(
+    "--not-dry-run",
+    default=False,
+    is_flag=True,
+    help="Run this command for real",
+)
+@cli.with_appcontext
+def command(batch_size: int, after_id: int, not_dry_run: bool):
+    """
+    Re-pad the path of every comment to `COMMENT_PATH_DIGITS` wide.
+
+    Comments are walked in id order and each batch is committed on its own, so
+    rows are only locked for a short transaction at a time. The last id of
+    each batch is printed, and can be passed as `--after-id` to resume.
+    """
+    Comment = models.Comment
+    digits: int = models.get_path_digits()
+    table = Comment.__table__
+    # Rewriting the path isn't an update of the Comment
+    statement = (
+        table.update()
+        .where(table.c.id == sql.bindparam("comment_id"))
+        .values(path=sql.bindparam("new_path"), updated_at=table.c.updated_at)
+    )
+    verb = "Rewrote" if not_dry_run else "Would rewrite"
+    updated: int = 0
+    while True:
+        rows = (
+            db.session.query(Comment.id, Comment.path)
+            .filter(Comment.id > after_id)
+            .order_by(Comment.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        changes = []
+        for row in rows:
+            if row.path is None:
+                continue
+            new_path = models.widen_path(path=row.path, digits=digits)
+            if new_path != row.path:
+                changes.append({"comment_id": row.id, "new_path": new_path})
+        if changes and not_dry_run:
+            db.session.execute(statement, changes)
+        db.session.commit()
+        after_id = rows[-1].id
+        updated += len(changes)
+        print(f"{verb} {len(changes)} paths up to comment {after_id}.")
+    print(f"{verb} {updated} paths to {digits} digits.")
@@ -0,0 +1,195 @@
+#   Website
+#   Copyright © 2019-2020  scrub
+#
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU Affero General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#   GNU Affero General Public License for more details.
+#
+#   You should have received a copy of the GNU Affero General Public License
+#   along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import abc
+import functools
+import math
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+import flask
+from werkzeug import utils
+
+from website.data.common import cache
+from website.data.ratelimit import models as ratelimit_models
+from website.domain import exceptions
+
+
+class Limit(NamedTuple):
+    """
+    A token bucket holding up to `capacity` tokens, which refills completely
+    over `period` seconds.
+    """
+
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+class Backend(abc.ABC):
+    """
+    Stores token buckets. `RATELIMIT_BACKEND` is the import path of the
+    subclass to use, which must implement every abstract method to be
+    created.
+    """
+
+    def __init__(self, config: flask.Config):
+        pass
+
+    @abc.abstractmethod
+    def consume(self, key: str, limit: Limit) -> float:
+        """
+        Take a token from the bucket stored under `key`, which should be done
+        atomically.
+
+        Returns:
+            - `0` if a token was taken, otherwise how many seconds until the
+              bucket has one.
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """
+        Remove every bucket.
+        """
+
+
+class DatabaseBackend(Backend):
+    """
+    Stores buckets in the database, see `RateLimitBucket`, so that every
+    worker process shares them.
+    """
+
+    def __init__(
+        self, config: flask.Config, clock: Callable[[], float] = time.time
+    ):
+        # Wall clock time, as buckets are shared with other processes
+        self._clock = clock
+
+    def consume(self, key: str, limit: Limit) -> float:
+        return ratelimit_models.RateLimitBucket.consume(
+            key=key,
+            capacity=limit.capacity,
+            rate=limit.rate,
+            now=self._clock(),
+        )
+
+    def clear(self):
+        ratelimit_models.RateLimitBucket.clear()
+
+
+class MemoryBackend(Backend):
+    """
+    Stores up to `RATELIMIT_MEMORY_SIZE` buckets in the process, so each
+    worker process limits requests separately, for development and tests. A
+    bucket is dropped once it would have refilled, as a full bucket is the
+    same as a missing one.
+    """
+
+    def __init__(
+        self, config: flask.Config, clock: Callable[[], float] = time.monotonic
+    ):
+        self._clock = clock
+        self._buckets = cache.LRUCache(
+            max_size=config["RATELIMIT_MEMORY_SIZE"], clock=clock
+        )
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, limit: Limit) -> float:
+        with self._lock:
+            now = self._clock()
+            tokens = float(limit.capacity)
+            bucket = self._buckets.get(key=key)
+            if bucket is not None:
+                tokens, updated_at = bucket
+                tokens = min(
+                    limit.capacity, tokens + (now - updated_at) * limit.rate
+                )
+            if tokens < 1:
+                return (1 - tokens) / limit.rate
+            tokens -= 1
+            self._buckets.set(
+                key=key,
+                value=(tokens, now),
+                ttl=(limit.capacity - tokens) / limit.rate,
+            )
+            return 0
+
+    def clear(self):
+        self._buckets.clear()
+
+
+def init_app(app: flask.Flask):
+    """
+    Create the backend named by `RATELIMIT_BACKEND` for an application.
+    """
+    backend_class = utils.import_string(app.config["RATELIMIT_BACKEND"])
+    app.extensions["ratelimit"] = backend_class(config=app.config)
+
+
+def check(name: str, key: Optional[str]):
+    """
+    Take a token from the `name` bucket for `key`, limited by the
+    `RATELIMIT_<NAME>` setting. Without a `key`, such as an unset
+    `CONTACT_ADDRESS`, there is nothing to limit.
+
+    Raises:
+        - `RateLimited` if the bucket is empty.
+    """
+    config = flask.current_app.config
+    if not config["RATELIMIT_ENABLED"] or key is None:
+        return
+    limit = parse_limit(value=config[f"RATELIMIT_{name.upper()}"])
+    wait = flask.current_app.extensions["ratelimit"].consume(
+        key=f"{name}:{key.lower()}", limit=limit
+    )
+    if wait:
+        raise exceptions.RateLimited(
+            "Too many requests.", retry_after=math.ceil(wait)
+        )
+
+
+def get_client_address() -> str:
+    """
+    Return the address of the client making the request. When the website is
+    behind `RATELIMIT_PROXIES` proxies, this is taken from the address they
+    forwarded.
+    """
+    proxies = flask.current_app.config["RATELIMIT_PROXIES"]
+    route = flask.request.access_route
+    if proxies and len(route) >= proxies:
+        return route[-proxies]
+    return flask.request.remote_addr or ""
+
+
+@functools.lru_cache(maxsize=None)
+def parse_limit(value: str) -> Limit:
+    """
+    Parse a limit written as '<capacity>/<period in seconds>'.
+
+    Raises:
+        - `ValueError` if the limit is malformed.
+    """
+    capacity, period = value.split("/")
+    limit = Limit(capacity=int(capacity), period=float(period))
+    if limit.capacity < 1 or limit.period <= 0:
+        raise ValueError(f"Invalid rate limit '{value}'.")
+    return limit
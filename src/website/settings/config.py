@@ -80,6 +80,23 @@ class Base:
     MAIL_USERNAME = env_config(name="MAIL_USERNAME")
     MAIL_PASSWORD = env_config(name="MAIL_PASSWORD")
     MAIL_SENDER = env_config(name="MAIL_SENDER")
+    MAIL_DEFAULT_SENDER = env_config(name="MAIL_DEFAULT_SENDER")
+    # Emails are sent from the outbox table by `flask systemjob
+    # deliver_outbox`, see `comms.delivery`
+    MAIL_BATCH_SIZE = env_config(
+        name="MAIL_BATCH_SIZE", default=20, conversion=int
+    )
+    # Seconds a worker holds a batch before another worker may claim it
+    MAIL_LEASE = env_config(name="MAIL_LEASE", default=300, conversion=int)
+    MAIL_MAX_ATTEMPTS = env_config(
+        name="MAIL_MAX_ATTEMPTS", default=5, conversion=int
+    )
+    MAIL_RETRY_DELAY = env_config(
+        name="MAIL_RETRY_DELAY", default=60, conversion=int
+    )
+    MAIL_POLL_INTERVAL = env_config(
+        name="MAIL_POLL_INTERVAL", default=5, conversion=int
+    )
 
     ##################
     # Website settings
@@ -90,10 +107,89 @@ class Base:
     )
     MIGRATION_FOLDER = "src/website/data/migrations"
     ACCOUNT_ALWAYS_CONFIRMED = True
+    # Seconds before an Account's `seen_at` is written to again
+    ACCOUNT_SEEN_INTERVAL = env_config(
+        name="ACCOUNT_SEEN_INTERVAL", default=300, conversion=int
+    )
+    # Seconds an Account is cached for by the user loader, or 0 to disable.
+    # Each worker process has its own cache, and the others aren't told when
+    # an Account changes, so for up to this long they may still let a
+    # deleted Account stay logged in, or use its old details. Admins aren't
+    # cached, so losing admin rights takes effect at once.
+    ACCOUNT_CACHE_TTL = env_config(
+        name="ACCOUNT_CACHE_TTL", default=10, conversion=int
+    )
+    # Passwords are rehashed on login when these change, see
+    # `flask systemjob calibrate_password_hashing` for tuning the iterations
+    PASSWORD_HASH_METHOD = env_config(
+        name="PASSWORD_HASH_METHOD", default="pbkdf2:sha256"
+    )
+    PASSWORD_HASH_ITERATIONS = env_config(
+        name="PASSWORD_HASH_ITERATIONS", default=150000, conversion=int
+    )
+    PASSWORD_SALT_LENGTH = env_config(
+        name="PASSWORD_SALT_LENGTH", default=8, conversion=int
+    )
+    # Worker processes hashing passwords, or 0 to hash in the request thread,
+    # and how many hashes may be in flight before requests are turned away
+    PASSWORD_HASH_WORKERS = env_config(
+        name="PASSWORD_HASH_WORKERS", default=2, conversion=int
+    )
+    PASSWORD_HASH_QUEUE = env_config(
+        name="PASSWORD_HASH_QUEUE", default=8, conversion=int
+    )
+    PASSWORD_HASH_TIMEOUT = env_config(
+        name="PASSWORD_HASH_TIMEOUT", default=10, conversion=int
+    )
     FEED_TITLE = env_config(name="FEED_TITLE", default="Feed")
     FEED_DESCRIPTION = env_config(
         name="FEED_DESCRIPTION", default="Simple feed"
     )
+    FEED_MAX_ITEMS = env_config(
+        name="FEED_MAX_ITEMS", default=20, conversion=int
+    )
+    FEED_FULL_CONTENT = env_config(
+        name="FEED_FULL_CONTENT", default=True, conversion=bool
+    )
+    FEED_STREAMING = env_config(
+        name="FEED_STREAMING", default=False, conversion=bool
+    )
+    BLOGS_PER_PAGE = env_config(
+        name="BLOGS_PER_PAGE", default=10, conversion=int
+    )
+    COMMENTS_PER_PAGE = env_config(
+        name="COMMENTS_PER_PAGE", default=20, conversion=int
+    )
+    COMMENTS_MAX_DEPTH = env_config(
+        name="COMMENTS_MAX_DEPTH", default=5, conversion=int
+    )
+    COMMENT_PATH_DIGITS = env_config(
+        name="COMMENT_PATH_DIGITS", default=10, conversion=int
+    )
+    # Token bucket limits on the views which send email, written as
+    # '<emails>/<seconds>', see `website.ratelimit`
+    RATELIMIT_ENABLED = env_config(
+        name="RATELIMIT_ENABLED", default=True, conversion=bool
+    )
+    RATELIMIT_BACKEND = env_config(
+        name="RATELIMIT_BACKEND", default="website.ratelimit.DatabaseBackend"
+    )
+    RATELIMIT_MEMORY_SIZE = env_config(
+        name="RATELIMIT_MEMORY_SIZE", default=10000, conversion=int
+    )
+    # Proxies in front of the website, whose forwarded addresses are trusted
+    RATELIMIT_PROXIES = env_config(
+        name="RATELIMIT_PROXIES", default=0, conversion=int
+    )
+    RATELIMIT_EMAIL_CLIENT = env_config(
+        name="RATELIMIT_EMAIL_CLIENT", default="10/3600"
+    )
+    RATELIMIT_EMAIL_RECIPIENT = env_config(
+        name="RATELIMIT_EMAIL_RECIPIENT", default="3/3600"
+    )
+    RATELIMIT_CONTACT_RECIPIENT = env_config(
+        name="RATELIMIT_CONTACT_RECIPIENT", default="30/3600"
+    )
 
 
 class Test(Base):
@@ -117,10 +213,22 @@ class Test(Base):
     ####################
     WTF_CSRF_ENABLED = False
 
+    #####################
+    # Flask-Mail settings
+    #####################
+    MAIL_SENDER = "website@example.com"
+    MAIL_DEFAULT_SENDER = "website@example.com"
+
     ##################
     # Website settings
     ##################
     ACCOUNT_ALWAYS_CONFIRMED = False
+    # Keep hashing cheap, so tests which log in stay fast
+    PASSWORD_HASH_ITERATIONS = 1000
+    PASSWORD_HASH_WORKERS = 0
+    # Enabled by the tests which cover rate limiting
+    RATELIMIT_ENABLED = False
+    RATELIMIT_BACKEND = "website.ratelimit.MemoryBackend"
 
 
 class Production(Base):
@@ -36,6 +36,7 @@ DEFAULT_ENV = {
     "MAIL_USERNAME": "username@gmail.com",
     "MAIL_PASSWORD": "secret",
     "MAIL_SENDER": "username@gmail.com",
+    "MAIL_DEFAULT_SENDER": "username@gmail.com",
     # Website settings
     "CONTACT_ADDRESS": "contact@gmail.com",
     "SOURCE_LINK": "https://github.com/scrub/website",